@@ -0,0 +1,288 @@
+"""Load test: many simulated learners against a local ``streamlit run``.
+
+Starts the app on a free port, then opens N websocket sessions speaking
+Streamlit's own protocol, joining over ``--ramp`` seconds. Each session loads
+the app, then loops over a scripted journey until the level's time is up:
+switch to a random sidebar page, tick a progress checkbox and save the form,
+with random think times in between. Concurrency steps up through
+``--sessions``. For each level the harness reports first-load and rerun
+latency percentiles, reruns per second and the server's resident memory,
+read from /proc:
+
+    python benchmarks/load_test.py --sessions 10,50,100,200 --duration 30
+    python benchmarks/load_test.py dev-ops-host.py --query v=v3 --out load_report.json
+    python benchmarks/load_test.py -o runner.postScriptGC=false -o server.fileWatcherType=none
+
+Everything runs on this machine; progress is written to a throwaway database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCRIPT = os.path.join(REPO_ROOT, "dev-ops-setup-v5.py")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(script, port, env, options=()):
+    # stderr goes to a file rather than a pipe: nothing drains a pipe while the
+    # test runs, and a full one would block the server mid-measurement.
+    log = tempfile.TemporaryFile()
+    with log:
+        proc = subprocess.Popen(
+            [
+                sys.executable, "-m", "streamlit", "run", script,
+                "--server.headless", "true",
+                "--server.port", str(port),
+                "--server.address", "127.0.0.1",
+                "--browser.gatherUsageStats", "false",
+                *options,
+            ],
+            cwd=REPO_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=log,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                log.seek(0)
+                raise RuntimeError(f"streamlit exited: {log.read().decode(errors='replace')}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as resp:
+                    if resp.status == 200:
+                        return proc
+            except OSError:
+                time.sleep(0.2)
+        proc.kill()
+        raise RuntimeError("streamlit did not become healthy within 30s")
+
+
+def rss_kib(pid):
+    with open(f"/proc/{pid}/status", encoding="ascii") as fh:
+        for line in fh:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+class Learner:
+    """One simulated browser session."""
+
+    def __init__(self, url, query, rng):
+        self.url = url
+        self.query = query
+        self.rng = rng
+        self.ws = None
+        self.widgets = {}  # id -> (kind, proto)
+        self.values = {}  # id -> current value
+        self.latencies = []
+        self.first_load = None
+        self.errors = 0
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, max_message_size=64 * 1024 * 1024)
+
+    def _remember(self, element):
+        kind = element.WhichOneof("type")
+        if kind not in ("radio", "checkbox", "button", "text_input"):
+            return
+        widget = getattr(element, kind)
+        self.widgets[widget.id] = (kind, widget)
+        if widget.id not in self.values and kind != "button":
+            self.values[widget.id] = {"radio": widget.default, "checkbox": widget.default}.get(kind, "")
+
+    async def rerun(self, triggers=()):
+        msg = BackMsg()
+        msg.rerun_script.query_string = self.query
+        for widget_id, value in self.values.items():
+            if widget_id not in self.widgets:
+                continue
+            state = msg.rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+            kind = self.widgets[widget_id][0]
+            if kind == "radio":
+                state.int_value = value
+            elif kind == "checkbox":
+                state.bool_value = value
+            else:
+                state.string_value = value
+        for widget_id in triggers:
+            state = msg.rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+            state.trigger_value = True
+
+        self.widgets = {}
+        started = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            data = await self.ws.read_message()
+            if data is None:
+                raise ConnectionError("server closed the session")
+            fwd = ForwardMsg()
+            fwd.ParseFromString(data)
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                if element.WhichOneof("type") == "exception":
+                    self.errors += 1
+                self._remember(element)
+            elif kind == "script_finished":
+                break
+        self.latencies.append(time.perf_counter() - started)
+
+    def _of_kind(self, kind):
+        return [(widget_id, widget) for widget_id, (k, widget) in self.widgets.items() if k == kind]
+
+    async def select_page(self):
+        radios = self._of_kind("radio")
+        if radios:
+            widget_id, radio = radios[0]
+            self.values[widget_id] = self.rng.randrange(len(radio.options))
+            await self.rerun()
+
+    async def tick_checkpoint(self):
+        checkboxes = self._of_kind("checkbox")
+        if not checkboxes:
+            return
+        widget_id, checkbox = self.rng.choice(checkboxes)
+        self.values[widget_id] = not self.values.get(widget_id, False)
+        submit = [
+            button_id for button_id, button in self._of_kind("button")
+            if button.is_form_submitter and button.form_id == checkbox.form_id
+        ]
+        # Inside a form the toggle itself doesn't rerun; saving does.
+        await self.rerun(triggers=submit if checkbox.form_id else ())
+
+    async def journey(self, until, think, delay):
+        await asyncio.sleep(delay)
+        await self.connect()
+        await self.rerun()
+        self.first_load = self.latencies.pop()
+        steps = [self.select_page, self.tick_checkpoint, self.tick_checkpoint]
+        while time.monotonic() < until:
+            await asyncio.sleep(self.rng.expovariate(1 / think) if think > 0 else 0)
+            if time.monotonic() >= until:
+                break
+            await self.rng.choice(steps)()
+        self.ws.close()
+
+
+async def run_level(url, query, sessions, duration, think, ramp, seed):
+    until = time.monotonic() + ramp + duration
+    learners = [
+        Learner(url, "&".join(filter(None, [query, f"learner=load-{seed}-{i}"])), random.Random(seed * 100003 + i))
+        for i in range(sessions)
+    ]
+    started = time.monotonic()
+    results = await asyncio.gather(
+        *(l.journey(until, think, ramp * i / sessions) for i, l in enumerate(learners)),
+        return_exceptions=True,
+    )
+    elapsed = time.monotonic() - started
+    failures = [r for r in results if isinstance(r, Exception)]
+    latencies = sorted(t for l in learners for t in l.latencies)
+    loads = sorted(l.first_load for l in learners if l.first_load is not None)
+    return latencies, loads, elapsed, failures, sum(l.errors for l in learners)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("script", nargs="?", default=DEFAULT_SCRIPT, help="app script to serve")
+    parser.add_argument("--sessions", default="10,50,100", help="comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per level")
+    parser.add_argument("--think", type=float, default=1.0, help="mean think time between actions, seconds")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds over which sessions join")
+    parser.add_argument("--query", default="", help="extra query string, e.g. v=v3 for dev-ops-host.py")
+    parser.add_argument(
+        "-o", "--option", action="append", default=[], metavar="NAME=VALUE",
+        help="Streamlit config option for the server, e.g. runner.postScriptGC=false (repeatable)",
+    )
+    parser.add_argument("--out", help="write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, GUIDES_PROGRESS_DB=os.path.join(tmp, "progress.sqlite3"))
+        options = [arg for option in args.option for arg in ("--" + option.split("=", 1)[0], option.split("=", 1)[1])]
+        server = start_server(os.path.abspath(args.script), port, env, options)
+        url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        report = {
+            "script": os.path.basename(args.script),
+            "options": args.option,
+            "think_s": args.think,
+            "levels": [],
+        }
+        try:
+            idle_rss = rss_kib(server.pid)
+            print(f"server pid {server.pid}, idle RSS {idle_rss / 1024:.1f} MiB", file=sys.stderr)
+            for level, sessions in enumerate(int(n) for n in args.sessions.split(",")):
+                latencies, loads, elapsed, failures, errors = asyncio.run(
+                    run_level(url, args.query, sessions, args.duration, args.think, args.ramp, level)
+                )
+                result = {
+                    "sessions": sessions,
+                    "first_load_p50_ms": percentile(loads, 0.50) * 1000,
+                    "first_load_p95_ms": percentile(loads, 0.95) * 1000,
+                    "reruns": len(latencies),
+                    "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+                    "p50_ms": percentile(latencies, 0.50) * 1000,
+                    "p95_ms": percentile(latencies, 0.95) * 1000,
+                    "p99_ms": percentile(latencies, 0.99) * 1000,
+                    "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+                    "rss_mib": rss_kib(server.pid) / 1024,
+                    "failed_sessions": len(failures),
+                    "script_errors": errors,
+                }
+                report["levels"].append(result)
+                print(
+                    f"{sessions:>5} sessions: {result['reruns']:>6} reruns, {result['throughput_rps']:7.1f}/s, "
+                    f"p50 {result['p50_ms']:7.1f} ms, p95 {result['p95_ms']:7.1f} ms, "
+                    f"p99 {result['p99_ms']:7.1f} ms, first load p95 {result['first_load_p95_ms']:7.1f} ms, "
+                    f"RSS {result['rss_mib']:6.1f} MiB, "
+                    f"{len(failures)} failed, {errors} errors",
+                    file=sys.stderr,
+                )
+                for failure in failures[:3]:
+                    print(f"    {type(failure).__name__}: {failure}", file=sys.stderr)
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
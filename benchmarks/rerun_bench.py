@@ -0,0 +1,219 @@
+"""Per-rerun cost benchmark for the dev-ops-setup-v1..v5 scripts.
+
+Drives each script headlessly with Streamlit's local script runner, selects
+every sidebar page and toggles every progress checkbox, and records for each
+rerun the script wall time, peak Python memory and the number and size of
+messages sent to the browser. Results are written as JSON:
+
+    python benchmarks/rerun_bench.py --out bench_report.json
+    python benchmarks/rerun_bench.py --baseline bench_report.json --tolerance 0.25
+
+With ``--baseline``, the run exits non-zero if any script's median rerun
+time, peak memory or payload grew by more than the tolerance.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from unittest.mock import MagicMock
+
+import streamlit
+from streamlit import config, source_util
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.scriptrunner import ScriptRunnerEvent
+from streamlit.testing.local_script_runner import LocalScriptRunner
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCRIPTS = sorted(glob.glob(os.path.join(REPO_ROOT, "dev-ops-setup-v*.py")))
+METRICS = ("wall_ms", "peak_kib", "bytes")
+
+
+def _install_runtime():
+    # The script runner expects a Runtime singleton; a mock with real caches is
+    # enough to execute scripts outside of `streamlit run`.
+    config.set_option("runner.postScriptGC", False)
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+
+
+def _run_once(script, session_state, widget_states, trace_memory):
+    runner = LocalScriptRunner(script, session_state)
+    stamps = {}
+
+    def on_event(sender, event, **kwargs):
+        if event == ScriptRunnerEvent.SCRIPT_STARTED:
+            stamps["start"] = time.perf_counter()
+        elif event in (
+            ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+            ScriptRunnerEvent.SCRIPT_STOPPED_WITH_COMPILE_ERROR,
+        ):
+            stamps["stop"] = time.perf_counter()
+
+    runner.on_event.connect(on_event, weak=False)
+    if trace_memory:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    tree = runner.run(widget_states, timeout=30)
+    peak = tracemalloc.get_traced_memory()[1] - base if trace_memory else None
+
+    msgs = runner.forward_msgs()
+    deltas = [msg for msg in msgs if msg.HasField("delta")]
+    sample = {
+        "wall_ms": (stamps["stop"] - stamps["start"]) * 1000,
+        "elements": len(deltas),
+        "bytes": sum(msg.ByteSize() for msg in msgs),
+        "errors": [exc.value for exc in tree.get("exception")],
+    }
+    if peak is not None:
+        sample["peak_kib"] = peak / 1024
+    return tree, sample
+
+
+def _measure(script, tree, action, page, repeat):
+    session_state = tree._session_state if tree is not None else None
+    widget_states = tree.get_widget_states() if tree is not None else None
+    timings = []
+    for _ in range(repeat):
+        next_tree, sample = _run_once(script, session_state, widget_states, False)
+        timings.append(sample["wall_ms"])
+    tracemalloc.start()
+    try:
+        next_tree, sample = _run_once(script, session_state, widget_states, True)
+    finally:
+        tracemalloc.stop()
+    sample["wall_ms"] = statistics.median(timings)
+    sample.update(action=action, page=page, rerun=True)
+    return next_tree, sample
+
+
+def _toggle_checkboxes(script, tree, page, repeat, reruns):
+    forms = []
+    for i in range(len(tree.get("checkbox"))):
+        checkbox = tree.get("checkbox")[i]
+        label = checkbox.proto.label
+        checkbox.set_value(not checkbox.value)
+        if checkbox.proto.form_id:
+            # Widgets inside a form don't rerun the script until it is submitted.
+            reruns.append({"action": f"toggle {label}", "page": page, "rerun": False})
+            if checkbox.proto.form_id not in forms:
+                forms.append(checkbox.proto.form_id)
+            continue
+        tree, sample = _measure(script, tree, f"toggle {label}", page, repeat)
+        reruns.append(sample)
+    for form_id in forms:
+        submit = next(
+            button for button in tree.get("button")
+            if button.proto.is_form_submitter and button.proto.form_id == form_id
+        )
+        submit.click()
+        tree, sample = _measure(script, tree, f"submit {form_id}", page, repeat)
+        reruns.append(sample)
+    return tree
+
+
+def bench_script(script, repeat):
+    # The runner resolves the script to execute through Streamlit's pages
+    # cache, which is keyed on the first main script it sees.
+    with source_util._pages_cache_lock:
+        source_util._cached_pages = None
+    reruns = []
+    tree, sample = _measure(script, None, "initial", None, repeat)
+    # Page navigation lives in the sidebar; pages may have radios of their own.
+    radios = tree.sidebar.get("radio")
+    page = radios[0].value if radios else None
+    sample["page"] = page
+    reruns.append(sample)
+    tree = _toggle_checkboxes(script, tree, page, repeat, reruns)
+
+    if radios:
+        for option in radios[0].options[1:]:
+            tree.sidebar.get("radio")[0].set_value(option)
+            tree, sample = _measure(script, tree, "select page", option, repeat)
+            reruns.append(sample)
+            tree = _toggle_checkboxes(script, tree, option, repeat, reruns)
+
+    executed = [r for r in reruns if r["rerun"]]
+    summary = {metric: statistics.median(r[metric] for r in executed) for metric in METRICS}
+    summary["actions"] = len(reruns)
+    summary["reruns"] = len(executed)
+    summary["max_wall_ms"] = max(r["wall_ms"] for r in executed)
+    summary["max_elements"] = max(r["elements"] for r in executed)
+    summary["errors"] = sum(len(r["errors"]) for r in executed)
+    return {"summary": summary, "reruns": reruns}
+
+
+def compare(report, baseline, tolerance):
+    regressions = []
+    for name, result in report["scripts"].items():
+        base = baseline.get("scripts", {}).get(name)
+        if base is None:
+            continue
+        for metric in METRICS:
+            old = base["summary"][metric]
+            new = result["summary"][metric]
+            if old > 0 and (new - old) / old > tolerance:
+                regressions.append(f"{name}: {metric} {old:.1f} -> {new:.1f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scripts", nargs="*", default=DEFAULT_SCRIPTS, help="scripts to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="timed reruns per action")
+    parser.add_argument("--out", default="bench_report.json", help="report path, or - for stdout")
+    parser.add_argument("--baseline", help="previous report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth")
+    args = parser.parse_args(argv)
+
+    _install_runtime()
+    # `streamlit run` puts the script's directory on sys.path; do the same so
+    # scripts can import the guides package.
+    sys.path.insert(0, REPO_ROOT)
+
+    report = {
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "repeat": args.repeat,
+        "scripts": {},
+    }
+    for script in args.scripts:
+        script = os.path.abspath(script)
+        result = bench_script(script, args.repeat)
+        report["scripts"][os.path.basename(script)] = result
+        summary = result["summary"]
+        print(
+            f"{os.path.basename(script)}: {summary['actions']} actions, {summary['reruns']} reruns, "
+            f"median {summary['wall_ms']:.2f} ms, {summary['peak_kib']:.0f} KiB peak, "
+            f"{summary['bytes']:.0f} B/rerun, {summary['errors']} errors",
+            file=sys.stderr,
+        )
+
+    payload = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(payload)
+    else:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(payload + "\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            regressions = compare(report, json.load(fh), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
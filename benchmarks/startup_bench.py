@@ -0,0 +1,156 @@
+"""Cold-start cost of the app scripts, with an import-time report and a budget.
+
+Each script is measured in a fresh interpreter. The report has three parts:
+
+- streamlit: the time to import Streamlit itself, as a baseline the app
+  can't change;
+- imports: the time to import everything the script imports on top of
+  Streamlit, from ``python -X importtime``;
+- first_run: the time for the script's first run, which imports the page
+  it renders.
+
+The slowest app modules are listed. Each script is measured ``--repeat``
+times and the fastest run is kept, since noise only ever adds time. The run
+exits non-zero when that run's imports + first_run exceed the budget
+(``BUDGET_MS`` unless ``--budget-ms`` is given; 0 disables it) for any
+script:
+
+    python benchmarks/startup_bench.py
+    python benchmarks/startup_bench.py dev-ops-host.py --budget-ms 150 --top 15
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCRIPTS = sorted(glob.glob(os.path.join(REPO_ROOT, "dev-ops-setup-v*.py"))) + [
+    os.path.join(REPO_ROOT, "dev-ops-host.py")
+]
+# The fastest of three runs measures 60-90 ms per script here (imports +
+# first run); the budget leaves room for slower machines but not for an
+# eagerly imported heavy module.
+BUDGET_MS = 150
+IMPORTS_MARKER = "-- startup_bench: app imports --"
+FIRST_RUN_MARKER = "-- startup_bench: first run --"
+
+# Runs in the child interpreter: import Streamlit and the harness, then the
+# script's module graph without running main(), then time a first run. The
+# markers split the -X importtime log into those phases.
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import streamlit
+t1 = time.perf_counter()
+sys.path.insert(0, {root!r})
+sys.path.insert(0, {benchmarks!r})
+import runpy
+import rerun_bench
+rerun_bench._install_runtime()
+sys.stderr.write({imports_marker!r} + "\\n")
+sys.stderr.flush()
+runpy.run_path({script!r}, run_name="startup_bench")
+sys.stderr.write({first_run_marker!r} + "\\n")
+sys.stderr.flush()
+_, sample = rerun_bench._run_once({script!r}, None, None, False)
+print(json.dumps({{"streamlit_ms": (t1 - t0) * 1000, "first_run_ms": sample["wall_ms"],
+                  "errors": len(sample["errors"])}}))
+"""
+
+
+def parse_importtime(lines):
+    """Return ``[(module, self_us, cumulative_us, depth)]`` from ``-X importtime`` lines."""
+    modules = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        self_us, cumulative_us, name = fields
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def measure(script):
+    probe = _PROBE.format(
+        root=REPO_ROOT,
+        benchmarks=os.path.join(REPO_ROOT, "benchmarks"),
+        script=script,
+        imports_marker=IMPORTS_MARKER,
+        first_run_marker=FIRST_RUN_MARKER,
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    log = proc.stderr.splitlines()
+    imports_at, first_run_at = log.index(IMPORTS_MARKER), log.index(FIRST_RUN_MARKER)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["modules"] = parse_importtime(log[imports_at + 1:first_run_at])
+    # Modules the first run imports lazily (page modules, renderers...).
+    result["lazy"] = parse_importtime(log[first_run_at + 1:])
+    result["imports_ms"] = sum(cumulative for _, _, cumulative, depth in result["modules"] if depth == 0) / 1000
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scripts", nargs="*", default=DEFAULT_SCRIPTS, help="scripts to measure")
+    parser.add_argument(
+        "--budget-ms", type=float, default=BUDGET_MS,
+        help=f"fail if imports + first run exceed this (default {BUDGET_MS}; 0 disables)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per script; the fastest is reported")
+    parser.add_argument("--top", type=int, default=10, help="slowest app modules to list")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = {}
+    over_budget = []
+    for script in args.scripts:
+        name = os.path.basename(script)
+        result = min(
+            (measure(os.path.abspath(script)) for _ in range(max(1, args.repeat))),
+            key=lambda run: run["imports_ms"] + run["first_run_ms"],
+        )
+        startup = result["imports_ms"] + result["first_run_ms"]
+        report[name] = {
+            "streamlit_ms": round(result["streamlit_ms"], 1),
+            "imports_ms": round(result["imports_ms"], 1),
+            "first_run_ms": round(result["first_run_ms"], 1),
+            "startup_ms": round(startup, 1),
+            "slowest": [
+                {"module": module, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000}
+                for module, self_us, cumulative_us, _ in sorted(
+                    result["modules"] + result["lazy"], key=lambda m: m[1], reverse=True
+                )[:args.top]
+            ],
+        }
+        if not args.json:
+            print(
+                f"{name}: imports {result['imports_ms']:.1f} ms + first run {result['first_run_ms']:.1f} ms "
+                f"= {startup:.1f} ms (streamlit itself {result['streamlit_ms']:.0f} ms)"
+            )
+            for entry in report[name]["slowest"]:
+                print(f"    {entry['self_ms']:8.2f} ms self {entry['cumulative_ms']:8.2f} ms cum  {entry['module']}")
+        if result["errors"]:
+            over_budget.append(f"{name}: first run raised {result['errors']} exception(s)")
+        if args.budget_ms and startup > args.budget_ms:
+            over_budget.append(f"{name}: startup {startup:.1f} ms > budget {args.budget_ms:.1f} ms")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    for line in over_budget:
+        print(f"OVER BUDGET {line}", file=sys.stderr)
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""Serve every generation of the guide app (v1..v5) from one Streamlit process.
+
+    streamlit run dev-ops-host.py
+
+The version is picked with the ``v`` query parameter, e.g. ``/?v=3``; without
+it the latest version is shown. Streamlit serves a single script per server,
+so the query parameter takes the place of a URL path prefix.
+
+Pages and sections are addressable too: ``/?v=4&page=lambda#configuring-lambda``
+(or ``&section=configuring-lambda`` where the fragment gets lost).
+"""
+import streamlit as st
+
+from guides import app, versions
+
+def main():
+    requested = st.experimental_get_query_params().get("v", [None])[0]
+    try:
+        version = versions.get_version(requested) if requested else versions.LATEST
+    except KeyError:
+        version = versions.LATEST
+    app.run(version)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 import streamlit as st
-import streamlit.components.v1 as components
 
 def main_page():
     st.title("Streamlined Guide: Using Claude as AI Assistant to Terraform")
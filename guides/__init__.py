@@ -0,0 +1,127 @@
+"""Registry of guide pages.
+
+Page metadata (title, sidebar checkpoints, resource links) is declared here so
+the navigation can be built without importing any page module. A page's
+module is only imported the first time that page is rendered.
+"""
+import importlib
+from collections import namedtuple
+
+Page = namedtuple("Page", ["key", "title", "entry", "content", "checkpoints", "resources"])
+
+AWS_DOCS = ("AWS Documentation", "https://docs.aws.amazon.com")
+
+PAGES = [
+    Page(
+        key="terraform",
+        title="Terraform Guide",
+        entry="guides.terraform:main_page",
+        content="terraform",
+        checkpoints=["✅ Complete Terraform Setup", "✅ Launch EC2 Instance"],
+        resources=[AWS_DOCS, ("Terraform Documentation", "https://www.terraform.io/docs")],
+    ),
+    Page(
+        key="aws-docker",
+        title="AWS & Docker Guide",
+        entry="guides.aws_docker:aws_docker_page",
+        content="aws_docker",
+        checkpoints=["✅ Create DynamoDB Table", "✅ Setup Docker Environment"],
+        resources=[AWS_DOCS, ("Docker Documentation", "https://docs.docker.com")],
+    ),
+    Page(
+        key="github-codepipeline",
+        title="GitHub & CodePipeline Guide",
+        entry="guides.github_codepipeline:github_codepipeline_page",
+        content="github_codepipeline",
+        checkpoints=["✅ Create GitHub Account", "✅ Setup CodePipeline"],
+        resources=[("GitHub Documentation", "https://docs.github.com")],
+    ),
+    Page(
+        key="lambda",
+        title="AWS Lambda Guide",
+        entry="guides.lambda_guide:lambda_guide_page",
+        content="lambda_guide",
+        checkpoints=["✅ Create Lambda Function", "✅ Configure Lambda Trigger"],
+        resources=[("AWS Lambda Documentation", "https://docs.aws.amazon.com/lambda/")],
+    ),
+    Page(
+        key="bigquery",
+        title="Google BigQuery Setup",
+        entry="guides.bigquery:bigquery_setup_page",
+        content="bigquery",
+        checkpoints=["✅ Create BigQuery Dataset", "✅ Create BigQuery Table"],
+        resources=[("Google BigQuery Documentation", "https://cloud.google.com/bigquery/docs")],
+    ),
+]
+
+# Pages that only earlier generations of the app show; see guides.versions.
+LEGACY_PAGES = [
+    Page(
+        key="day-one",
+        title="Claude Terraform Guide",
+        entry="guides.day_one:day_one_page",
+        content="terraform",
+        checkpoints=[
+            "Created Claude Account",
+            "Generated Terraform Code",
+            "Created AWS Account",
+            "Launched EC2 Instance",
+        ],
+        resources=[
+            ("Claude AI Documentation", "https://docs.anthropic.com"),
+            AWS_DOCS,
+            ("Terraform Documentation", "https://www.terraform.io/docs"),
+        ],
+    ),
+    Page(
+        key="aws-docker-v2",
+        title="AWS & Docker Guide",
+        entry="guides.aws_docker:aws_docker_page_v2",
+        content="aws_docker_v2",
+        checkpoints=[],
+        resources=[AWS_DOCS, ("Docker Documentation", "https://docs.docker.com")],
+    ),
+]
+
+_BY_TITLE = {page.title: page for page in PAGES}
+_BY_KEY = {page.key: page for page in PAGES + LEGACY_PAGES}
+
+
+def titles():
+    return [page.title for page in PAGES]
+
+
+def get_page(title):
+    return _BY_TITLE[title]
+
+
+def get_page_by_key(key):
+    return _BY_KEY[key]
+
+
+def load(page):
+    """Return the render function for ``page``, importing its module on first use."""
+    module_name, func_name = page.entry.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def render(page):
+    load(page)()
+
+
+def toc_markdown(page):
+    from guides import markdown
+
+    return markdown.toc_markdown(page.content)
+
+
+def resource_links(pages=PAGES):
+    seen = {}
+    for page in pages:
+        for label, url in page.resources:
+            seen.setdefault(label, url)
+    return list(seen.items())
+
+
+def resources_markdown(pages=PAGES):
+    return "\n".join(f"- [{label}]({url})" for label, url in resource_links(pages))
@@ -0,0 +1,63 @@
+"""Operator-only sidebar panel.
+
+Shown when ``?admin=<token>`` matches the ``GUIDES_ADMIN_TOKEN`` environment
+variable; with no token configured the panel is disabled.
+"""
+import hmac
+import os
+
+import streamlit as st
+
+ADMIN_TOKEN = os.environ.get("GUIDES_ADMIN_TOKEN", "")
+
+
+def is_admin():
+    if not ADMIN_TOKEN:
+        return False
+    token = st.experimental_get_query_params().get("admin", [""])[0]
+    return hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def _kib(size):
+    return round(size / 1024, 1)
+
+
+def _sessions_panel():
+    from guides import sessions
+
+    stats = sessions.report()
+    total = sum(s.state_bytes + s.widget_bytes + s.cached_bytes for s in stats)
+    st.caption(
+        f"{len(stats)} sessions, {_kib(total)} KiB; idle TTL {sessions.IDLE_TTL:.0f}s, "
+        f"cap {sessions.MAX_SESSIONS} (idle {sessions.MIN_IDLE:.0f}s+, {sessions.EVICTIONS_PER_PASS} per pass)"
+    )
+    st.dataframe(
+        [
+            {
+                "session": s.session_id[:8],
+                "learner": (s.learner_id or "")[:8],
+                "idle s": None if s.idle_s is None else round(s.idle_s),
+                "state KiB": _kib(s.state_bytes),
+                "widgets KiB": _kib(s.widget_bytes),
+                "cached KiB": _kib(s.cached_bytes),
+            }
+            for s in stats
+        ],
+        use_container_width=True,
+    )
+    if st.button("Reap idle sessions now"):
+        closed = sessions.reap()
+        st.caption(f"Closed {len(closed)} sessions.")
+
+
+def render_panel():
+    """Render the admin panel in the sidebar if the request carries the admin token."""
+    if not is_admin():
+        return
+    with st.sidebar.expander("Admin"):
+        st.subheader("Sessions", anchor=False)
+        _sessions_panel()
+        st.subheader("Profiling", anchor=False)
+        from guides import profiling
+
+        profiling.render_panel()
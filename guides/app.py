@@ -0,0 +1,206 @@
+"""Page shell shared by dev-ops-setup-v5.py and the multi-version host."""
+import json
+import os
+import urllib.parse
+import uuid
+
+import streamlit as st
+
+import guides
+from guides import admin, metrics, progress, sessions, versions
+
+
+def learner_id():
+    """Return the learner ID from ``?learner=``, minting one and adding it to the URL if absent."""
+    params = st.experimental_get_query_params()
+    learner = params.get("learner", [None])[0]
+    if not learner:
+        learner = st.session_state.get("learner_id") or uuid.uuid4().hex
+        params["learner"] = [learner]
+        st.experimental_set_query_params(**params)
+    st.session_state["learner_id"] = learner
+    return learner
+
+
+def _session_progress(learner):
+    # Loaded from the store once per session (or when the learner changes);
+    # later reruns read this dict instead of querying the database.
+    cached = st.session_state.get("progress")
+    if cached is None or cached[0] != learner:
+        cached = (learner, progress.get_store().load(learner))
+        st.session_state["progress"] = cached
+    return cached[1]
+
+
+def _checkpoint_keys(page, label):
+    checkpoint_id = f"{page.key}:{label}"
+    return checkpoint_id, f"progress:{checkpoint_id}"
+
+
+def _save_progress(learner, page):
+    saved = _session_progress(learner)
+    store = progress.get_store()
+    for label in page.checkpoints:
+        checkpoint_id, widget_key = _checkpoint_keys(page, label)
+        done = st.session_state[widget_key]
+        if saved.get(checkpoint_id, False) != done:
+            saved[checkpoint_id] = done
+            store.record(learner, checkpoint_id, done)
+
+
+def progress_form(page, container=st.sidebar, columns=1):
+    """Persisted progress checkboxes for ``page``.
+
+    The checkboxes sit in a form, so toggling one does not rerun the script
+    or re-send the page body; the learner's changes are stored in one go
+    when the form is submitted.
+    """
+    learner = learner_id()
+    saved = _session_progress(learner)
+    per_column = -(-len(page.checkpoints) // columns)
+    with container.form(f"progress:{page.key}"):
+        slots = st.columns(columns) if columns > 1 else [st]
+        for i, label in enumerate(page.checkpoints):
+            checkpoint_id, widget_key = _checkpoint_keys(page, label)
+            # Seeded through session state rather than value= so the widget
+            # ID stays stable as the stored value changes.
+            if widget_key not in st.session_state:
+                st.session_state[widget_key] = saved.get(checkpoint_id, False)
+            slots[i // per_column].checkbox(label, key=widget_key)
+        st.form_submit_button("Save progress", on_click=_save_progress, args=(learner, page))
+
+
+def page_url(page_key, anchor=None):
+    """Link to a page (and optionally a section) keeping the current query parameters."""
+    params = st.experimental_get_query_params()
+    params["page"] = [page_key]
+    url = "?" + urllib.parse.urlencode(params, doseq=True)
+    return f"{url}#{anchor}" if anchor else url
+
+
+def _render_search(pages):
+    query = st.sidebar.text_input("Search guides", placeholder="e.g. DynamoDB, IAM role")
+    if not query:
+        return
+    from guides import search
+
+    hits = search.get_index().search(query, page_keys={page.key for page in pages})
+    if not hits:
+        st.sidebar.caption("No matches.")
+        return
+    lines = []
+    for hit in hits:
+        label = hit.page_title if hit.anchor is None else f"{hit.page_title} › {hit.section}"
+        lines.append(f"- [{label}]({page_url(hit.page_key, hit.anchor)})")
+    st.sidebar.markdown("\n".join(lines))
+
+
+def _navigation(pages):
+    """Sidebar page picker that follows ``?page=`` and keeps it in sync.
+
+    A ``?page=`` the session hasn't seen yet (the entry link, or a search hit)
+    selects that page before the first render, so deep links don't render
+    the default page first.
+    """
+    params = st.experimental_get_query_params()
+    requested = params.get("page", [None])[0]
+    titles = [page.title for page in pages]
+    by_key = {page.key: page for page in pages}
+    if requested in by_key and requested != st.session_state.get("nav:synced"):
+        st.session_state["nav:page"] = by_key[requested].title
+    elif st.session_state.get("nav:page") not in titles:
+        st.session_state["nav:page"] = titles[0]
+    title = st.sidebar.radio("Navigation", titles, key="nav:page")
+    page = pages[titles.index(title)]
+    if requested != page.key:
+        params["page"] = [page.key]
+        # A section belongs to the page that was linked, not the new one.
+        params.pop("section", None)
+        st.experimental_set_query_params(**params)
+    st.session_state["nav:synced"] = page.key
+    return page
+
+
+_SCROLL_SCRIPT = """
+<script>
+const anchor = %s;
+let tries = 0;
+(function scroll() {
+  const target = window.parent.document.getElementById(anchor);
+  if (target) target.scrollIntoView();
+  else if (tries++ < 50) setTimeout(scroll, 100);
+})();
+</script>
+"""
+
+
+def _scroll_to_section(page):
+    # ``#anchor`` links are handled by the browser; ``?section=anchor`` is for
+    # link targets (such as an LMS) that drop the fragment. Scroll once per
+    # page and section, not on every rerun.
+    section = st.experimental_get_query_params().get("section", [None])[0]
+    if not section or st.session_state.get("nav:scrolled") == (page.key, section):
+        return
+    st.session_state["nav:scrolled"] = (page.key, section)
+    import streamlit.components.v1 as components
+
+    components.html(_SCROLL_SCRIPT % json.dumps(section), height=0)
+
+
+def _profiling_requested():
+    # Checked here so the profiler is never imported unless asked for.
+    if not os.environ.get("GUIDES_PROFILE") and "profile" not in st.experimental_get_query_params():
+        return False
+    from guides import profiling
+
+    return profiling.requested()
+
+
+def run(version=versions.LATEST):
+    metrics.start_server()
+    with metrics.track_rerun() as rerun:
+        _run(version, rerun)
+
+
+def _run(version, rerun):
+    st.set_page_config(
+        page_title=version.page_title,
+        page_icon=version.page_icon,
+        layout="wide"
+    )
+
+    sessions.touch()
+    pages = versions.pages(version)
+
+    # Search across this version's pages
+    _render_search(pages)
+
+    # Page Navigation, built from the guide registry
+    page = _navigation(pages) if len(pages) > 1 else pages[0]
+
+    rerun.page = page.key
+    if st.session_state.get("viewed_page") != page.key:
+        st.session_state["viewed_page"] = page.key
+        metrics.record_view(page.key)
+
+    # Only the selected page's module is imported and rendered
+    if _profiling_requested():
+        from guides import profiling
+
+        profiling.render(page)
+    else:
+        guides.render(page)
+    _scroll_to_section(page)
+
+    # Common Resources Sidebar
+    st.sidebar.header("Resources")
+    st.sidebar.markdown(guides.resources_markdown(pages))
+    st.sidebar.subheader("On this page", anchor=False)
+    st.sidebar.markdown(guides.toc_markdown(page))
+
+    # Progress Tracking with the selected page's checkpoints
+    if version.sidebar_progress:
+        st.sidebar.header("Progress Tracking")
+        progress_form(page)
+
+    admin.render_panel()
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from guides import dynamodb_sim, dynamodb_table
+from guides.blocks import render_page
+
+_SHAPES = {"Daily cycle": "diurnal", "Spiky": "spiky", "Upload CSV": "csv"}
+
+
+def _traffic_inputs(shape):
+    if shape == "csv":
+        upload = st.file_uploader(
+            "CSV with 'reads' and 'writes' columns in requests per second, one row per minute "
+            "(or add a 'timestamp' column)",
+            type="csv",
+        )
+        return dynamodb_sim.Traffic("csv", 0, 0, 0, 0, 0, upload.getvalue() if upload else None)
+    left, right = st.columns(2)
+    days = left.slider("Days", 1, 365, 30)
+    read_fraction = right.slider("Reads (% of requests)", 0, 100, 80) / 100
+    base = left.number_input("Quiet traffic (requests/s)", 0, 1_000_000, 50)
+    peak = right.number_input("Peak traffic (requests/s)", 0, 1_000_000, 2000)
+    spikes = 0.0
+    if shape == "spiky":
+        spikes = st.number_input("Spikes per day", 0.0, 100.0, 3.0)
+    return dynamodb_sim.Traffic(shape, days, base, peak, spikes, read_fraction, None)
+
+
+def _capacity_simulator(block):
+    st.markdown(block["text"])
+    shape = _SHAPES[st.radio("Traffic", list(_SHAPES), horizontal=True)]
+
+    # A form, so adjusting several inputs reruns the simulation once.
+    with st.form("dynamodb_capacity"):
+        spec = _traffic_inputs(shape)
+        st.markdown("**Items**")
+        left, right = st.columns(2)
+        read_kb = left.number_input("Item size read (KB)", 0.1, 400.0, 2.0)
+        write_kb = right.number_input("Item size written (KB)", 0.1, 400.0, 1.0)
+        read_mode = left.selectbox("Reads", list(dynamodb_sim.READ_FACTORS))
+        write_mode = right.selectbox("Writes", list(dynamodb_sim.WRITE_FACTORS))
+        st.markdown("**Provisioned capacity with auto scaling**")
+        left, right = st.columns(2)
+        min_rcu = left.number_input("Minimum RCU", 1, 40000, 5)
+        max_rcu = right.number_input("Maximum RCU", 1, 40000, 4000)
+        min_wcu = left.number_input("Minimum WCU", 1, 40000, 5)
+        max_wcu = right.number_input("Maximum WCU", 1, 40000, 4000)
+        target = left.slider("Target utilization (%)", 20, 90, 70) / 100
+        lag = right.slider("Scaling delay (minutes)", 0, 30, 5)
+        run = st.form_submit_button("Simulate")
+
+    if run:
+        if spec.csv is None and shape == "csv":
+            st.info("Upload a CSV to run the simulation.")
+            return
+        st.session_state["dynamodb:capacity"] = (
+            spec,
+            dynamodb_sim.Items(read_kb, write_kb, read_mode, write_mode),
+            dynamodb_sim.Scaling(min_rcu, max(min_rcu, max_rcu), min_wcu, max(min_wcu, max_wcu), target, lag),
+        )
+    # Only simulate once asked, so viewing the page or saving progress
+    # doesn't pay for a simulation and its charts.
+    if "dynamodb:capacity" not in st.session_state:
+        return
+    try:
+        summary = dynamodb_sim.report(*st.session_state["dynamodb:capacity"])
+    except ValueError as exc:
+        st.error(str(exc))
+        return
+
+    days = summary.minutes / dynamodb_sim.MINUTES_PER_DAY
+    provisioned, on_demand = st.columns(2)
+    provisioned.metric("Provisioned + auto scaling", f"${summary.provisioned_cost:,.2f}")
+    provisioned.caption(f"{summary.provisioned_throttled:,.0f} requests throttled")
+    on_demand.metric(
+        "On-demand", f"${summary.on_demand_cost:,.2f}",
+        delta=f"{summary.on_demand_cost - summary.provisioned_cost:+,.2f} vs provisioned", delta_color="inverse",
+    )
+    on_demand.caption(f"{summary.on_demand_throttled:,.0f} requests throttled")
+    st.caption(
+        f"{summary.requests:,.0f} requests over {days:,.1f} days. Charts show the peak of each "
+        "interval in capacity units per second."
+    )
+    chart = summary.chart
+    index = pd.Index(np.linspace(0, days, len(chart["rcu_demand"])), name="day")
+    st.line_chart(pd.DataFrame({"RCU consumed": chart["rcu_demand"], "RCU provisioned": chart["rcu_capacity"]}, index=index))
+    st.line_chart(pd.DataFrame({"WCU consumed": chart["wcu_demand"], "WCU provisioned": chart["wcu_capacity"]}, index=index))
+
+
+_DATASETS = {label: key for key, (label, _) in dynamodb_table.SAMPLES.items()}
+_DATASETS["Upload CSV"] = None
+
+
+def _heat_map(heat, bucket, limit, title):
+    import altair as alt
+
+    partitions, columns = heat.shape
+    frame = pd.DataFrame({
+        "partition": np.repeat(np.arange(partitions), columns),
+        "start": np.tile(np.arange(columns) * bucket, partitions),
+        "units": heat.ravel(),
+    })
+    frame["end"] = frame["start"] + bucket
+    frame["utilization"] = frame["units"] / limit
+    return alt.Chart(frame, title=title).mark_rect().encode(
+        x=alt.X("start:Q", title="Second"),
+        x2="end:Q",
+        y=alt.Y("partition:O", title="Partition"),
+        color=alt.Color(
+            "utilization:Q", title="Of limit",
+            scale=alt.Scale(domain=[0, 1], scheme="orangered", clamp=True),
+            legend=alt.Legend(format="%"),
+        ),
+        tooltip=["partition", "start", alt.Tooltip("units:Q", title="Peak units/s", format=",.0f")],
+    )
+
+
+def _partition_skew(block):
+    st.markdown(block["text"])
+    sample = _DATASETS[st.radio("Data", list(_DATASETS))]
+
+    with st.form("partition_skew"):
+        csv = None
+        items = 0
+        if sample is None:
+            upload = st.file_uploader(
+                "CSV with a 'pk' column; 'sk', 'size' (bytes) and 'timestamp' are optional", type="csv"
+            )
+            csv = upload.getvalue() if upload else None
+        else:
+            items = st.number_input("Items", 10_000, 5_000_000, 1_000_000, step=100_000)
+        left, right = st.columns(2)
+        item_kb = left.number_input("Item size (KB)", 0.1, 400.0, 1.0)
+        writes_per_second = right.number_input("Writes per second", 1, 1_000_000, 5000)
+        reads_per_write = left.number_input("Reads per write", 0.0, 100.0, 2.0)
+        partitions = right.number_input("Partitions (0 = as DynamoDB would size it)", 0, 1000, 0)
+        rcu = left.number_input("Provisioned RCU (0 = on-demand)", 0, 1_000_000, 0)
+        wcu = right.number_input("Provisioned WCU (0 = on-demand)", 0, 1_000_000, 0)
+        run = st.form_submit_button("Analyze")
+
+    if run:
+        if sample is None and csv is None:
+            st.info("Upload a CSV to analyze its keys.")
+            return
+        st.session_state["dynamodb:skew"] = dynamodb_table.Workload(
+            sample, items, item_kb, writes_per_second, reads_per_write, rcu, wcu, partitions, csv, 0
+        )
+    if "dynamodb:skew" not in st.session_state:
+        return
+    try:
+        analysis = dynamodb_table.analyze(st.session_state["dynamodb:skew"])
+    except ValueError as exc:
+        st.error(str(exc))
+        return
+
+    writes = analysis.items
+    reads = analysis.requests - writes
+    columns = st.columns(3)
+    columns[0].metric("Partitions", analysis.partitions)
+    columns[1].metric("Writes throttled", f"{analysis.writes_throttled / max(writes, 1):.1%}")
+    columns[2].metric("Reads throttled", f"{analysis.reads_throttled / max(reads, 1):.1%}")
+    st.caption(
+        f"{writes:,} items ({analysis.size_bytes / 1024 ** 2:,.1f} MiB) written and {reads:,} reads. "
+        f"Each cell is the busiest second in {analysis.bucket_seconds} s; red is at or over the partition's limit."
+    )
+    st.altair_chart(
+        _heat_map(analysis.write_heat, analysis.bucket_seconds, dynamodb_table.PARTITION_WCU, "Write units"),
+        use_container_width=True,
+    )
+    st.altair_chart(
+        _heat_map(analysis.read_heat, analysis.bucket_seconds, dynamodb_table.PARTITION_RCU, "Read units"),
+        use_container_width=True,
+    )
+    st.markdown("**Hottest keys**")
+    st.dataframe(pd.DataFrame(analysis.hot_keys, columns=["Partition key", "Requests"]), hide_index=True)
+
+
+_OVERRIDES = {"dynamodb_capacity": _capacity_simulator, "partition_skew": _partition_skew}
+
+
+def aws_docker_page():
+    render_page("aws_docker", overrides=_OVERRIDES)
+
+def aws_docker_page_v2():
+    render_page("aws_docker_v2")
@@ -0,0 +1,4 @@
+from guides.blocks import render_page
+
+def bigquery_setup_page():
+    render_page("bigquery")
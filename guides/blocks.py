@@ -0,0 +1,62 @@
+"""Render content blocks loaded by ``guides.content`` with Streamlit.
+
+Set ``GUIDES_PREHIGHLIGHT=1`` to highlight code samples on the server (see
+``guides.highlight``) and send them as HTML, instead of having every browser
+highlight the raw source on each render.
+"""
+import os
+
+import streamlit as st
+
+from guides import content, markdown
+
+PREHIGHLIGHT = os.environ.get("GUIDES_PREHIGHLIGHT", "") not in ("", "0")
+
+
+def render_page(name, overrides=None):
+    """Render a content page.
+
+    ``overrides`` maps a block's ``name`` to a callable that renders in place
+    of that block and is passed the block. Code blocks fall back to their
+    source and ``interactive`` blocks to their ``text``.
+    """
+    blocks = markdown.compile_page(name)["blocks"]
+    if PREHIGHLIGHT and any(block["type"] == "code" for block in content.iter_blocks(blocks)):
+        from guides import highlight
+
+        st.markdown(highlight.style_tag(), unsafe_allow_html=True)
+    render_blocks(blocks, overrides)
+
+
+def render_code(source, language):
+    if PREHIGHLIGHT:
+        from guides import highlight
+
+        st.markdown(highlight.inline_html(source, language), unsafe_allow_html=True)
+    else:
+        st.code(source, language=language)
+
+
+def render_blocks(blocks, overrides=None):
+    overrides = overrides or {}
+    for block in blocks:
+        kind = block["type"]
+        if block.get("name") in overrides:
+            overrides[block["name"]](block)
+        elif kind == "title":
+            st.title(block["text"])
+        elif kind == "header":
+            st.header(block["text"], anchor=block.get("anchor"))
+        elif kind == "subheader":
+            st.subheader(block["text"], anchor=block.get("anchor"))
+        elif kind == "markdown":
+            st.markdown(block["text"])
+        elif kind == "code":
+            render_code(block["source"], block["language"])
+        elif kind in ("tip", "interactive"):
+            st.info(block["text"])
+        elif kind == "expander":
+            with st.expander(block["label"], expanded=block.get("expanded", False)):
+                render_blocks(block["blocks"], overrides)
+        else:
+            raise ValueError(f"Unknown content block type: {kind!r}")
@@ -0,0 +1,102 @@
+"""Process-wide store for the guide content files in ``guides/content``.
+
+Each file is parsed once and the result is shared by every session. A file is
+only re-read when its mtime or size changes, and only re-parsed when the bytes
+actually differ, so content edits are picked up without a server restart.
+Callers must treat the returned data as read-only.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content")
+
+_Entry = namedtuple("_Entry", ["stamp", "digest", "data"])
+
+_cache = {}
+_composed = {}
+_lock = threading.Lock()
+
+
+def _path(name):
+    return os.path.join(CONTENT_DIR, f"{name}.json")
+
+
+def names():
+    return sorted(
+        filename[:-len(".json")]
+        for filename in os.listdir(CONTENT_DIR)
+        if filename.endswith(".json")
+    )
+
+
+def _load_file(name):
+    path = _path(name)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    entry = _cache.get(path)
+    if entry is not None and entry.stamp == stamp:
+        return entry
+
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry.stamp == stamp:
+            return entry
+        with open(path, "rb") as fh:
+            raw = fh.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry is not None and entry.digest == digest:
+            data = entry.data
+        else:
+            data = json.loads(raw)
+        entry = _Entry(stamp, digest, data)
+        _cache[path] = entry
+        return entry
+
+
+def load(name):
+    """Return the parsed content for ``name``, reloading it only if the file changed.
+
+    A file with an ``"extends"`` key reuses another page's blocks and adds its
+    own ``"append"`` blocks, so page variants don't duplicate shared content.
+    """
+    data = _load_file(name).data
+    if "extends" not in data:
+        return data
+
+    key = digest(name)
+    composed = _composed.get(name)
+    if composed is None or composed[0] != key:
+        base = load(data["extends"])
+        composed = (key, {"blocks": base["blocks"] + data.get("append", [])})
+        _composed[name] = composed
+    return composed[1]
+
+
+def digest(name):
+    entry = _load_file(name)
+    if "extends" not in entry.data:
+        return entry.digest
+    combined = entry.digest + digest(entry.data["extends"])
+    return hashlib.sha256(combined.encode("ascii")).hexdigest()
+
+
+def iter_blocks(blocks):
+    """Yield every block, descending into expanders."""
+    for block in blocks:
+        yield block
+        if block["type"] == "expander":
+            yield from iter_blocks(block["blocks"])
+
+
+def code_blocks(name):
+    return [block for block in iter_blocks(load(name)["blocks"]) if block["type"] == "code"]
+
+
+def code(name, block_name):
+    for block in code_blocks(name):
+        if block["name"] == block_name:
+            return block["source"]
+    raise KeyError(f"{name} has no code block named {block_name!r}")
@@ -0,0 +1,19 @@
+import streamlit as st
+
+import guides
+from guides.app import progress_form
+from guides.blocks import render_page
+
+def day_one_page():
+    render_page("terraform")
+
+    # Progress Tracker
+    st.header("Progress Tracker")
+    progress_form(guides.get_page_by_key("day-one"), st, columns=2)
+
+    # Success Message
+    if st.button("Mark as Complete"):
+        st.success("""
+        🎉 Congratulations! You've successfully used Claude to generate Terraform code 
+        and set up an EC2 workstation! This completes Day 1 of the MultiCloud DevOps & AI Challenge.
+        """)
@@ -0,0 +1,220 @@
+"""DynamoDB capacity simulator: provisioned with auto scaling vs on-demand.
+
+Traffic is a pair of per-minute numpy arrays, reads and writes per second
+averaged over each minute, and every step below works on whole arrays, so a
+year of traffic (525,600 minutes) simulates in a fraction of a second.
+
+Auto scaling follows target tracking: a scale-out alarm fires once demand has
+been over target for ``SCALE_OUT_MINUTES`` consecutive minutes, a scale-in
+alarm after ``SCALE_IN_MINUTES``, and either change lands ``lag`` minutes
+later. On-demand tables serve up to twice the peak of 30 minutes earlier
+(``ON_DEMAND_WINDOW``), starting from the throughput of a new table.
+
+Simplifications: scaling decisions look at demand rather than throttled
+consumption, burst capacity and the daily scale-in quota are ignored, and
+spikes shorter than a minute are averaged away. Prices are us-east-1 list
+prices for the Standard table class; pass ``Prices`` for other regions.
+"""
+import functools
+import io
+import math
+from collections import namedtuple
+
+import numpy as np
+
+MINUTES_PER_DAY = 24 * 60
+SCALE_OUT_MINUTES = 2
+SCALE_IN_MINUTES = 15
+ON_DEMAND_WINDOW = 30
+ON_DEMAND_INITIAL = (12000, 4000)  # RCU, WCU a new on-demand table serves
+
+# Capacity units per started 4 KB read or 1 KB write, by request type.
+READ_FACTORS = {"eventual": 0.5, "strong": 1.0, "transactional": 2.0}
+WRITE_FACTORS = {"standard": 1.0, "transactional": 2.0}
+
+Prices = namedtuple("Prices", ["rcu_hour", "wcu_hour", "read_million", "write_million"])
+PRICES = Prices(rcu_hour=0.00013, wcu_hour=0.00065, read_million=0.125, write_million=0.625)
+
+# ``shape`` is "diurnal", "spiky" or "csv"; ``csv`` holds the uploaded bytes.
+Traffic = namedtuple("Traffic", ["shape", "days", "base_rps", "peak_rps", "spikes_per_day", "read_fraction", "csv"])
+Items = namedtuple("Items", ["read_kb", "write_kb", "read_mode", "write_mode"])
+Scaling = namedtuple("Scaling", ["min_rcu", "max_rcu", "min_wcu", "max_wcu", "target", "lag"])
+
+# Per-minute arrays are in capacity units per second (``*_demand``,
+# ``*_capacity``) or requests per minute (``*_throttled``); the rest are
+# totals for the whole period.
+Result = namedtuple("Result", [
+    "rcu_demand", "wcu_demand",
+    "rcu_capacity", "wcu_capacity",
+    "read_throttled", "write_throttled",
+    "on_demand_read_throttled", "on_demand_write_throttled",
+    "provisioned_cost", "on_demand_cost",
+])
+
+
+def _frozen(array):
+    array.flags.writeable = False
+    return array
+
+
+def diurnal(days, base_rps, peak_rps, seed=0):
+    """Requests per second with a daily cycle peaking mid-afternoon and quieter weekends."""
+    minutes = np.arange(days * MINUTES_PER_DAY)
+    hour = (minutes % MINUTES_PER_DAY) / 60
+    daily = (1 - np.cos((hour - 3) / 24 * 2 * np.pi)) / 2  # 0 at 03:00, 1 at 15:00
+    weekend = np.where((minutes // MINUTES_PER_DAY) % 7 >= 5, 0.6, 1.0)
+    noise = np.random.default_rng(seed).lognormal(0, 0.08, minutes.size)
+    return _frozen((base_rps + (peak_rps - base_rps) * daily * weekend) * noise)
+
+
+def spiky(days, base_rps, peak_rps, spikes_per_day, seed=0):
+    """Steady traffic with sudden spikes to ``peak_rps`` that decay over ~10 minutes."""
+    rng = np.random.default_rng(seed)
+    size = days * MINUTES_PER_DAY
+    impulses = np.zeros(size)
+    starts = rng.integers(0, size, int(round(days * spikes_per_day)))
+    impulses[starts] = rng.uniform(0.5, 1.0, starts.size)
+    kernel = np.exp(-np.arange(60) / 10)
+    shape = np.minimum(np.convolve(impulses, kernel)[:size], 1.0)
+    noise = rng.lognormal(0, 0.05, size)
+    return _frozen((base_rps + (peak_rps - base_rps) * shape) * noise)
+
+
+def split(total_rps, read_fraction):
+    return _frozen(total_rps * read_fraction), _frozen(total_rps * (1 - read_fraction))
+
+
+@functools.lru_cache(maxsize=8)
+def load_csv(data):
+    """Per-minute ``(reads, writes)`` from CSV bytes.
+
+    Rows are minutes, or any interval when a ``timestamp`` column is present
+    (resampled to minutes).
+    """
+    import pandas as pd
+
+    frame = pd.read_csv(io.BytesIO(data))
+    frame.columns = [str(column).strip().lower() for column in frame.columns]
+    missing = {"reads", "writes"} - set(frame.columns)
+    if missing:
+        raise ValueError(f"CSV needs 'reads' and 'writes' columns (per second); missing {sorted(missing)}")
+    if "timestamp" in frame.columns:
+        frame.index = pd.to_datetime(frame.pop("timestamp"))
+        frame = frame.sort_index().resample("1min").mean().ffill()
+    values = frame[["reads", "writes"]].to_numpy(dtype=float)
+    if not len(values) or np.isnan(values).any() or (values < 0).any():
+        raise ValueError("CSV reads and writes must be non-negative numbers")
+    return _frozen(values[:, 0].copy()), _frozen(values[:, 1].copy())
+
+
+def traffic(spec, seed=0):
+    """Per-minute ``(reads, writes)`` per second for a ``Traffic`` spec."""
+    if spec.shape == "csv":
+        return load_csv(spec.csv)
+    if spec.shape == "diurnal":
+        total = diurnal(spec.days, spec.base_rps, spec.peak_rps, seed)
+    elif spec.shape == "spiky":
+        total = spiky(spec.days, spec.base_rps, spec.peak_rps, spec.spikes_per_day, seed)
+    else:
+        raise ValueError(f"Unknown traffic shape {spec.shape!r}")
+    return split(total, spec.read_fraction)
+
+
+def units_per_request(items):
+    """``(RCU per read, WCU per write)`` for the item sizes and modes."""
+    read = max(1, math.ceil(items.read_kb / 4)) * READ_FACTORS[items.read_mode]
+    write = max(1, math.ceil(items.write_kb)) * WRITE_FACTORS[items.write_mode]
+    return read, write
+
+
+def _trailing(values, window, reducer):
+    """``reducer`` over each minute and the ``window - 1`` minutes before it."""
+    padded = np.concatenate([np.full(window - 1, values[0]), values])
+    return reducer(np.lib.stride_tricks.sliding_window_view(padded, window), axis=1)
+
+
+def autoscaled(demand, minimum, maximum, target, lag):
+    """Provisioned capacity per minute under target-tracking auto scaling."""
+    sustained = _trailing(demand, SCALE_OUT_MINUTES, np.min)
+    desired = _trailing(np.ceil(sustained / target), SCALE_IN_MINUTES, np.max)
+    capacity = np.empty_like(desired)
+    capacity[:lag] = desired[0]
+    capacity[lag:] = desired[:desired.size - lag]
+    return np.clip(capacity, minimum, maximum)
+
+
+def on_demand_limit(demand, initial):
+    """Throughput an on-demand table serves: twice the peak of ``ON_DEMAND_WINDOW`` minutes ago."""
+    peak = np.maximum.accumulate(demand)
+    limit = np.full(demand.shape, float(initial))
+    limit[ON_DEMAND_WINDOW:] = np.maximum(initial, 2 * peak[:-ON_DEMAND_WINDOW])
+    return limit
+
+
+def _throttled(demand, limit, units):
+    return np.maximum(demand - limit, 0) * 60 / units
+
+
+def simulate(reads, writes, items, scaling, prices=PRICES):
+    """Run both capacity modes over per-minute ``reads`` and ``writes`` (requests per second)."""
+    read_units, write_units = units_per_request(items)
+    rcu_demand = reads * read_units
+    wcu_demand = writes * write_units
+    rcu_capacity = autoscaled(rcu_demand, scaling.min_rcu, scaling.max_rcu, scaling.target, scaling.lag)
+    wcu_capacity = autoscaled(wcu_demand, scaling.min_wcu, scaling.max_wcu, scaling.target, scaling.lag)
+    rcu_limit = on_demand_limit(rcu_demand, ON_DEMAND_INITIAL[0])
+    wcu_limit = on_demand_limit(wcu_demand, ON_DEMAND_INITIAL[1])
+
+    hours = 1 / 60
+    provisioned = (rcu_capacity.sum() * prices.rcu_hour + wcu_capacity.sum() * prices.wcu_hour) * hours
+    # On-demand bills request units actually served, per million.
+    served_reads = np.minimum(rcu_demand, rcu_limit).sum() * 60
+    served_writes = np.minimum(wcu_demand, wcu_limit).sum() * 60
+    on_demand = (served_reads * prices.read_million + served_writes * prices.write_million) / 1e6
+    return Result(
+        rcu_demand, wcu_demand,
+        rcu_capacity, wcu_capacity,
+        _throttled(rcu_demand, rcu_capacity, read_units), _throttled(wcu_demand, wcu_capacity, write_units),
+        _throttled(rcu_demand, rcu_limit, read_units), _throttled(wcu_demand, wcu_limit, write_units),
+        float(provisioned), float(on_demand),
+    )
+
+
+def downsample(values, points):
+    """Per-bucket maxima, so a chart of a year still shows every spike."""
+    size = -(-values.size // points)
+    if size <= 1:
+        return values
+    padded = np.concatenate([values, np.full(-values.size % size, values[-1])])
+    return padded.reshape(-1, size).max(axis=1)
+
+
+Summary = namedtuple("Summary", [
+    "minutes", "requests", "chart",
+    "provisioned_cost", "on_demand_cost",
+    "provisioned_throttled", "on_demand_throttled",
+])
+
+
+@functools.lru_cache(maxsize=64)
+def report(spec, items, scaling, prices=PRICES, points=1500):
+    """Simulate ``spec`` and keep only totals and chart-sized arrays.
+
+    Cached by the parameter tuples; a year of full-resolution arrays is tens
+    of megabytes, so only the downsampled ``chart`` series are kept.
+    """
+    reads, writes = traffic(spec)
+    result = simulate(reads, writes, items, scaling, prices)
+    chart = {
+        name: downsample(getattr(result, name), points)
+        for name in ("rcu_demand", "rcu_capacity", "wcu_demand", "wcu_capacity")
+    }
+    return Summary(
+        minutes=reads.size,
+        requests=float((reads.sum() + writes.sum()) * 60),
+        chart=chart,
+        provisioned_cost=result.provisioned_cost,
+        on_demand_cost=result.on_demand_cost,
+        provisioned_throttled=float(result.read_throttled.sum() + result.write_throttled.sum()),
+        on_demand_throttled=float(result.on_demand_read_throttled.sum() + result.on_demand_write_throttled.sum()),
+    )
@@ -0,0 +1,287 @@
+"""In-process stand-in for a DynamoDB table, for partition-key skew analysis.
+
+Partition keys are hashed into simulated partitions that each serve at most
+``PARTITION_RCU`` reads and ``PARTITION_WCU`` writes per second, like
+DynamoDB's hash ranges. Storage is columnar: every item is a key code, a sort
+key code and a size in a few numpy arrays, with each distinct key string
+stored once, so millions of items fit in tens of megabytes.
+
+``replay`` turns a request stream into per-partition, per-second consumed
+capacity with ``np.bincount``; anything over a partition's limit in a second
+is throttled. Adaptive capacity is assumed, so a hot partition may use up to
+its hard limit whatever the table's provisioned throughput.
+"""
+import functools
+import io
+import math
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+PARTITION_RCU = 3000
+PARTITION_WCU = 1000
+PARTITION_BYTES = 10 * 1024 ** 3
+ON_DEMAND_INITIAL = (12000, 4000)  # RCU, WCU a new on-demand table is sized for
+MAX_CELLS = 20_000_000  # partitions x seconds replay can hold
+
+QueryResult = namedtuple("QueryResult", ["sort_keys", "sizes", "consumed_rcu"])
+
+# ``read_units`` and ``write_units`` are partitions x seconds arrays of
+# capacity units consumed; ``*_throttled`` count throttled requests.
+Heat = namedtuple("Heat", [
+    "read_units", "write_units", "reads_throttled", "writes_throttled", "requests", "hot_keys",
+])
+
+
+def _as_keys(values):
+    return pd.Index(np.asarray(values, dtype=object).astype(str))
+
+
+class _KeyIndex:
+    """Distinct key strings and their codes, grown one batch at a time."""
+
+    def __init__(self):
+        self.keys = pd.Index([], dtype=object)
+
+    def codes(self, values):
+        if isinstance(values, (list, tuple)):
+            values = np.asarray(values, dtype=object)
+        codes, uniques = pd.factorize(values)
+        uniques = _as_keys(uniques)
+        known = self.keys.get_indexer(uniques)
+        new = known < 0
+        if new.any():
+            known[new] = np.arange(len(self.keys), len(self.keys) + new.sum())
+            self.keys = self.keys.append(uniques[new])
+        return known[codes].astype(np.int32)
+
+
+class Table:
+    """Array-backed table keyed by partition key and an optional sort key.
+
+    ``partitions`` fixes the partition count; by default it is what DynamoDB
+    would need for the data size and the provisioned throughput (on-demand,
+    with ``rcu`` and ``wcu`` of 0, is sized like a new on-demand table).
+    """
+
+    def __init__(self, rcu=0, wcu=0, partitions=None):
+        self.rcu = rcu
+        self.wcu = wcu
+        self.requested_partitions = partitions
+        self._pk = _KeyIndex()
+        self._sk = _KeyIndex()
+        self._chunks = []
+        self._columns = None
+        self._order = None
+        self._sorted_pk = None
+
+    def batch_write(self, partition_keys, sort_keys=None, sizes=1024):
+        """Append items; returns the write capacity units consumed.
+
+        Unlike ``BatchWriteItem`` there is no 25-item cap, and a repeated
+        primary key adds another item instead of replacing the first.
+        """
+        pk = self._pk.codes(partition_keys)
+        sk = self._sk.codes(sort_keys if sort_keys is not None else np.full(len(pk), ""))
+        size = np.broadcast_to(np.asarray(sizes, dtype=np.uint32), pk.shape).copy()
+        self._chunks.append((pk, sk, size))
+        self._columns = None
+        self._order = None
+        return int(np.ceil(size / 1024).sum())
+
+    def columns(self):
+        """``(partition key codes, sort key codes, sizes)`` for every item, in write order."""
+        if self._columns is None:
+            if self._chunks:
+                self._columns = tuple(np.concatenate(column) for column in zip(*self._chunks))
+            else:
+                self._columns = (np.empty(0, np.int32), np.empty(0, np.int32), np.empty(0, np.uint32))
+            self._chunks = [self._columns]
+        return self._columns
+
+    def __len__(self):
+        return len(self.columns()[0])
+
+    @property
+    def size_bytes(self):
+        return int(self.columns()[2].sum(dtype=np.int64))
+
+    @property
+    def partitions(self):
+        if self.requested_partitions:
+            return self.requested_partitions
+        by_size = math.ceil(self.size_bytes / PARTITION_BYTES)
+        rcu, wcu = (self.rcu, self.wcu) if self.rcu or self.wcu else ON_DEMAND_INITIAL
+        by_throughput = math.ceil(rcu / PARTITION_RCU + wcu / PARTITION_WCU)
+        return max(1, by_size, by_throughput)
+
+    def key_partitions(self):
+        """Partition of every distinct partition key, indexed by key code.
+
+        The 64-bit key hash space is split into equal ranges, one per partition.
+        """
+        hashes = pd.util.hash_array(self._pk.keys.to_numpy(dtype=object))
+        return ((hashes >> np.uint64(32)) * np.uint64(self.partitions) >> np.uint64(32)).astype(np.int32)
+
+    def _sorted(self):
+        if self._order is None:
+            pk, sk, _ = self.columns()
+            sk_rank = np.argsort(np.argsort(self._sk.keys.to_numpy(dtype=object)))
+            self._order = np.lexsort((sk_rank[sk], pk))
+            self._sorted_pk = pk[self._order]
+        return self._order, self._sorted_pk
+
+    def query(self, partition_key, limit=None, consistent=False):
+        """Items for ``partition_key`` in sort key order, and the read units it costs."""
+        code = self._pk.keys.get_indexer([str(partition_key)])[0]
+        order, sorted_pk = self._sorted()
+        start, stop = np.searchsorted(sorted_pk, [code, code + 1]) if code >= 0 else (0, 0)
+        rows = order[start:stop][:limit]
+        _, sk, size = self.columns()
+        # A query is billed on the total size read, rounded up to 4 KB.
+        units = math.ceil(int(size[rows].sum()) / 4096) * (1.0 if consistent else 0.5)
+        return QueryResult(self._sk.keys.to_numpy(dtype=object)[sk[rows]], size[rows], units)
+
+    def replay(self, rows, seconds, writes, top=10):
+        """Replay requests for stored items and measure partition heat.
+
+        ``rows`` index the items requested, ``seconds`` is when each request
+        arrives and ``writes`` is True for writes, False for reads (eventually
+        consistent).
+        """
+        pk, _, size = self.columns()
+        partitions = self.partitions
+        part = self.key_partitions()[pk[rows]]
+        sizes = size[rows].astype(np.float64)
+        units = np.where(writes, np.ceil(sizes / 1024), np.ceil(sizes / 4096) * 0.5)
+        span = int(seconds.max()) + 1 if len(seconds) else 1
+        if partitions * span > MAX_CELLS:
+            raise ValueError(f"{span:,} seconds of traffic over {partitions} partitions is too long to replay")
+        cell = part.astype(np.int64) * span + seconds.astype(np.int64)
+
+        def heat(mask, limit):
+            # ``astype``: a weighted bincount of no requests comes back as int64.
+            consumed = np.bincount(cell[mask], weights=units[mask], minlength=partitions * span).astype(np.float64)
+            requests = np.bincount(cell[mask], minlength=partitions * span)
+            # Requests in an over-limit second are throttled in proportion.
+            over = np.maximum(consumed - limit, 0)
+            throttled = np.divide(over, consumed, out=np.zeros_like(over), where=consumed > 0) * requests
+            return consumed.reshape(partitions, span), float(throttled.sum())
+
+        read_units, reads_throttled = heat(~writes, PARTITION_RCU)
+        write_units, writes_throttled = heat(writes, PARTITION_WCU)
+        counts = np.bincount(pk[rows], minlength=len(self._pk.keys))
+        hottest = np.argsort(counts)[::-1][:top]
+        hot_keys = [(self._pk.keys[code], int(counts[code])) for code in hottest if counts[code]]
+        return Heat(read_units, write_units, reads_throttled, writes_throttled, len(rows), hot_keys)
+
+
+# Sample datasets: (label, key generator). Each generator returns ``items``
+# partition keys as a Categorical, so millions of keys cost one code each.
+def _users(rng, items):
+    return pd.Categorical.from_codes(rng.integers(0, 100_000, items), _numbered("user-", 100_000))
+
+
+def _popular_products(rng, items):
+    codes = np.minimum(rng.zipf(1.3, items) - 1, 49_999)
+    return pd.Categorical.from_codes(codes, _numbered("product-", 50_000))
+
+
+def _date(rng, items):
+    # Everything written today shares one key: the classic hot partition.
+    return pd.Categorical.from_codes(np.zeros(items, dtype=np.int64), ["2024-06-01"])
+
+
+def _sharded_date(rng, items, shards=200):
+    return pd.Categorical.from_codes(rng.integers(0, shards, items), _numbered("2024-06-01#", shards))
+
+
+def _numbered(prefix, count):
+    return (prefix + pd.Series(np.arange(count)).astype(str)).to_numpy()
+
+
+SAMPLES = {
+    "users": ("User ID (100k users, uniform)", _users),
+    "products": ("Product ID (50k products, a few very popular)", _popular_products),
+    "date": ("Date (every write for the day shares a key)", _date),
+    "sharded": ("Date + random suffix 0-199 (write sharding)", _sharded_date),
+}
+
+Workload = namedtuple("Workload", [
+    "sample", "items", "item_kb", "writes_per_second", "reads_per_write", "rcu", "wcu", "partitions", "csv", "seed",
+])
+
+# ``read_heat``/``write_heat``: peak units per second for each partition in
+# each of up to ``columns`` time buckets of ``bucket_seconds``.
+Analysis = namedtuple("Analysis", [
+    "items", "partitions", "size_bytes", "requests", "reads_throttled", "writes_throttled",
+    "read_heat", "write_heat", "bucket_seconds", "hot_keys",
+])
+
+
+def _peaks(units, columns):
+    bucket = -(-units.shape[1] // columns)
+    padded = np.pad(units, ((0, 0), (0, -units.shape[1] % bucket)))
+    return padded.reshape(units.shape[0], -1, bucket).max(axis=2), bucket
+
+
+def load_csv(data):
+    """``(partition keys, sort keys or None, sizes or None, seconds or None)`` from CSV bytes.
+
+    Needs a ``pk`` column; ``sk``, ``size`` (bytes, NaN where blank) and
+    ``timestamp`` (seconds, or anything ``pandas.to_datetime`` reads) are
+    optional.
+    """
+    frame = pd.read_csv(io.BytesIO(data), dtype={"pk": str, "sk": str})
+    frame.columns = [str(column).strip().lower() for column in frame.columns]
+    if "pk" not in frame.columns:
+        raise ValueError("CSV needs a 'pk' column")
+    if frame.empty:
+        raise ValueError("The CSV has no rows")
+    if frame["pk"].isna().any():
+        raise ValueError("Every row needs a partition key")
+    seconds = None
+    if "timestamp" in frame.columns:
+        stamps = frame["timestamp"]
+        if not pd.api.types.is_numeric_dtype(stamps):
+            stamps = pd.to_datetime(stamps).astype("int64") / 1e9
+        seconds = (stamps - stamps.min()).to_numpy(dtype=np.int64)
+    sizes = frame["size"].to_numpy(dtype=np.float64) if "size" in frame.columns else None
+    sort_keys = frame["sk"].fillna("").to_numpy(dtype=object) if "sk" in frame.columns else None
+    return frame["pk"].to_numpy(dtype=object), sort_keys, sizes, seconds
+
+
+@functools.lru_cache(maxsize=16)
+def analyze(workload, columns=120):
+    """Load a sample or uploaded dataset at a steady write rate with reads mixed in.
+
+    Reads pick stored items uniformly, so hot keys stay hot. Cached by the
+    ``Workload`` tuple; only the summary is kept, not the table.
+    """
+    rng = np.random.default_rng(workload.seed)
+    table = Table(rcu=workload.rcu, wcu=workload.wcu, partitions=workload.partitions or None)
+    size = int(workload.item_kb * 1024)
+    seconds = None
+    if workload.csv is not None:
+        keys, sort_keys, sizes, seconds = load_csv(workload.csv)
+        if sizes is not None:
+            sizes = np.where(np.isnan(sizes), size, sizes)
+        table.batch_write(keys, sort_keys, sizes if sizes is not None else size)
+    else:
+        table.batch_write(SAMPLES[workload.sample][1](rng, workload.items), sizes=size)
+
+    count = len(table)
+    if seconds is None:
+        seconds = np.arange(count) // max(1, workload.writes_per_second)
+    reads = int(count * workload.reads_per_write)
+    rows = np.concatenate([np.arange(count), rng.integers(0, count, reads)])
+    when = np.concatenate([seconds, rng.integers(0, int(seconds.max()) + 1, reads)])
+    writes = np.concatenate([np.ones(count, dtype=bool), np.zeros(reads, dtype=bool)])
+    heat = table.replay(rows, when, writes)
+    read_heat, bucket = _peaks(heat.read_units, columns)
+    write_heat, _ = _peaks(heat.write_units, columns)
+    return Analysis(
+        count, table.partitions, table.size_bytes, heat.requests, heat.reads_throttled, heat.writes_throttled,
+        read_heat, write_heat, bucket, heat.hot_keys,
+    )
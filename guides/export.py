@@ -0,0 +1,124 @@
+"""Export every registered guide page as a static HTML bundle.
+
+    python -m guides.export --out site
+
+Writes one HTML file per page, ``index.html`` for the first page, and a
+shared ``style.css``. The bundle keeps the navigation, resources sidebar and
+table of contents, and highlights code samples ahead of time, so it can be
+served by any static file server. Interactive widgets stay on Streamlit.
+"""
+import argparse
+import html
+import os
+import sys
+
+import guides
+from guides import highlight, markdown
+
+STYLE = """
+body { margin: 0; font-family: "Source Sans Pro", sans-serif; color: #31333f; display: flex; }
+nav { width: 18rem; min-height: 100vh; padding: 2rem 1.5rem; background: #f0f2f6; box-sizing: border-box; }
+nav a { color: #31333f; }
+nav .current { font-weight: 600; }
+nav h2 { font-size: 1.1rem; margin-top: 1.5rem; }
+nav ul { padding-left: 1.2rem; }
+main { flex: 1; max-width: 60rem; padding: 2rem 3rem; }
+details { border: 1px solid #e6e9ef; border-radius: 0.5rem; padding: 0.5rem 1rem; margin: 1rem 0; }
+summary { cursor: pointer; }
+.tip { background: #e8f0fe; border-radius: 0.5rem; padding: 1rem; margin: 1rem 0; }
+.highlight { border-radius: 0.5rem; padding: 0.2rem 1rem; overflow-x: auto; background: #f8f9fb; }
+"""
+
+
+def _page_filename(page):
+    return f"{page.key}.html"
+
+
+def _render_blocks(blocks, out):
+    for block in blocks:
+        kind = block["type"]
+        if kind == "title":
+            out.append(f"<h1>{html.escape(block['text'])}</h1>")
+        elif kind in ("header", "subheader"):
+            tag = "h2" if kind == "header" else "h3"
+            out.append(f'<{tag} id="{block["anchor"]}">{html.escape(block["text"])}</{tag}>')
+        elif kind == "markdown":
+            out.append(block["html"])
+        elif kind == "code":
+            out.append(highlight.highlight(block["source"], block["language"]))
+        elif kind in ("tip", "interactive"):
+            out.append(f'<div class="tip">{html.escape(block["text"])}</div>')
+        elif kind == "expander":
+            is_open = " open" if block.get("expanded") else ""
+            out.append(f"<details{is_open}><summary>{html.escape(block['label'])}</summary>")
+            _render_blocks(block["blocks"], out)
+            out.append("</details>")
+        else:
+            raise ValueError(f"Unknown content block type: {kind!r}")
+
+
+def _render_sidebar(current, compiled):
+    out = ["<nav>", "<h2>Navigation</h2>", "<ul>"]
+    for page in guides.PAGES:
+        css_class = ' class="current"' if page is current else ""
+        out.append(f'<li><a href="{_page_filename(page)}"{css_class}>{html.escape(page.title)}</a></li>')
+    out += ["</ul>", "<h2>Resources</h2>", "<ul>"]
+    for label, url in guides.resource_links():
+        out.append(f'<li><a href="{html.escape(url)}">{html.escape(label)}</a></li>')
+    out += ["</ul>", "<h2>On this page</h2>", "<ul>"]
+    for level, title, anchor in compiled["toc"]:
+        indent = ' style="margin-left: 1rem"' if level > 2 else ""
+        out.append(f'<li{indent}><a href="#{anchor}">{html.escape(title)}</a></li>')
+    out += ["</ul>", "</nav>"]
+    return out
+
+
+def render_page(page):
+    compiled = markdown.compile_page(page.content)
+    body = []
+    _render_blocks(compiled["blocks"], body)
+    return "\n".join([
+        "<!DOCTYPE html>",
+        '<html lang="en">',
+        "<head>",
+        '<meta charset="utf-8">',
+        '<meta name="viewport" content="width=device-width, initial-scale=1">',
+        f"<title>{html.escape(page.title)} · Cloud Development Guide</title>",
+        '<link rel="stylesheet" href="style.css">',
+        "</head>",
+        "<body>",
+        *_render_sidebar(page, compiled),
+        "<main>",
+        *body,
+        "</main>",
+        "</body>",
+        "</html>",
+        "",
+    ])
+
+
+def export(out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "style.css"), "w", encoding="utf-8") as fh:
+        fh.write(STYLE.lstrip() + highlight.css() + "\n")
+    written = []
+    for i, page in enumerate(guides.PAGES):
+        document = render_page(page)
+        names = [_page_filename(page)] + (["index.html"] if i == 0 else [])
+        for name in names:
+            with open(os.path.join(out_dir, name), "w", encoding="utf-8") as fh:
+                fh.write(document)
+            written.append(name)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="site", help="output directory (default: site)")
+    args = parser.parse_args(argv)
+    written = export(args.out)
+    print(f"Wrote {len(written)} pages to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
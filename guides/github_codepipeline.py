@@ -0,0 +1,4 @@
+from guides.blocks import render_page
+
+def github_codepipeline_page():
+    render_page("github_codepipeline")
@@ -0,0 +1,602 @@
+"""A small pure-Python parser for HashiCorp Configuration Language (HCL2).
+
+Covers the native syntax used in Terraform configurations: blocks with
+labels, attributes, comments, heredocs, string templates with ``${...}``
+interpolation, and the expression language (literals, references, function
+calls, tuples, objects, operators, conditionals, splats and ``for``
+expressions). ``parse`` returns a tree of namedtuples and raises
+``HCLSyntaxError`` with a line and column on invalid input.
+"""
+import re
+from collections import namedtuple
+
+Body = namedtuple("Body", ["attributes", "blocks"])
+Attribute = namedtuple("Attribute", ["name", "expr", "line"])
+Block = namedtuple("Block", ["type", "labels", "body", "line"])
+
+Literal = namedtuple("Literal", ["value", "line"])
+Template = namedtuple("Template", ["parts", "line"])
+Traversal = namedtuple("Traversal", ["root", "steps", "line"])
+FunctionCall = namedtuple("FunctionCall", ["name", "args", "line"])
+Tuple = namedtuple("Tuple", ["items", "line"])
+Object = namedtuple("Object", ["items", "line"])
+Unary = namedtuple("Unary", ["op", "operand", "line"])
+Binary = namedtuple("Binary", ["op", "left", "right", "line"])
+Conditional = namedtuple("Conditional", ["condition", "true", "false", "line"])
+ForExpr = namedtuple("ForExpr", ["names", "collection", "key", "value", "condition", "line"])
+Splat = namedtuple("Splat", ["source", "steps", "line"])
+Index = namedtuple("Index", ["source", "key", "line"])
+GetAttr = namedtuple("GetAttr", ["source", "name", "line"])
+
+Token = namedtuple("Token", ["kind", "value", "line", "col"])
+
+
+class HCLSyntaxError(ValueError):
+    def __init__(self, message, line, col):
+        super().__init__(f"{message} (line {line}, column {col})")
+        self.message = message
+        self.line = line
+        self.col = col
+
+
+_OPERATORS = [
+    "=>", "==", "!=", "<=", ">=", "&&", "||", "...",
+    "{", "}", "[", "]", "(", ")", "=", ",", ".", ":", "?",
+    "!", "+", "-", "*", "/", "%", "<", ">",
+]
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+_NUMBER_RE = re.compile(r"[0-9]+(\.[0-9]+)?([eE][+-]?[0-9]+)?")
+_HEREDOC_RE = re.compile(r"<<(-?)([A-Za-z_][A-Za-z0-9_]*)\r?\n")
+_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", '"': '"', "\\": "\\"}
+
+
+class _Lexer:
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        self.line = 1
+        self.col = 1
+
+    def error(self, message):
+        raise HCLSyntaxError(message, self.line, self.col)
+
+    def _advance(self, n):
+        chunk = self.text[self.pos:self.pos + n]
+        newlines = chunk.count("\n")
+        if newlines:
+            self.line += newlines
+            self.col = n - chunk.rfind("\n")
+        else:
+            self.col += n
+        self.pos += n
+        return chunk
+
+    def tokens(self, stop_at_brace=False):
+        """Lex until EOF, or until the ``}`` closing an interpolation if ``stop_at_brace``."""
+        out = []
+        depth = 0
+        # Open brackets, innermost last. Newlines only separate items in
+        # bodies and objects; inside (...) and [...] they are insignificant.
+        nesting = []
+        text = self.text
+        while True:
+            if self.pos >= len(text):
+                if stop_at_brace:
+                    self.error("Unterminated template interpolation")
+                out.append(Token("EOF", None, self.line, self.col))
+                return out
+            ch = text[self.pos]
+            line, col = self.line, self.col
+            if ch in " \t\r":
+                self._advance(1)
+            elif ch == "\n":
+                self._advance(1)
+                if not nesting or nesting[-1] == "{":
+                    out.append(Token("NEWLINE", None, line, col))
+            elif ch == "#" or text.startswith("//", self.pos):
+                end = text.find("\n", self.pos)
+                self._advance((end if end != -1 else len(text)) - self.pos)
+            elif text.startswith("/*", self.pos):
+                end = text.find("*/", self.pos + 2)
+                if end == -1:
+                    self.error("Unterminated comment")
+                self._advance(end + 2 - self.pos)
+            elif ch == '"':
+                self._advance(1)
+                out.append(Token("STRING", self._template('"'), line, col))
+            elif text.startswith("<<", self.pos) and _HEREDOC_RE.match(text, self.pos):
+                out.append(Token("STRING", self._heredoc(), line, col))
+            elif ch.isdigit():
+                match = _NUMBER_RE.match(text, self.pos)
+                self._advance(len(match.group()))
+                value = float(match.group()) if match.group(1) or match.group(2) else int(match.group())
+                out.append(Token("NUMBER", value, line, col))
+            elif ch.isalpha() or ch == "_":
+                match = _IDENT_RE.match(text, self.pos)
+                self._advance(len(match.group()))
+                out.append(Token("IDENT", match.group(), line, col))
+            else:
+                for op in _OPERATORS:
+                    if text.startswith(op, self.pos):
+                        break
+                else:
+                    self.error(f"Unexpected character {ch!r}")
+                if stop_at_brace and op == "}" and depth == 0:
+                    self._advance(1)
+                    out.append(Token("EOF", None, line, col))
+                    return out
+                if op == "{":
+                    depth += 1
+                elif op == "}":
+                    depth -= 1
+                if op in ("(", "[", "{"):
+                    nesting.append(op)
+                elif op in (")", "]", "}") and nesting:
+                    nesting.pop()
+                self._advance(len(op))
+                out.append(Token("OP", op, line, col))
+
+    def _template(self, terminator):
+        """Read a template body up to ``terminator`` (or the end of input if None).
+
+        Returns a list of literal strings and token lists for interpolations.
+        """
+        parts = []
+        buf = []
+        text = self.text
+        while True:
+            if self.pos >= len(text):
+                if terminator is None:
+                    break
+                self.error("Unterminated string")
+            ch = text[self.pos]
+            if ch == "\n" and terminator == '"':
+                self.error("Unterminated string")
+            if ch == terminator:
+                self._advance(1)
+                break
+            if ch == "\\" and terminator is not None:
+                nxt = text[self.pos + 1:self.pos + 2]
+                if nxt in _ESCAPES:
+                    buf.append(_ESCAPES[nxt])
+                    self._advance(2)
+                elif nxt == "u" and re.match(r"[0-9A-Fa-f]{4}", text[self.pos + 2:self.pos + 6]):
+                    buf.append(chr(int(text[self.pos + 2:self.pos + 6], 16)))
+                    self._advance(6)
+                else:
+                    self.error(f"Invalid escape sequence \\{nxt}")
+            elif text.startswith("$${", self.pos) or text.startswith("%%{", self.pos):
+                buf.append(text[self.pos + 1:self.pos + 3])
+                self._advance(3)
+            elif text.startswith("${", self.pos) or text.startswith("%{", self.pos):
+                if buf:
+                    parts.append("".join(buf))
+                    buf = []
+                directive = ch == "%"
+                self._advance(2)
+                tokens = self.tokens(stop_at_brace=True)
+                # %{ if }/%{ for } directives are kept as opaque template text.
+                parts.append(("directive", tokens) if directive else tokens)
+            else:
+                buf.append(ch)
+                self._advance(1)
+        if buf or not parts:
+            parts.append("".join(buf))
+        return parts
+
+    def _heredoc(self):
+        match = _HEREDOC_RE.match(self.text, self.pos)
+        indent, marker = match.group(1), match.group(2)
+        self._advance(len(match.group()))
+        end = re.compile(r"^[ \t]*" + re.escape(marker) + r"[ \t]*$", re.M).search(self.text, self.pos)
+        if end is None:
+            self.error(f"Unterminated heredoc; expected closing {marker}")
+        lines = self.text[self.pos:end.start()].split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+        if indent:
+            width = min((len(l) - len(l.lstrip()) for l in lines if l.strip()), default=0)
+            lines = [l[width:] for l in lines]
+        sub = _Lexer("\n".join(lines) + ("\n" if lines else ""))
+        sub.line = self.line
+        self._advance(end.end() - self.pos)
+        return sub._template(None)
+
+
+_BINARY_LEVELS = [
+    ("||",),
+    ("&&",),
+    ("==", "!="),
+    ("<", ">", "<=", ">="),
+    ("+", "-"),
+    ("*", "/", "%"),
+]
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.i = 0
+
+    @property
+    def tok(self):
+        return self.tokens[self.i]
+
+    def error(self, message, tok=None):
+        tok = tok or self.tok
+        raise HCLSyntaxError(message, tok.line, tok.col)
+
+    def next(self):
+        tok = self.tokens[self.i]
+        if tok.kind == "EOF":
+            self.error("Unexpected end of input", tok)
+        self.i += 1
+        return tok
+
+    def is_op(self, *ops):
+        return self.tok.kind == "OP" and self.tok.value in ops
+
+    def expect_op(self, op):
+        if not self.is_op(op):
+            self.error(f"Expected {op!r}, found {self._describe(self.tok)}")
+        return self.next()
+
+    def skip_newlines(self):
+        while self.tok.kind == "NEWLINE":
+            self.i += 1
+
+    def _describe(self, tok):
+        if tok.kind == "EOF":
+            return "end of input"
+        if tok.kind == "NEWLINE":
+            return "newline"
+        if tok.kind == "STRING":
+            return "string"
+        return repr(tok.value)
+
+    # Structure
+
+    def body(self, closing):
+        attributes, blocks = [], []
+        seen = {}
+        while True:
+            self.skip_newlines()
+            tok = self.tok
+            if closing is None and tok.kind == "EOF":
+                break
+            if closing is not None and self.is_op("}"):
+                break
+            if tok.kind != "IDENT":
+                self.error(f"Expected an attribute or block, found {self._describe(tok)}")
+            name = self.next()
+            if self.is_op("="):
+                self.next()
+                if name.value in seen:
+                    self.error(f"Duplicate attribute {name.value!r}; first defined on line {seen[name.value]}", name)
+                seen[name.value] = name.line
+                attributes.append(Attribute(name.value, self.expression(), name.line))
+                self._end_of_item(closing)
+            else:
+                blocks.append(self.block(name, closing))
+        return Body(attributes, blocks)
+
+    def block(self, name, closing):
+        labels = []
+        while self.tok.kind in ("STRING", "IDENT"):
+            tok = self.next()
+            if tok.kind == "STRING":
+                if len(tok.value) != 1 or not isinstance(tok.value[0], str):
+                    self.error("Block labels cannot contain template interpolations", tok)
+                labels.append(tok.value[0])
+            else:
+                labels.append(tok.value)
+        self.expect_op("{")
+        if self.tok.kind == "NEWLINE":
+            body = self.body("}")
+        else:
+            # Single-line block: at most one attribute.
+            body = Body([], [])
+            if not self.is_op("}"):
+                attr_name = self.next()
+                if attr_name.kind != "IDENT":
+                    self.error("Expected an attribute in single-line block", attr_name)
+                self.expect_op("=")
+                body = Body([Attribute(attr_name.value, self.expression(), attr_name.line)], [])
+        self.expect_op("}")
+        self._end_of_item(closing)
+        return Block(name.value, labels, body, name.line)
+
+    def _end_of_item(self, closing):
+        if self.tok.kind == "NEWLINE":
+            self.next()
+        elif self.tok.kind == "EOF" or (closing is not None and self.is_op(closing)):
+            return
+        else:
+            self.error(f"Expected a newline after this item, found {self._describe(self.tok)}")
+
+    # Expressions
+
+    def expression(self):
+        cond = self.binary(0)
+        if self.is_op("?"):
+            self.next()
+            true = self.expression()
+            self.expect_op(":")
+            false = self.expression()
+            return Conditional(cond, true, false, cond.line)
+        return cond
+
+    def binary(self, level):
+        if level == len(_BINARY_LEVELS):
+            return self.unary()
+        left = self.binary(level + 1)
+        while self.tok.kind == "OP" and self.tok.value in _BINARY_LEVELS[level]:
+            op = self.next().value
+            right = self.binary(level + 1)
+            left = Binary(op, left, right, left.line)
+        return left
+
+    def unary(self):
+        if self.is_op("-", "!"):
+            tok = self.next()
+            return Unary(tok.value, self.unary(), tok.line)
+        return self.postfix(self.primary())
+
+    def postfix(self, expr):
+        while True:
+            if self.is_op("."):
+                self.next()
+                tok = self.next()
+                if tok.kind == "IDENT":
+                    expr = self._step(expr, ("attr", tok.value))
+                elif tok.kind == "NUMBER" and isinstance(tok.value, int):
+                    expr = self._step(expr, ("index", Literal(tok.value, tok.line)))
+                elif tok.kind == "OP" and tok.value == "*":
+                    expr = Splat(expr, [], expr.line)
+                else:
+                    self.error("Expected an attribute name after '.'", tok)
+            elif self.is_op("["):
+                self.next()
+                self.skip_newlines()
+                if self.is_op("*"):
+                    self.next()
+                    expr = Splat(expr, [], expr.line)
+                else:
+                    expr = self._step(expr, ("index", self.expression()))
+                self.skip_newlines()
+                self.expect_op("]")
+            else:
+                return expr
+
+    def _step(self, expr, step):
+        if isinstance(expr, Traversal):
+            return Traversal(expr.root, expr.steps + [step], expr.line)
+        if isinstance(expr, Splat):
+            return Splat(expr.source, expr.steps + [step], expr.line)
+        if step[0] == "attr":
+            return GetAttr(expr, step[1], expr.line)
+        return Index(expr, step[1], expr.line)
+
+    def primary(self):
+        tok = self.tok
+        if tok.kind == "NUMBER":
+            self.next()
+            return Literal(tok.value, tok.line)
+        if tok.kind == "STRING":
+            self.next()
+            return self._template_expr(tok)
+        if tok.kind == "IDENT":
+            self.next()
+            if tok.value in ("true", "false"):
+                return Literal(tok.value == "true", tok.line)
+            if tok.value == "null":
+                return Literal(None, tok.line)
+            if self.is_op("("):
+                return self._call(tok)
+            return Traversal(tok.value, [], tok.line)
+        if self.is_op("("):
+            self.next()
+            self.skip_newlines()
+            expr = self.expression()
+            self.skip_newlines()
+            self.expect_op(")")
+            return expr
+        if self.is_op("["):
+            return self._tuple()
+        if self.is_op("{"):
+            return self._object()
+        self.error(f"Expected an expression, found {self._describe(tok)}")
+
+    def _template_expr(self, tok):
+        parts = []
+        for part in tok.value:
+            if isinstance(part, str):
+                parts.append(part)
+            elif isinstance(part, tuple):
+                parts.append(Literal("%{...}", tok.line))
+            else:
+                sub = _Parser(part)
+                sub.skip_newlines()
+                if sub.tok.kind == "EOF":
+                    sub.error("Empty template interpolation")
+                expr = sub.expression()
+                sub.skip_newlines()
+                if sub.tok.kind != "EOF":
+                    sub.error(f"Unexpected {sub._describe(sub.tok)} in template interpolation")
+                parts.append(expr)
+        if len(parts) == 1 and isinstance(parts[0], str):
+            return Literal(parts[0], tok.line)
+        return Template(parts, tok.line)
+
+    def _call(self, name):
+        self.expect_op("(")
+        args = []
+        self.skip_newlines()
+        while not self.is_op(")"):
+            args.append(self.expression())
+            self.skip_newlines()
+            if self.is_op("..."):
+                self.next()
+                self.skip_newlines()
+            if self.is_op(","):
+                self.next()
+                self.skip_newlines()
+            elif not self.is_op(")"):
+                self.error(f"Expected ',' or ')' in call to {name.value}()")
+        self.next()
+        return FunctionCall(name.value, args, name.line)
+
+    def _for_header(self):
+        names = [self.next()]
+        if self.is_op(","):
+            self.next()
+            names.append(self.next())
+        for name in names:
+            if name.kind != "IDENT":
+                self.error("Expected an iterator name in for expression", name)
+        in_tok = self.next()
+        if in_tok.kind != "IDENT" or in_tok.value != "in":
+            self.error("Expected 'in' in for expression", in_tok)
+        collection = self.expression()
+        self.expect_op(":")
+        self.skip_newlines()
+        return [name.value for name in names], collection
+
+    def _for_tail(self):
+        self.skip_newlines()
+        if self.tok.kind == "IDENT" and self.tok.value == "if":
+            self.next()
+            return self.expression()
+        return None
+
+    def _tuple(self):
+        start = self.expect_op("[")
+        self.skip_newlines()
+        if self.tok.kind == "IDENT" and self.tok.value == "for":
+            self.next()
+            names, collection = self._for_header()
+            value = self.expression()
+            condition = self._for_tail()
+            self.skip_newlines()
+            self.expect_op("]")
+            return ForExpr(names, collection, None, value, condition, start.line)
+        items = []
+        while not self.is_op("]"):
+            items.append(self.expression())
+            self.skip_newlines()
+            if self.is_op(","):
+                self.next()
+                self.skip_newlines()
+            elif not self.is_op("]"):
+                self.error("Expected ',' or ']' in tuple")
+        self.next()
+        return Tuple(items, start.line)
+
+    def _object(self):
+        start = self.expect_op("{")
+        self.skip_newlines()
+        if self.tok.kind == "IDENT" and self.tok.value == "for":
+            self.next()
+            names, collection = self._for_header()
+            key = self.expression()
+            self.expect_op("=>")
+            value = self.expression()
+            if self.is_op("..."):
+                self.next()
+            condition = self._for_tail()
+            self.skip_newlines()
+            self.expect_op("}")
+            return ForExpr(names, collection, key, value, condition, start.line)
+        items = []
+        while not self.is_op("}"):
+            if self.tok.kind == "IDENT" and self.tokens[self.i + 1].kind == "OP" and self.tokens[self.i + 1].value in ("=", ":"):
+                key_tok = self.next()
+                key = Literal(key_tok.value, key_tok.line)
+            else:
+                key = self.expression()
+            if not self.is_op("=", ":"):
+                self.error("Expected '=' or ':' after object key")
+            self.next()
+            self.skip_newlines()
+            items.append((key, self.expression()))
+            if self.is_op(","):
+                self.next()
+                self.skip_newlines()
+            elif self.tok.kind == "NEWLINE":
+                self.skip_newlines()
+            elif not self.is_op("}"):
+                self.error("Expected a newline, ',' or '}' after object item")
+        self.next()
+        return Object(items, start.line)
+
+
+def parse(text):
+    """Parse an HCL document into a ``Body``."""
+    parser = _Parser(_Lexer(text).tokens())
+    return parser.body(None)
+
+
+def walk_expressions(expr, visit, scope=frozenset()):
+    """Call ``visit(traversal, scope)`` for every traversal in ``expr``.
+
+    ``scope`` holds the iterator names bound by enclosing ``for`` expressions.
+    """
+    if isinstance(expr, Traversal):
+        visit(expr, scope)
+        for step in expr.steps:
+            if step[0] == "index":
+                walk_expressions(step[1], visit, scope)
+    elif isinstance(expr, Template):
+        for part in expr.parts:
+            if not isinstance(part, str):
+                walk_expressions(part, visit, scope)
+    elif isinstance(expr, FunctionCall):
+        for arg in expr.args:
+            walk_expressions(arg, visit, scope)
+    elif isinstance(expr, Tuple):
+        for item in expr.items:
+            walk_expressions(item, visit, scope)
+    elif isinstance(expr, Object):
+        for key, value in expr.items:
+            walk_expressions(key, visit, scope)
+            walk_expressions(value, visit, scope)
+    elif isinstance(expr, Unary):
+        walk_expressions(expr.operand, visit, scope)
+    elif isinstance(expr, Binary):
+        walk_expressions(expr.left, visit, scope)
+        walk_expressions(expr.right, visit, scope)
+    elif isinstance(expr, Conditional):
+        for sub in (expr.condition, expr.true, expr.false):
+            walk_expressions(sub, visit, scope)
+    elif isinstance(expr, ForExpr):
+        walk_expressions(expr.collection, visit, scope)
+        inner = scope | set(expr.names)
+        for sub in (expr.key, expr.value, expr.condition):
+            if sub is not None:
+                walk_expressions(sub, visit, inner)
+    elif isinstance(expr, Splat):
+        walk_expressions(expr.source, visit, scope)
+        for step in expr.steps:
+            if step[0] == "index":
+                walk_expressions(step[1], visit, scope)
+    elif isinstance(expr, (GetAttr, Index)):
+        walk_expressions(expr.source, visit, scope)
+        if isinstance(expr, Index):
+            walk_expressions(expr.key, visit, scope)
+
+
+def references(body):
+    """Return every traversal in ``body`` (recursively) as ``(traversal, scope)`` pairs."""
+    found = []
+
+    def visit(traversal, scope):
+        found.append((traversal, scope))
+
+    def walk_body(body):
+        for attr in body.attributes:
+            walk_expressions(attr.expr, visit)
+        for block in body.blocks:
+            walk_body(block.body)
+
+    walk_body(body)
+    return found
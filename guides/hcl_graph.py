@@ -0,0 +1,300 @@
+"""Resource dependency graph and apply-wave planner for Terraform configs.
+
+    python -m guides.hcl_graph main.tf                  # waves and critical path
+    python -m guides.hcl_graph main.tf --parallelism 10 # plus a -parallelism estimate
+    python -m guides.hcl_graph main.tf --dot > graph.dot
+
+Edges come from references between top-level objects (``aws_s3_bucket.b.id``
+makes the referring block depend on the bucket) and from ``depends_on``.
+Variables, locals and outputs are graph nodes too, so a resource reading a
+local that reads another resource depends on it; they take no time to apply
+and don't count as a wave. Every resource applies as soon as everything it
+depends on has, so wave ``n`` holds the resources whose longest dependency
+chain is ``n`` resources deep, and the critical path is the chain that bounds
+the whole apply. Everything is linear in nodes plus edges.
+"""
+import argparse
+import functools
+import heapq
+import sys
+from collections import deque, namedtuple
+
+from guides import hcl
+
+Node = namedtuple("Node", ["address", "kind", "line"])
+
+# ``waves``: lists of resource addresses applied together; ``critical_path``:
+# addresses along the longest chain; ``duration``: its total weight.
+Plan = namedtuple("Plan", ["waves", "critical_path", "duration"])
+
+# Nodes that Terraform creates, reads or calls; the rest are plumbing.
+APPLIED_KINDS = {"resource", "data", "module"}
+
+_BUILTIN_ROOTS = {"count", "each", "self", "path", "terraform"}
+
+
+class CycleError(ValueError):
+    def __init__(self, addresses):
+        super().__init__("Dependency cycle between " + ", ".join(sorted(addresses)))
+        self.addresses = addresses
+
+
+def _declared(body):
+    """Yield ``(address, kind, line, body_or_expr)`` for each top-level object."""
+    for block in body.blocks:
+        labels = block.labels
+        if block.type == "resource" and len(labels) == 2:
+            yield ".".join(labels), "resource", block.line, block.body
+        elif block.type == "data" and len(labels) == 2:
+            yield "data." + ".".join(labels), "data", block.line, block.body
+        elif block.type == "module" and len(labels) == 1:
+            yield f"module.{labels[0]}", "module", block.line, block.body
+        elif block.type == "variable" and len(labels) == 1:
+            yield f"var.{labels[0]}", "variable", block.line, block.body
+        elif block.type == "output" and len(labels) == 1:
+            yield f"output.{labels[0]}", "output", block.line, block.body
+        elif block.type == "locals":
+            for attr in block.body.attributes:
+                yield f"local.{attr.name}", "local", attr.line, attr.expr
+
+
+def _address(traversal):
+    """Return the address ``traversal`` points at, or None for builtins."""
+    root = traversal.root
+    names = [step[1] for step in traversal.steps if step[0] == "attr"]
+    if root in _BUILTIN_ROOTS or not names:
+        return None
+    if root in ("var", "local", "module"):
+        return f"{root}.{names[0]}"
+    if root == "data":
+        return "data." + ".".join(names[:2]) if len(names) >= 2 else None
+    if traversal.steps[0][0] != "attr":
+        return None
+    return f"{root}.{names[0]}"
+
+
+def build(body):
+    """Return ``(nodes, deps)``: ``{address: Node}`` and ``{address: [address, ...]}``.
+
+    References to undeclared objects are left out; ``guides.hcl_validate``
+    reports those.
+    """
+    nodes = {}
+    sources = {}
+    for address, kind, line, source in _declared(body):
+        nodes[address] = Node(address, kind, line)
+        sources[address] = source
+
+    deps = {}
+    for address, source in sources.items():
+        if isinstance(source, hcl.Body):
+            found = hcl.references(source)
+        else:
+            found = []
+            hcl.walk_expressions(source, lambda traversal, scope: found.append((traversal, scope)))
+        targets = {_address(traversal) for traversal, scope in found if traversal.root not in scope}
+        targets.discard(address)
+        deps[address] = sorted(target for target in targets if target in nodes)
+    return nodes, deps
+
+
+def plan(nodes, deps, durations=None):
+    """Compute the apply waves and critical path with Kahn's algorithm.
+
+    ``durations`` maps resource addresses to apply times; by default each
+    resource counts as 1, so the duration is the number of serial steps.
+    Raises ``CycleError`` if the graph has a cycle.
+    """
+    dependents = {address: [] for address in nodes}
+    remaining = {}
+    for address, targets in deps.items():
+        remaining[address] = len(targets)
+        for target in targets:
+            dependents[target].append(address)
+
+    def weight(address):
+        if nodes[address].kind not in APPLIED_KINDS:
+            return 0
+        return durations.get(address, 1) if durations is not None else 1
+
+    level = {}
+    finish = {}
+    via = {}
+    ready = deque(address for address in nodes if remaining.get(address, 0) == 0)
+    for address in ready:
+        level[address] = 0
+        finish[address] = 0
+        via[address] = None
+    ordered = 0
+    while ready:
+        address = ready.popleft()
+        ordered += 1
+        applied = nodes[address].kind in APPLIED_KINDS
+        level[address] += applied
+        finish[address] += weight(address)
+        for dependent in dependents[address]:
+            if dependent not in level or level[address] > level[dependent]:
+                level[dependent] = level[address]
+            if dependent not in finish or finish[address] > finish[dependent]:
+                finish[dependent] = finish[address]
+                via[dependent] = address
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                ready.append(dependent)
+    if ordered != len(nodes):
+        raise CycleError([address for address, count in remaining.items() if count])
+
+    waves = [[] for _ in range(max(level.values(), default=0))]
+    for address in nodes:
+        if nodes[address].kind in APPLIED_KINDS:
+            waves[level[address] - 1].append(address)
+
+    path = []
+    address = max(nodes, key=finish.__getitem__, default=None)
+    duration = finish.get(address, 0)
+    while address is not None:
+        if nodes[address].kind in APPLIED_KINDS:
+            path.append(address)
+        address = via[address]
+    return Plan(waves, path[::-1], duration)
+
+
+def schedule(nodes, deps, parallelism, durations=None):
+    """Return the apply time with at most ``parallelism`` operations in flight.
+
+    Models ``terraform apply -parallelism=N``: whenever a slot frees up, the
+    ready resource that was declared first starts.
+    """
+    if parallelism < 1:
+        raise ValueError(f"parallelism must be at least 1, got {parallelism}")
+    dependents = {address: [] for address in nodes}
+    remaining = {address: len(deps.get(address, ())) for address in nodes}
+    for address, targets in deps.items():
+        for target in targets:
+            dependents[target].append(address)
+    order = {address: index for index, address in enumerate(nodes)}
+
+    def weight(address):
+        return durations.get(address, 1) if durations is not None else 1
+
+    ready = []
+    running = []
+    busy = 0
+    now = 0
+
+    def release(address):
+        # Plumbing (variables, locals, outputs) takes no slot and no time.
+        if nodes[address].kind in APPLIED_KINDS:
+            heapq.heappush(ready, (order[address], address))
+        else:
+            heapq.heappush(running, (now, address))
+
+    for address in nodes:
+        if remaining[address] == 0:
+            release(address)
+    while ready or running:
+        while ready and busy < parallelism:
+            _, address = heapq.heappop(ready)
+            busy += 1
+            heapq.heappush(running, (now + weight(address), address))
+        now, address = heapq.heappop(running)
+        if nodes[address].kind in APPLIED_KINDS:
+            busy -= 1
+        for dependent in dependents[address]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                release(dependent)
+    return now
+
+
+def dot(nodes, deps, result, max_nodes=300):
+    """Graphviz DOT for the graph, one rank per wave, critical path in red.
+
+    Larger graphs are cut down to the critical path and its neighbours.
+    """
+    shown = set(nodes)
+    if len(nodes) > max_nodes:
+        order = {address: index for index, address in enumerate(nodes)}
+        shown = set(result.critical_path)
+        for address in result.critical_path:
+            shown.update(deps.get(address, ()))
+        shown = set(sorted(shown, key=order.__getitem__)[:max_nodes])
+    critical = set(zip(result.critical_path, result.critical_path[1:]))
+    lines = [
+        "digraph terraform {",
+        "  rankdir=LR;",
+        '  node [shape=box, style="rounded,filled", fillcolor="#f0f2f6", fontname="sans-serif", fontsize=10];',
+    ]
+    on_path = set(result.critical_path)
+    for number, wave in enumerate(result.waves, 1):
+        members = " ".join(f'"{address}";' for address in wave if address in shown)
+        if members:
+            lines.append(f'  subgraph "wave{number}" {{ rank=same; {members} }}')
+    for address, node in nodes.items():
+        if address not in shown:
+            continue
+        style = ' color="#d62728", penwidth=2' if address in on_path else ""
+        if node.kind not in APPLIED_KINDS:
+            style += ' shape=note, fillcolor="#ffffff"'
+        lines.append(f'  "{address}" [label="{address}"{style}];')
+    for address, targets in deps.items():
+        for target in targets:
+            if address in shown and target in shown:
+                edge = ' [color="#d62728", penwidth=2]' if (target, address) in critical else ""
+                lines.append(f'  "{target}" -> "{address}"{edge};')
+    lines.append("}")
+    return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=64)
+def analyze(source):
+    """Return ``(nodes, deps, plan)`` for an HCL document; cached by source."""
+    nodes, deps = build(hcl.parse(source))
+    return nodes, deps, plan(nodes, deps)
+
+
+def _parallelism(value):
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", help="Terraform file to analyze")
+    parser.add_argument("--parallelism", type=_parallelism, help="also estimate an apply with this -parallelism")
+    parser.add_argument("--dot", action="store_true", help="print the graph as Graphviz DOT")
+    args = parser.parse_args(argv)
+
+    with open(args.file, encoding="utf-8") as fh:
+        source = fh.read()
+    try:
+        nodes, deps, result = analyze(source)
+    except (hcl.HCLSyntaxError, CycleError) as exc:
+        print(f"{args.file}: {exc}", file=sys.stderr)
+        return 1
+    if args.dot:
+        print(dot(nodes, deps, result))
+        return 0
+
+    applied = sum(len(wave) for wave in result.waves)
+    print(f"{applied} resources in {len(result.waves)} wave(s); widest wave {max(map(len, result.waves), default=0)}")
+    for number, wave in enumerate(result.waves, 1):
+        listed = ", ".join(wave[:8]) + (f", ... ({len(wave)} total)" if len(wave) > 8 else "")
+        print(f"  wave {number}: {listed}")
+    path = result.critical_path
+    if len(path) > 12:
+        path = path[:5] + [f"... {len(path) - 10} more ..."] + path[-5:]
+    print(f"critical path ({result.duration} step(s)): " + " -> ".join(path))
+    if args.parallelism is not None:
+        steps = schedule(nodes, deps, args.parallelism)
+        print(f"with -parallelism={args.parallelism}: {steps} step(s) vs {result.duration} unlimited")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
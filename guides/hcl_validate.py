@@ -0,0 +1,328 @@
+"""Offline validation of the Terraform samples shown in the guides.
+
+    python -m guides.hcl_validate            # every HCL sample in every version
+    python -m guides.hcl_validate main.tf    # specific files
+
+Checks syntax (via ``guides.hcl``), block types and labels, duplicate
+addresses, that references such as ``aws_s3_bucket.my_bucket.id`` point at a
+declared object and a known attribute, and that arguments are known for the
+resource types in ``SCHEMA``. Types missing from the schema are only checked
+for references. Samples are validated in a process pool and results are
+memoized on disk in the same cache as ``guides.verify`` (``--no-cache`` to
+skip it); exits non-zero on any error.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+from guides import hcl, snippets
+
+DEFAULT_CACHE = os.path.join(snippets.REPO_ROOT, ".sample_cache.json")
+
+Diagnostic = namedtuple("Diagnostic", ["severity", "line", "message"])
+
+Schema = namedtuple("Schema", ["arguments", "blocks", "attributes"])
+
+# Arguments, nested blocks and exported attributes for the provider and
+# resource types the guides use. Arguments are readable as attributes too.
+SCHEMA = {
+    "provider": {
+        "aws": Schema(
+            arguments={
+                "region", "profile", "access_key", "secret_key", "token",
+                "shared_config_files", "shared_credentials_files", "max_retries",
+                "allowed_account_ids", "forbidden_account_ids", "skip_credentials_validation",
+            },
+            blocks={"assume_role", "default_tags", "endpoints", "ignore_tags"},
+            attributes=set(),
+        ),
+    },
+    "resource": {
+        "random_id": Schema(
+            arguments={"byte_length", "keepers", "prefix"},
+            blocks=set(),
+            attributes={"id", "b64_url", "b64_std", "hex", "dec"},
+        ),
+        "aws_s3_bucket": Schema(
+            arguments={"bucket", "bucket_prefix", "force_destroy", "object_lock_enabled", "tags"},
+            blocks={"timeouts"},
+            attributes={
+                "id", "arn", "bucket_domain_name", "bucket_regional_domain_name",
+                "hosted_zone_id", "region", "tags_all",
+            },
+        ),
+        "aws_s3_bucket_acl": Schema(
+            arguments={"bucket", "acl", "expected_bucket_owner"},
+            blocks={"access_control_policy"},
+            attributes={"id"},
+        ),
+        "aws_s3_bucket_versioning": Schema(
+            arguments={"bucket", "expected_bucket_owner", "mfa"},
+            blocks={"versioning_configuration"},
+            attributes={"id"},
+        ),
+        "aws_s3_bucket_server_side_encryption_configuration": Schema(
+            arguments={"bucket", "expected_bucket_owner"},
+            blocks={"rule"},
+            attributes={"id"},
+        ),
+    },
+}
+
+# Meta-arguments and blocks Terraform accepts on every resource or data block.
+META_ARGUMENTS = {"count", "for_each", "depends_on", "provider"}
+META_BLOCKS = {"lifecycle", "provisioner", "connection", "dynamic"}
+
+# Top-level block types and how many labels each takes.
+BLOCK_LABELS = {
+    "terraform": 0,
+    "provider": 1,
+    "variable": 1,
+    "output": 1,
+    "locals": 0,
+    "module": 1,
+    "resource": 2,
+    "data": 2,
+    "moved": 0,
+    "import": 0,
+}
+
+# Reference roots that are always in scope (``count.index``, ``path.module``...).
+BUILTIN_ROOTS = {"count", "each", "self", "path", "terraform"}
+
+# Type constraint keywords, names rather than references in a variable's ``type``.
+TYPE_KEYWORDS = {"string", "number", "bool", "any", "list", "map", "set", "object", "tuple"}
+# Meta-arguments that name provider configurations (``aws.west``), by block type.
+PROVIDER_ARGUMENTS = {"resource": {"provider"}, "data": {"provider"}, "module": {"providers"}}
+# Lifecycle arguments that list the resource's own attributes (or ``all``),
+# not references to check.
+UNCHECKED_LIFECYCLE = {"ignore_changes", "replace_triggered_by"}
+
+
+def _declarations(body, diagnostics):
+    """Index the document's top-level declarations by address."""
+    declared = {"var": {}, "local": {}, "module": {}, "data": {}, "resource": {}}
+    addresses = {}
+    for block in body.blocks:
+        expected = BLOCK_LABELS.get(block.type)
+        if expected is None:
+            diagnostics.append(Diagnostic("error", block.line, f"Unknown block type {block.type!r}"))
+            continue
+        if len(block.labels) != expected:
+            diagnostics.append(Diagnostic(
+                "error", block.line,
+                f"{block.type!r} blocks take {expected} label(s), found {len(block.labels)}",
+            ))
+            continue
+
+        if block.type in ("resource", "data"):
+            address = ".".join((["data"] if block.type == "data" else []) + block.labels)
+            declared[block.type][tuple(block.labels)] = block
+        elif block.type == "variable":
+            address = f"var.{block.labels[0]}"
+            declared["var"][block.labels[0]] = block
+        elif block.type == "module":
+            address = f"module.{block.labels[0]}"
+            declared["module"][block.labels[0]] = block
+        elif block.type == "locals":
+            for attr in block.body.attributes:
+                if attr.name in declared["local"]:
+                    diagnostics.append(Diagnostic(
+                        "error", attr.line,
+                        f"Duplicate local value {attr.name!r}; first defined on line "
+                        f"{declared['local'][attr.name].line}",
+                    ))
+                declared["local"][attr.name] = attr
+            continue
+        else:
+            continue
+        if address in addresses:
+            diagnostics.append(Diagnostic(
+                "error", block.line, f"Duplicate {address}; first defined on line {addresses[address]}"
+            ))
+        else:
+            addresses[address] = block.line
+    return declared
+
+
+def _check_arguments(block, diagnostics):
+    if block.type not in ("provider", "resource") or not block.labels:
+        return
+    schema = SCHEMA[block.type].get(block.labels[0])
+    if schema is None:
+        if block.type == "resource":
+            diagnostics.append(Diagnostic(
+                "warning", block.line, f"No schema for resource type {block.labels[0]!r}; arguments not checked"
+            ))
+        return
+    allowed = schema.arguments | (META_ARGUMENTS if block.type == "resource" else {"alias"})
+    for attr in block.body.attributes:
+        if attr.name not in allowed:
+            diagnostics.append(Diagnostic(
+                "error", attr.line, f"Unsupported argument {attr.name!r} in {block.type} {block.labels[0]!r}"
+            ))
+    for nested in block.body.blocks:
+        if nested.type not in schema.blocks and nested.type not in META_BLOCKS:
+            diagnostics.append(Diagnostic(
+                "error", nested.line, f"Unsupported block {nested.type!r} in {block.type} {block.labels[0]!r}"
+            ))
+
+
+def _attr_steps(traversal):
+    return [step[1] for step in traversal.steps if step[0] == "attr"]
+
+
+def _check_reference(traversal, declared, diagnostics):
+    root, line = traversal.root, traversal.line
+    steps = traversal.steps
+    names = _attr_steps(traversal)
+    if root in BUILTIN_ROOTS:
+        return
+    if root in ("var", "local", "module"):
+        if not names or steps[0][0] != "attr":
+            diagnostics.append(Diagnostic("error", line, f"Incomplete reference to {root}"))
+        elif names[0] not in declared[root]:
+            kind = {"var": "input variable", "local": "local value", "module": "module"}[root]
+            diagnostics.append(Diagnostic(
+                "error", line, f"Reference to undeclared {kind} {root}.{names[0]}"
+            ))
+        return
+
+    if root == "data":
+        kind, address, attr_steps = "data", tuple(names[:2]), steps[2:]
+        label = "data." + ".".join(names[:2])
+        if len(names) < 2:
+            diagnostics.append(Diagnostic("error", line, "Incomplete reference to data"))
+            return
+    else:
+        if not steps or steps[0][0] != "attr":
+            diagnostics.append(Diagnostic("error", line, f"Unknown name {root!r}"))
+            return
+        kind, address, attr_steps = "resource", (root, names[0]), steps[1:]
+        label = f"{root}.{names[0]}"
+    if address not in declared[kind]:
+        diagnostics.append(Diagnostic("error", line, f"Reference to undeclared {kind} {label}"))
+        return
+
+    # Skip an index (``aws_instance.web[0].id``) and check the attribute name.
+    if attr_steps and attr_steps[0][0] == "index":
+        attr_steps = attr_steps[1:]
+    if kind != "resource" or not attr_steps or attr_steps[0][0] != "attr":
+        return
+    schema = SCHEMA["resource"].get(address[0])
+    if schema is not None:
+        attribute = attr_steps[0][1]
+        if attribute not in schema.arguments and attribute not in schema.attributes:
+            diagnostics.append(Diagnostic(
+                "error", line, f"{address[0]!r} has no attribute {attribute!r} (in {label}.{attribute})"
+            ))
+
+
+def _references(body, block_type=None, scope=frozenset()):
+    """Like ``hcl.references``, but aware of where each traversal sits.
+
+    Lifecycle attribute lists and provider meta-arguments (which name a
+    provider configuration, not an object) are skipped, type keywords are in
+    scope inside a variable's ``type``, and a ``dynamic`` block's iterator is
+    in scope inside its ``content``.
+    """
+    found = []
+    for attr in body.attributes:
+        if block_type == "lifecycle" and attr.name in UNCHECKED_LIFECYCLE:
+            continue
+        if attr.name in PROVIDER_ARGUMENTS.get(block_type, ()):
+            continue
+        known = scope | TYPE_KEYWORDS if block_type == "variable" and attr.name == "type" else scope
+        hcl.walk_expressions(attr.expr, lambda traversal, inner: found.append((traversal, inner)), known)
+    for block in body.blocks:
+        inner = scope
+        if block.type == "dynamic" and block.labels:
+            iterator = next((attr.expr for attr in block.body.attributes if attr.name == "iterator"), None)
+            name = iterator.root if isinstance(iterator, hcl.Traversal) else block.labels[0]
+            inner = scope | {name}
+        found.extend(_references(block.body, block.type, inner))
+    return found
+
+
+def validate(source):
+    """Return a list of ``Diagnostic`` for one HCL document, ordered by line."""
+    try:
+        body = hcl.parse(source)
+    except hcl.HCLSyntaxError as exc:
+        return [Diagnostic("error", exc.line, exc.message)]
+
+    diagnostics = []
+    for attr in body.attributes:
+        diagnostics.append(Diagnostic("error", attr.line, f"Unexpected top-level argument {attr.name!r}"))
+    declared = _declarations(body, diagnostics)
+    for block in body.blocks:
+        _check_arguments(block, diagnostics)
+    for traversal, scope in _references(body):
+        if traversal.root not in scope:
+            _check_reference(traversal, declared, diagnostics)
+    return sorted(diagnostics, key=lambda diagnostic: diagnostic.line)
+
+
+def validate_many(sources, workers=None, cache_path=None):
+    """Validate several documents; return ``{digest: [Diagnostic, ...]}``.
+
+    Checks go through ``guides.verify``, so they share its process pool and
+    its on-disk result cache when ``cache_path`` is given (``None`` checks
+    every document).
+    """
+    from guides import verify  # verify imports this module
+
+    found = [snippets.Snippet(None, None, "hcl", source) for source in sources]
+    results, keys, _ = verify.verify(found, workers, cache_path)
+    return {snippets.digest(snippet.source): results[keys[snippet]] for snippet in found}
+
+
+def _file_snippets(paths):
+    for path in paths:
+        with open(path, encoding="utf-8") as fh:
+            yield snippets.Snippet(path, os.path.basename(path), "hcl", fh.read())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="HCL files to check instead of the guide samples")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--quiet", action="store_true", help="only print errors")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="result cache path (shared with guides.verify)")
+    parser.add_argument("--no-cache", action="store_true", help="check everything and don't write the cache")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.files:
+        found = list(_file_snippets(args.files))
+    else:
+        found = list(snippets.iter_snippets(languages={"hcl", "terraform"}))
+    groups = snippets.unique(found)
+    results = validate_many(
+        [group[0].source for group in groups.values()],
+        workers=args.workers,
+        cache_path=None if args.no_cache else args.cache,
+    )
+
+    errors = 0
+    for digest, group in groups.items():
+        for diagnostic in results[digest]:
+            if diagnostic.severity == "error":
+                errors += 1
+            elif args.quiet:
+                continue
+            for snippet in group:
+                print(f"{snippet.location} ({snippet.name}) line {diagnostic.line}: "
+                      f"{diagnostic.severity}: {diagnostic.message}")
+    elapsed = time.perf_counter() - started
+    print(
+        f"Checked {len(found)} samples ({len(groups)} unique) in {elapsed:.2f}s: {errors} error(s)",
+        file=sys.stderr,
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Syntax highlighting for guide code samples with Pygments.
+
+Highlighted HTML is cached process-wide by ``(source, language)``, so each
+sample is tokenized once no matter how many sessions or exports render it.
+"""
+import functools
+
+from pygments import highlight as _highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import TextLexer, get_lexer_by_name
+from pygments.util import ClassNotFound
+
+_formatter = HtmlFormatter(cssclass="highlight")
+
+
+def _lexer(language):
+    try:
+        return get_lexer_by_name(language)
+    except ClassNotFound:
+        return TextLexer()
+
+
+@functools.lru_cache(maxsize=1024)
+def highlight(source, language):
+    return _highlight(source, _lexer(language), _formatter)
+
+
+@functools.lru_cache(maxsize=1024)
+def inline_html(source, language):
+    """Highlighted HTML on a single line, safe to embed in Markdown.
+
+    A blank line would end a raw HTML block in Markdown, so newlines inside
+    the ``<pre>`` are written as character references.
+    """
+    return highlight(source, language).rstrip("\n").replace("\n", "&#10;")
+
+
+@functools.lru_cache(maxsize=1)
+def css():
+    return _formatter.get_style_defs(".highlight")
+
+
+def style_tag():
+    return f"<style>{css()}\n.highlight pre {{ padding: 1rem; border-radius: 0.5rem; overflow-x: auto; }}</style>"
@@ -0,0 +1,340 @@
+"""Simulate Lambda's event sources fanning out to one function, in virtual time.
+
+API Gateway invokes synchronously: a request that finds no free concurrency
+is throttled (HTTP 429) and a failed call goes back to the client. S3, SNS
+and CloudWatch Events invoke asynchronously: Lambda queues the event, waits
+for concurrency, retries a failed call after ``RETRY_DELAYS_S`` and sends
+what it cannot deliver, after the retries or ``max_event_age_s`` in the
+queue, to the dead-letter queue. All sources share the function's
+concurrency: its reserved concurrency, or the account limit without one.
+Past ``burst`` concurrent calls the limit grows by ``scale_per_minute``,
+starting when demand first reaches the burst limit.
+
+The bus is an asyncio program (a coroutine per source plus the async
+dispatcher, with calls finishing on loop timers) run on a loop whose clock
+jumps to the next timer instead of sleeping, so simulated time costs only
+the Python work it needs: tens of thousands of events per second.
+
+Simplifications: arrivals are counted per millisecond, handler durations
+are lognormal around ``handler_ms``, idle environments are never reclaimed,
+and an asynchronous event waiting for concurrency is not charged the
+throttle-retry backoff Lambda would add.
+"""
+import argparse
+import asyncio
+import functools
+import math
+import random
+import selectors
+import time
+from array import array
+from collections import deque, namedtuple
+
+import numpy as np
+
+TICK_S = 0.001
+SAMPLE_S = 1.0
+RETRY_DELAYS_S = (60, 120)  # before the first and second asynchronous retry
+DRAIN_S = 600  # how long queued and retried events may run past the traffic
+MAX_EVENTS = 5_000_000
+DURATION_SIGMA = 0.5
+
+# Name and whether Lambda invokes the function asynchronously.
+SOURCES = (("API Gateway", False), ("S3", True), ("SNS", True), ("CloudWatch Events", True))
+
+# ``rates`` holds events per second for each of ``SOURCES``; during the spike
+# every rate is multiplied by ``spike_factor``. ``reserved`` of 0 means the
+# function draws on the account's unreserved concurrency.
+Config = namedtuple("Config", [
+    "rates", "duration_s", "spike_factor", "spike_start_s", "spike_s",
+    "handler_ms", "cold_start_ms", "error_rate",
+    "reserved", "account_limit", "burst", "scale_per_minute",
+    "max_retries", "max_event_age_s", "seed",
+])
+DEFAULTS = Config(
+    rates=(500, 200, 100, 1), duration_s=60, spike_factor=10, spike_start_s=20, spike_s=20,
+    handler_ms=200, cold_start_ms=400, error_rate=0.01,
+    reserved=0, account_limit=1000, burst=500, scale_per_minute=500,
+    max_retries=2, max_event_age_s=21600, seed=0,
+)
+
+# Totals, then ``latency`` as {source: (p50, p95, p99)} end-to-end ms for
+# delivered events, and ``timeline`` as per-second numpy arrays.
+Result = namedtuple("Result", [
+    "events", "invocations", "cold_starts", "throttled", "errors", "retries",
+    "dead_letters", "unfinished", "peak_concurrency", "latency", "timeline", "wall_s",
+])
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Never blocks; moves the clock on by the wait instead.
+
+    The simulation does no I/O, so there is nothing to poll for.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.now = 0.0
+
+    def select(self, timeout=None):
+        if timeout is None:
+            raise RuntimeError("Simulation stalled with nothing scheduled")
+        self.now += timeout
+        return []
+
+
+class _VirtualLoop(asyncio.SelectorEventLoop):
+    def __init__(self):
+        super().__init__(_VirtualSelector())
+
+    def time(self):
+        return self._selector.now
+
+
+def expected_events(config):
+    spike = min(config.spike_s, max(0, config.duration_s - config.spike_start_s))
+    return sum(config.rates) * (config.duration_s + spike * (config.spike_factor - 1))
+
+
+def check(config):
+    """Raise ValueError for a config the simulator can't run."""
+    if len(config.rates) != len(SOURCES) or min(config.rates) < 0:
+        raise ValueError(f"Give a non-negative rate for each of {len(SOURCES)} sources")
+    if config.duration_s <= 0 or config.handler_ms <= 0:
+        raise ValueError("Duration and handler time must be positive")
+    if config.burst <= 0 or (config.reserved or config.account_limit) <= 0:
+        raise ValueError("Concurrency limits must be positive")
+    if not 0 <= config.max_retries <= len(RETRY_DELAYS_S):
+        raise ValueError(f"Lambda retries asynchronous events at most {len(RETRY_DELAYS_S)} times")
+    if expected_events(config) > MAX_EVENTS:
+        raise ValueError(
+            f"That is about {expected_events(config):,.0f} events; lower the rates or duration "
+            f"to stay under {MAX_EVENTS:,}."
+        )
+
+
+class _Bus:
+    def __init__(self, config, loop):
+        self.config = config
+        self.loop = loop
+        generator = random.Random(config.seed)
+        self.random, self.lognormal = generator.random, generator.lognormvariate
+        self.limit = config.reserved or config.account_limit
+        self.busy = self.idle = self.peak = 0
+        self.scaling_since = None
+        self.pending = deque()  # asynchronous events: (source, arrived, attempt)
+        self.retrying = 0
+        self.wake = asyncio.Event()
+        self.mu = math.log(config.handler_ms / 1000) - DURATION_SIGMA ** 2 / 2
+
+        seconds = int(config.duration_s + DRAIN_S) + 2
+        self.counts = {
+            name: [0] * seconds
+            for name in ("arrivals", "completed", "throttled", "errors", "dead_letters")
+        }
+        self.samples = {name: array("d") for name in ("backlog", "concurrency", "limit")}
+        self.events = self.invocations = self.cold_starts = self.retries = 0
+        self.latency, self.latency_source, self.latency_second = array("d"), array("b"), array("l")
+
+    def _cap(self, now):
+        if self.scaling_since is None:
+            return min(self.limit, self.config.burst)
+        return min(self.limit, self.config.burst + self.config.scale_per_minute * (now - self.scaling_since) / 60)
+
+    def _start(self, source, arrived, attempt, now):
+        """Start a call if there is concurrency for it."""
+        if self.busy >= self._cap(now):
+            if self.scaling_since is None and self.busy >= self.config.burst:
+                self.scaling_since = now
+            return False
+        if self.idle:
+            self.idle -= 1
+            duration = 0.0
+        else:
+            self.cold_starts += 1
+            duration = self.config.cold_start_ms / 1000
+        self.busy += 1
+        self.peak = max(self.peak, self.busy)
+        self.invocations += 1
+        duration += self.lognormal(self.mu, DURATION_SIGMA)
+        self.loop.call_at(now + duration, self._finish, source, arrived, attempt)
+        return True
+
+    def _finish(self, source, arrived, attempt):
+        now = self.loop.time()
+        second = int(now)
+        self.busy -= 1
+        self.idle += 1
+        if self.busy < self.config.burst:
+            self.scaling_since = None
+        if self.random() < self.config.error_rate:
+            self.counts["errors"][second] += 1
+            if SOURCES[source][1]:
+                if attempt < self.config.max_retries:
+                    self.retries += 1
+                    self.retrying += 1
+                    self.loop.call_at(now + RETRY_DELAYS_S[attempt], self._retry, source, arrived, attempt + 1)
+                else:
+                    self.counts["dead_letters"][second] += 1
+        else:
+            self.counts["completed"][second] += 1
+            self.latency.append((now - arrived) * 1000)
+            self.latency_source.append(source)
+            self.latency_second.append(second)
+        if self.pending:
+            self.wake.set()
+
+    def _retry(self, source, arrived, attempt):
+        self.retrying -= 1
+        self.pending.append((source, arrived, attempt))
+        self.wake.set()
+
+    async def _produce(self, source, rng):
+        config = self.config
+        ticks = int(config.duration_s / TICK_S)
+        expected = np.full(ticks, config.rates[source] * TICK_S)
+        start = int(config.spike_start_s / TICK_S)
+        expected[start:start + int(config.spike_s / TICK_S)] *= config.spike_factor
+        counts = rng.poisson(expected)
+        busy_ticks = np.flatnonzero(counts)
+        arrivals, throttled = self.counts["arrivals"], self.counts["throttled"]
+        asynchronous = SOURCES[source][1]
+        for tick, count in zip(busy_ticks.tolist(), counts[busy_ticks].tolist()):
+            await asyncio.sleep(tick * TICK_S - self.loop.time())
+            now = self.loop.time()
+            second = int(now)
+            arrivals[second] += count
+            self.events += count
+            if asynchronous:
+                self.pending.extend([(source, now, 0)] * count)
+                self.wake.set()
+                continue
+            for started in range(count):
+                if not self._start(source, now, 0, now):
+                    # Nothing frees up within a tick, so the rest are throttled too.
+                    throttled[second] += count - started
+                    break
+
+    async def _dispatch(self):
+        pending, dead_letters = self.pending, self.counts["dead_letters"]
+        while True:
+            await self.wake.wait()
+            self.wake.clear()
+            now = self.loop.time()
+            while pending:
+                source, arrived, attempt = pending[0]
+                if now - arrived > self.config.max_event_age_s:
+                    pending.popleft()
+                    dead_letters[int(now)] += 1
+                elif self._start(source, arrived, attempt, now):
+                    pending.popleft()
+                else:
+                    break
+
+    async def _sample(self):
+        while True:
+            now = self.loop.time()
+            self.samples["backlog"].append(len(self.pending))
+            self.samples["concurrency"].append(self.busy)
+            self.samples["limit"].append(self._cap(now))
+            # A rising limit may free room for the queue without a call finishing.
+            if self.pending:
+                self.wake.set()
+            await asyncio.sleep(SAMPLE_S)
+
+    async def run(self):
+        seeds = np.random.SeedSequence(self.config.seed).spawn(len(SOURCES))
+        helpers = [asyncio.create_task(self._dispatch()), asyncio.create_task(self._sample())]
+        await asyncio.gather(*(
+            self._produce(source, np.random.default_rng(seed)) for source, seed in enumerate(seeds)
+        ))
+        end = self.config.duration_s + DRAIN_S
+        while (self.pending or self.busy or self.retrying) and self.loop.time() < end:
+            await asyncio.sleep(SAMPLE_S)
+        for helper in helpers:
+            helper.cancel()
+
+
+def _percentiles(values):
+    if not len(values):
+        return (float("nan"),) * 3
+    return tuple(np.percentile(values, (50, 95, 99)).tolist())
+
+
+@functools.lru_cache(maxsize=16)
+def simulate(config=DEFAULTS):
+    """Run ``config`` and summarize it as a ``Result``."""
+    check(config)
+    started = time.perf_counter()
+    loop = _VirtualLoop()
+    try:
+        bus = _Bus(config, loop)
+        loop.run_until_complete(bus.run())
+    finally:
+        loop.close()
+    wall_s = time.perf_counter() - started
+
+    latency = np.frombuffer(bus.latency, dtype=np.float64)
+    sources = np.frombuffer(bus.latency_source, dtype=np.int8)
+    seconds = np.frombuffer(bus.latency_second, dtype=np.int_)
+    length = len(bus.samples["backlog"])
+    timeline = {name: np.array(values[:length], dtype=np.int64) for name, values in bus.counts.items()}
+    timeline.update({name: np.frombuffer(values, dtype=np.float64).copy() for name, values in bus.samples.items()})
+    # p95 of the latency of calls completing in each second.
+    order = np.argsort(seconds, kind="stable")
+    bounds = np.searchsorted(seconds[order], np.arange(length + 1))
+    timeline["p95_ms"] = np.array([
+        np.percentile(latency[order[lo:hi]], 95) if hi > lo else np.nan
+        for lo, hi in zip(bounds[:-1], bounds[1:])
+    ])
+    timeline["second"] = np.arange(length)
+
+    return Result(
+        events=bus.events,
+        invocations=bus.invocations,
+        cold_starts=bus.cold_starts,
+        throttled=int(timeline["throttled"].sum()),
+        errors=int(timeline["errors"].sum()),
+        retries=bus.retries,
+        dead_letters=int(timeline["dead_letters"].sum()),
+        unfinished=len(bus.pending) + bus.busy + bus.retrying,
+        peak_concurrency=bus.peak,
+        latency={name: _percentiles(latency[sources == index]) for index, (name, _) in enumerate(SOURCES)},
+        timeline=timeline,
+        wall_s=wall_s,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rates", type=float, nargs=len(SOURCES), default=DEFAULTS.rates,
+                        metavar="RATE", help="events per second for " + ", ".join(name for name, _ in SOURCES))
+    parser.add_argument("--duration", type=float, default=DEFAULTS.duration_s, help="seconds of traffic")
+    parser.add_argument("--spike-factor", type=float, default=DEFAULTS.spike_factor)
+    parser.add_argument("--reserved", type=int, default=DEFAULTS.reserved)
+    parser.add_argument("--handler-ms", type=float, default=DEFAULTS.handler_ms)
+    args = parser.parse_args(argv)
+    config = DEFAULTS._replace(
+        rates=tuple(args.rates), duration_s=args.duration, spike_factor=args.spike_factor,
+        reserved=args.reserved, handler_ms=args.handler_ms,
+    )
+    try:
+        result = simulate(config)
+    except ValueError as exc:
+        parser.error(str(exc))
+    print(
+        f"{result.events:,} events, {result.invocations:,} invocations in {result.wall_s:.2f} s "
+        f"({result.events / result.wall_s:,.0f} events/s)"
+    )
+    print(
+        f"peak concurrency {result.peak_concurrency:,}, {result.cold_starts:,} cold starts, "
+        f"{result.throttled:,} throttled, {result.errors:,} errors, {result.retries:,} retries, "
+        f"{result.dead_letters:,} to the DLQ, {result.unfinished:,} unfinished"
+    )
+    for name, (p50, p95, p99) in result.latency.items():
+        print(f"{name:>18}: p50 {p50:,.0f} ms  p95 {p95:,.0f} ms  p99 {p99:,.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,296 @@
+import json
+
+import pandas as pd
+import streamlit as st
+
+from guides import lambda_events, lambda_local
+from guides.blocks import render_page
+
+_CUSTOM = "Your code"
+_STRATEGIES = {"Cheapest": "cost", "Fastest": "speed", "Balanced": "balanced"}
+
+
+def _sources():
+    sources = lambda_local.samples()
+    if lambda_local.ALLOW_CUSTOM_CODE:
+        sources[_CUSTOM] = None
+    return sources
+
+
+def _p50(values):
+    return f"{lambda_local.percentile(values, 0.5):,.1f}" if values else "–"
+
+
+def _calls_table(calls):
+    start = min(call.queued for call in calls)
+    return pd.DataFrame([
+        {
+            "Call": number,
+            "Worker": call.worker,
+            "Cold start": call.invocation.cold,
+            "Queued (ms)": (call.started - call.queued) * 1000,
+            "Init (ms)": (call.ready - call.started) * 1000,
+            "Handler (ms)": call.invocation.duration_ms,
+            "Sent (ms)": (call.queued - start) * 1000,
+            "Done (ms)": (call.finished - start) * 1000,
+            "Error": call.invocation.error or "",
+        }
+        for number, call in enumerate(calls, 1)
+    ])
+
+
+def _timeline(calls):
+    import altair as alt
+
+    start = min(call.queued for call in calls)
+    rows = []
+    for number, call in enumerate(calls, 1):
+        phases = (("Queued", call.queued, call.started), ("Init", call.started, call.ready),
+                  ("Handler", call.ready, call.finished))
+        for phase, begin, end in phases:
+            if end > begin:
+                rows.append({"call": number, "phase": phase, "start": (begin - start) * 1000,
+                             "end": (end - start) * 1000, "worker": call.worker})
+    return alt.Chart(pd.DataFrame(rows)).mark_bar().encode(
+        x=alt.X("start:Q", title="Milliseconds since the first call"),
+        x2="end:Q",
+        y=alt.Y("call:O", title="Call"),
+        color=alt.Color("phase:N", scale=alt.Scale(
+            domain=["Queued", "Init", "Handler"], range=["#bbbbbb", "#ff7f0e", "#1f77b4"]
+        )),
+        tooltip=["call", "worker", "phase", alt.Tooltip("start:Q", format=",.1f"), alt.Tooltip("end:Q", format=",.1f")],
+    )
+
+
+def _invoke_locally(block):
+    st.markdown(block["text"])
+    sources = _sources()
+    left, right = st.columns(2)
+    label = left.radio("Handler", list(sources), key="lambda:invoke:handler")
+    trigger = right.radio("Test event", list(lambda_local.EVENTS))
+
+    with st.form("invoke_locally"):
+        code = sources[label]
+        if code is None:
+            code = st.text_area("lambda_function.py", sources[next(iter(sources))], height=200,
+                                key="lambda:invoke:code")
+        # Keyed by trigger so picking another trigger swaps the template in.
+        event = st.text_area("Event (JSON)", json.dumps(lambda_local.EVENTS[trigger], indent=2),
+                             height=200, key=f"lambda:event:{trigger}")
+        left, right = st.columns(2)
+        memory = left.selectbox("Memory (MB)", lambda_local.MEMORY_SIZES)
+        count = right.slider("Calls at once", 1, 50, 1)
+        run = st.form_submit_button("Invoke locally")
+
+    if run:
+        try:
+            payload = json.loads(event)
+        except ValueError as exc:
+            st.error(f"Event is not valid JSON: {exc}")
+            return
+        with st.spinner("Invoking..."):
+            calls = lambda_local.pool(code, memory).invoke_many(payload, count)
+        st.session_state["lambda:invoke"] = (code, memory, calls)
+
+    if "lambda:invoke" not in st.session_state:
+        return
+    code, memory, calls = st.session_state["lambda:invoke"]
+    cold = [call for call in calls if call.invocation.cold]
+    warm = [call for call in calls if not call.invocation.cold and not call.invocation.error]
+    columns = st.columns(4)
+    columns[0].metric("Cold starts", f"{len(cold)} of {len(calls)}")
+    columns[1].metric("Workers used", len({call.worker for call in calls if call.worker}))
+    columns[2].metric("Init p50 (ms)", _p50([(call.ready - call.started) * 1000 for call in cold]))
+    columns[3].metric("Warm handler p50 (ms)", _p50([call.invocation.duration_ms for call in warm]))
+    function = lambda_local.pool(code, memory)
+    status = function.status()
+    st.caption(
+        f"{memory} MB, up to {function.concurrency} concurrent workers: {status.idle} warm now, "
+        f"{status.started} started and {status.recycled} recycled after "
+        f"{lambda_local.MAX_CALLS_PER_WORKER} calls, {status.calls} calls served. Workers are shared "
+        "with everyone using this app, so another learner's calls may have warmed them."
+    )
+    if len(calls) > 1:
+        st.altair_chart(_timeline(calls), use_container_width=True)
+        st.dataframe(_calls_table(calls), hide_index=True, use_container_width=True)
+    last = calls[-1].invocation
+    if last.error:
+        st.error(last.error)
+    else:
+        st.markdown("**Response**")
+        st.json(last.result)
+    if last.logs:
+        st.markdown("**Logs**")
+        st.code(last.logs, language="text")
+
+
+def _tuning_table(results):
+    p = lambda_local.percentile
+    return pd.DataFrame([
+        {
+            "Memory (MB)": result.memory_mb,
+            "Cold p50 (ms)": p(result.cold_ms, 0.5),
+            "Cold max (ms)": max(result.cold_ms, default=float("nan")),
+            "Warm p50 (ms)": p(result.warm_ms, 0.5),
+            "Warm p95 (ms)": p(result.warm_ms, 0.95),
+            "Init (ms)": p(result.init_ms, 0.5),
+            "Cost per 1M calls ($)": result.cost * 1_000_000,
+            "Errors": len(result.errors),
+        }
+        for result in results
+    ])
+
+
+def _tuning_chart(table):
+    import altair as alt
+
+    base = alt.Chart(table).encode(x=alt.X("Memory (MB):Q"))
+    latency = base.mark_line(point=True, color="#1f77b4").encode(
+        y=alt.Y("Warm p50 (ms):Q", axis=alt.Axis(titleColor="#1f77b4"))
+    )
+    cost = base.mark_line(point=True, color="#d62728").encode(
+        y=alt.Y("Cost per 1M calls ($):Q", axis=alt.Axis(titleColor="#d62728"))
+    )
+    return alt.layer(latency, cost).resolve_scale(y="independent")
+
+
+def _power_tuning(block):
+    st.markdown(block["text"])
+    sources = _sources()
+    label = st.radio("Handler", list(sources), horizontal=True)
+
+    with st.form("power_tuning"):
+        code = sources[label]
+        if code is None:
+            code = st.text_area("lambda_function.py", sources[next(iter(sources))], height=200)
+        event = st.text_area("Test event (JSON)", "{}", height=80)
+        memory = st.multiselect(
+            "Memory sizes (MB)", lambda_local.MEMORY_SIZES, default=list(lambda_local.MEMORY_SIZES)
+        )
+        left, right = st.columns(2)
+        cold_starts = left.slider("Cold starts per size", 1, 5, 3)
+        invocations = right.slider("Calls per cold start", 2, 50, 10)
+        timeout = left.number_input("Timeout (seconds)", 1, 30, 3)
+        strategy = right.selectbox("Optimize for", list(_STRATEGIES))
+        run = st.form_submit_button("Run power tuning")
+
+    if run:
+        try:
+            payload = json.loads(event)
+        except ValueError as exc:
+            st.error(f"Test event is not valid JSON: {exc}")
+            return
+        if not memory:
+            st.error("Pick at least one memory size.")
+            return
+        with st.spinner("Invoking the handler at each memory size..."):
+            st.session_state["lambda:tuning"] = lambda_local.tune(
+                code, payload, sorted(memory), cold_starts, invocations, timeout
+            )
+
+    results = st.session_state.get("lambda:tuning")
+    if not results:
+        return
+    table = _tuning_table(results)
+    chosen = lambda_local.best(results, _STRATEGIES[strategy])
+    if chosen is not None:
+        st.success(
+            f"{strategy}: {chosen.memory_mb} MB, warm p50 "
+            f"{lambda_local.percentile(chosen.warm_ms, 0.5):.1f} ms, "
+            f"${chosen.cost * 1_000_000:.2f} per million calls."
+        )
+    st.altair_chart(_tuning_chart(table), use_container_width=True)
+    st.dataframe(table, hide_index=True, use_container_width=True)
+    st.caption(
+        "Durations model Lambda's CPU share at each memory size from CPU time measured on this "
+        "server, so compare sizes with each other rather than with real Lambda timings."
+    )
+    for result in results:
+        for error in sorted(set(result.errors))[:3]:
+            st.warning(f"{result.memory_mb} MB: {error}")
+
+
+def _event_fanout(block):
+    st.markdown(block["text"])
+    defaults = lambda_events.DEFAULTS
+
+    # A form, so adjusting several inputs reruns the simulation once.
+    with st.form("event_fanout"):
+        st.markdown("**Events per second**")
+        columns = st.columns(len(lambda_events.SOURCES))
+        rates = tuple(
+            column.number_input(name, 0, 100_000, int(rate))
+            for column, (name, _), rate in zip(columns, lambda_events.SOURCES, defaults.rates)
+        )
+        left, middle, right = st.columns(3)
+        duration = left.slider("Traffic (seconds)", 10, 600, defaults.duration_s)
+        spike_factor = middle.slider("Spike (x normal traffic)", 1, 50, defaults.spike_factor)
+        spike_start, spike_end = right.slider(
+            "Spike from/to (seconds)", 0, 600, (defaults.spike_start_s, defaults.spike_start_s + defaults.spike_s)
+        )
+        st.markdown("**Function**")
+        left, middle, right = st.columns(3)
+        handler_ms = left.number_input("Handler duration (ms)", 1, 900_000, defaults.handler_ms)
+        cold_start_ms = middle.number_input("Cold start (ms)", 0, 10_000, defaults.cold_start_ms)
+        error_rate = right.slider("Failed calls (%)", 0.0, 100.0, defaults.error_rate * 100) / 100
+        st.markdown("**Concurrency**")
+        left, middle, right = st.columns(3)
+        reserved = left.number_input("Reserved (0 = unreserved)", 0, 100_000, defaults.reserved)
+        account_limit = middle.number_input("Account limit", 1, 100_000, defaults.account_limit)
+        burst = right.number_input("Burst limit", 1, 100_000, defaults.burst)
+        scale_per_minute = left.number_input("Scaling per minute", 0, 100_000, defaults.scale_per_minute)
+        max_retries = middle.selectbox("Async retries", (2, 1, 0))
+        max_event_age = right.number_input("Max event age (seconds)", 60, 21600, defaults.max_event_age_s)
+        run = st.form_submit_button("Simulate")
+
+    if run:
+        st.session_state["lambda:fanout"] = defaults._replace(
+            rates=rates, duration_s=duration, spike_factor=spike_factor,
+            spike_start_s=spike_start, spike_s=spike_end - spike_start,
+            handler_ms=handler_ms, cold_start_ms=cold_start_ms, error_rate=error_rate,
+            reserved=reserved, account_limit=account_limit, burst=burst, scale_per_minute=scale_per_minute,
+            max_retries=max_retries, max_event_age_s=max_event_age,
+        )
+    # Only run once asked: a simulation takes seconds, too long for every
+    # first view of the page.
+    if "lambda:fanout" not in st.session_state:
+        return
+    try:
+        with st.spinner("Simulating..."):
+            result = lambda_events.simulate(st.session_state["lambda:fanout"])
+    except ValueError as exc:
+        st.error(str(exc))
+        return
+
+    columns = st.columns(4)
+    columns[0].metric("Peak concurrency", f"{result.peak_concurrency:,}")
+    columns[1].metric("Throttled (429)", f"{result.throttled:,}")
+    columns[2].metric("Async retries", f"{result.retries:,}")
+    columns[3].metric("Dead-letter queue", f"{result.dead_letters:,}")
+    st.caption(
+        f"{result.events:,} events, {result.invocations:,} invocations and {result.cold_starts:,} cold starts, "
+        f"simulated in {result.wall_s:.1f} s ({result.events / result.wall_s:,.0f} events/s)."
+        + (f" {result.unfinished:,} events were still queued or retrying at the end." if result.unfinished else "")
+    )
+    timeline = result.timeline
+    index = pd.Index(timeline["second"], name="second")
+    st.line_chart(pd.DataFrame(
+        {"Concurrent calls": timeline["concurrency"], "Concurrency limit": timeline["limit"]}, index=index
+    ))
+    st.line_chart(pd.DataFrame({
+        "Arrived": timeline["arrivals"], "Completed": timeline["completed"],
+        "Throttled": timeline["throttled"], "Async backlog": timeline["backlog"],
+    }, index=index))
+    st.line_chart(pd.DataFrame({"p95 end-to-end latency (ms)": timeline["p95_ms"]}, index=index))
+    st.dataframe(pd.DataFrame(
+        [(name, *values) for name, values in result.latency.items()],
+        columns=["Source", "p50 (ms)", "p95 (ms)", "p99 (ms)"],
+    ), hide_index=True, use_container_width=True)
+
+
+def lambda_guide_page():
+    render_page("lambda_guide", overrides={
+        "invoke_locally": _invoke_locally,
+        "power_tuning": _power_tuning,
+        "event_fanout": _event_fanout,
+    })
@@ -0,0 +1,496 @@
+"""Run Lambda handlers locally in isolated worker processes, and power-tune them.
+
+Each ``Worker`` is a fresh interpreter (``python -I``, a scratch directory, a
+minimal environment, see ``guides/lambda_worker.py``) that caps its own
+address space at the function's memory size before loading the handler, like
+a Lambda sandbox. Starting one is
+a cold start; later calls to the same worker are warm.
+
+Lambda gives a function a share of a vCPU proportional to its memory, a full
+one at ``FULL_VCPU_MB``. Workers run unthrottled and measure the CPU time a
+call used; ``modeled_ms`` stretches that CPU time by the function's share and
+leaves time spent waiting (I/O, sleeps) as measured. Durations are therefore
+relative to this machine's CPU, but the shape of the cost/latency curve is
+what power tuning looks for.
+
+``Pool`` keeps warm workers for the "Invoke locally" button. Pools are shared
+by every session in the process and draw on one memory budget
+(``GUIDES_LAMBDA_POOL_MEMORY_MB``); workers are recycled after
+``MAX_CALLS_PER_WORKER`` calls and reaped after ``IDLE_TIMEOUT_S`` idle.
+
+User-supplied code runs on the server, so the app only accepts it when
+``GUIDES_LAMBDA_CUSTOM_CODE=1`` is set; the built-in samples always run.
+"""
+import atexit
+import hashlib
+import itertools
+import json
+import math
+import os
+import select
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from guides import content
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lambda_worker.py")
+HANDLER = "lambda_function.lambda_handler"
+ALLOW_CUSTOM_CODE = os.environ.get("GUIDES_LAMBDA_CUSTOM_CODE", "") not in ("", "0")
+
+FULL_VCPU_MB = 1769
+MEMORY_SIZES = (128, 256, 512, 1024, 1536, 2048, 3008)
+INIT_TIMEOUT_S = 10  # Lambda's limit on the init phase
+
+# Warm pool limits. Memory is the sum of the live workers' memory sizes.
+POOL_MEMORY_MB = int(os.environ.get("GUIDES_LAMBDA_POOL_MEMORY_MB", "4096"))
+POOL_CONCURRENCY = int(os.environ.get("GUIDES_LAMBDA_POOL_CONCURRENCY", "10"))
+MAX_POOLS = 8
+MAX_CALLS_PER_WORKER = 100
+IDLE_TIMEOUT_S = 300
+QUEUE_TIMEOUT_S = 30
+
+# us-east-1 x86 list prices.
+PRICE_GB_SECOND = 0.0000166667
+PRICE_REQUEST = 0.20 / 1_000_000
+
+# A CPU-bound handler, so the effect of memory on speed is visible; the
+# guide's own sample returns too quickly to show much.
+CPU_BOUND_SAMPLE = '''import hashlib
+import json
+
+
+def lambda_handler(event, context):
+    rounds = int(event.get("rounds", 20000))
+    digest = b"seed"
+    for _ in range(rounds):
+        digest = hashlib.sha256(digest).digest()
+    return {"statusCode": 200, "body": json.dumps(digest.hex())}
+'''
+
+# One tuning run at a time per process, so concurrent learners don't compete
+# for CPU and skew each other's numbers.
+_tuning_lock = threading.Lock()
+
+Invocation = namedtuple("Invocation", [
+    "result", "error", "logs", "duration_ms", "cpu_ms", "modeled_ms", "max_rss_kb", "cold",
+])
+# Cold and warm latencies and init durations (modeled, ms) and the mean cost
+# per call for one memory size.
+Tuning = namedtuple("Tuning", ["memory_mb", "cold_ms", "warm_ms", "init_ms", "cost", "errors"])
+# One pool call; the times are ``time.perf_counter()`` seconds. ``ready`` is
+# when the handler was called, so ``ready - started`` is the init of a cold
+# start (0 when warm) and ``started - queued`` the wait for a free worker.
+PoolCall = namedtuple("PoolCall", ["invocation", "worker", "queued", "started", "ready", "finished"])
+PoolStatus = namedtuple("PoolStatus", ["idle", "busy", "started", "recycled", "calls", "memory_mb"])
+
+# Test events for the triggers the guide lists, trimmed to the fields
+# handlers usually read.
+EVENTS = {
+    "API Gateway": {
+        "resource": "/hello",
+        "path": "/hello",
+        "httpMethod": "GET",
+        "headers": {"Accept": "application/json", "Host": "example.execute-api.us-east-1.amazonaws.com"},
+        "queryStringParameters": {"name": "learner"},
+        "pathParameters": None,
+        "requestContext": {"stage": "prod", "requestId": "c6af9ac6-7b61-11e6-9a41-93e8deadbeef"},
+        "body": None,
+        "isBase64Encoded": False,
+    },
+    "S3": {
+        "Records": [{
+            "eventVersion": "2.1",
+            "eventSource": "aws:s3",
+            "awsRegion": "us-east-1",
+            "eventTime": "2024-01-01T12:00:00.000Z",
+            "eventName": "ObjectCreated:Put",
+            "s3": {
+                "bucket": {"name": "my-bucket", "arn": "arn:aws:s3:::my-bucket"},
+                "object": {"key": "uploads/photo.jpg", "size": 1024, "eTag": "0123456789abcdef0123456789abcdef"},
+            },
+        }],
+    },
+    "SNS": {
+        "Records": [{
+            "EventSource": "aws:sns",
+            "EventVersion": "1.0",
+            "Sns": {
+                "Type": "Notification",
+                "MessageId": "95df01b4-ee98-5cb9-9903-4c221d41eb5e",
+                "TopicArn": "arn:aws:sns:us-east-1:123456789012:my-topic",
+                "Subject": "Hello",
+                "Message": "Hello from SNS!",
+                "Timestamp": "2024-01-01T12:00:00.000Z",
+                "MessageAttributes": {},
+            },
+        }],
+    },
+    "CloudWatch Events (schedule)": {
+        "version": "0",
+        "id": "53dc4d37-cffa-4f76-80c9-8b7d4a4d2eaa",
+        "detail-type": "Scheduled Event",
+        "source": "aws.events",
+        "account": "123456789012",
+        "time": "2024-01-01T12:00:00Z",
+        "region": "us-east-1",
+        "resources": ["arn:aws:events:us-east-1:123456789012:rule/my-schedule"],
+        "detail": {},
+    },
+}
+
+
+def samples():
+    """Built-in handler sources by label."""
+    return {
+        "Guide sample (lambda_code)": content.code("lambda_guide", "lambda_code"),
+        "CPU-bound sample": CPU_BOUND_SAMPLE,
+    }
+
+
+def cpu_share(memory_mb):
+    return min(1.0, memory_mb / FULL_VCPU_MB)
+
+
+def modeled_ms(memory_mb, wall_ms, cpu_ms):
+    """Duration at ``memory_mb``: CPU time stretched by the vCPU share, waiting unchanged.
+
+    Single-threaded handlers gain nothing past one vCPU, so the share is
+    capped at 1.
+    """
+    cpu_ms = min(cpu_ms, wall_ms)
+    return (wall_ms - cpu_ms) + cpu_ms / cpu_share(memory_mb)
+
+
+def cost(memory_mb, duration_ms):
+    """Price of one call, billed per started millisecond."""
+    return memory_mb / 1024 * math.ceil(duration_ms) / 1000 * PRICE_GB_SECOND + PRICE_REQUEST
+
+
+class WorkerError(RuntimeError):
+    pass
+
+
+_worker_ids = itertools.count(1)
+
+
+class Worker:
+    """One Lambda sandbox: a worker process with the handler loaded."""
+
+    def __init__(self, code, memory_mb=128, timeout_s=3, handler=HANDLER):
+        self.memory_mb = memory_mb
+        self.timeout_s = timeout_s
+        self.calls = 0
+        self.id = next(_worker_ids)
+        self._dir = tempfile.mkdtemp(prefix="lambda-")
+        module = handler.rpartition(".")[0]
+        with open(os.path.join(self._dir, module.replace(".", os.sep) + ".py"), "w", encoding="utf-8") as fh:
+            fh.write(code)
+
+        env = {
+            "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+            "AWS_LAMBDA_FUNCTION_NAME": "local",
+            "AWS_LAMBDA_FUNCTION_MEMORY_SIZE": str(memory_mb),
+            "AWS_REGION": "us-east-1",
+            "LANG": "C.UTF-8",
+        }
+        started = time.perf_counter()
+        self._proc = subprocess.Popen(
+            [sys.executable, "-I", WORKER_SCRIPT, self._dir, handler, str(memory_mb), str(timeout_s)],
+            cwd=self._dir,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            start_new_session=True,
+        )
+        ready = self._read(INIT_TIMEOUT_S)
+        if ready is None or ready["error"]:
+            self.close()
+            raise WorkerError(_describe(ready["error"]) if ready else "Runtime exited during init")
+        self.startup_ms = (time.perf_counter() - started) * 1000
+        self.init_ms = ready["init_ms"]
+        self.init_cpu_ms = ready["init_cpu_ms"]
+        self.init_logs = ready.get("logs", "")
+
+    @property
+    def cold_start_ms(self):
+        """Interpreter start plus the handler's import, at this memory size's CPU share."""
+        return self.startup_ms - self.init_ms + modeled_ms(self.memory_mb, self.init_ms, self.init_cpu_ms)
+
+    @property
+    def alive(self):
+        return self._proc.poll() is None
+
+    def _read(self, timeout):
+        ready, _, _ = select.select([self._proc.stdout], [], [], timeout)
+        if not ready:
+            return None
+        line = self._proc.stdout.readline()
+        return json.loads(line) if line else None
+
+    def invoke(self, event):
+        """Call the handler with ``event``; a timeout or crash stops the worker."""
+        if not self.alive:
+            raise WorkerError("Worker has stopped")
+        cold = self.calls == 0
+        self.calls += 1
+        self._proc.stdin.write(json.dumps(event) + "\n")
+        self._proc.stdin.flush()
+        # A little slack over the timeout for the worker's own bookkeeping.
+        reply = self._read(self.timeout_s + 0.5)
+        if reply is None:
+            timed_out = self.alive
+            self.close()
+            message = f"Task timed out after {self.timeout_s:.2f} seconds" if timed_out else "Runtime exited"
+            elapsed = self.timeout_s * 1000
+            return Invocation(None, message, "", elapsed, elapsed, elapsed, 0, cold)
+        if reply["error"] and reply["error"]["errorType"] == "MemoryError":
+            self.close()
+        return Invocation(
+            reply["result"],
+            _describe(reply["error"]) if reply["error"] else None,
+            reply.get("logs", ""),
+            reply["duration_ms"],
+            reply["cpu_ms"],
+            modeled_ms(self.memory_mb, reply["duration_ms"], reply["cpu_ms"]),
+            reply["max_rss_kb"],
+            cold,
+        )
+
+    def close(self):
+        if self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
+        for stream in (self._proc.stdin, self._proc.stdout):
+            stream.close()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _describe(error):
+    return f"{error['errorType']}: {error['errorMessage']}"
+
+
+def _tune_one(code, event, memory_mb, cold_starts, invocations, timeout_s):
+    cold, warm, init, costs, errors = [], [], [], [], []
+    for _ in range(cold_starts):
+        try:
+            worker = Worker(code, memory_mb, timeout_s)
+        except WorkerError as exc:
+            errors.append(str(exc))
+            continue
+        with worker:
+            init_ms = worker.cold_start_ms
+            init.append(init_ms)
+            for _ in range(invocations):
+                if not worker.alive:
+                    break
+                call = worker.invoke(event)
+                if call.error:
+                    errors.append(call.error)
+                if call.cold:
+                    # The first call waits for init too; init isn't billed.
+                    cold.append(init_ms + call.modeled_ms)
+                else:
+                    warm.append(call.modeled_ms)
+                costs.append(cost(memory_mb, call.modeled_ms))
+    mean_cost = sum(costs) / len(costs) if costs else float("nan")
+    return Tuning(memory_mb, cold, warm, init, mean_cost, errors)
+
+
+def tune(code, event, memory_sizes=MEMORY_SIZES, cold_starts=3, invocations=10, timeout_s=3, workers=None):
+    """Run ``cold_starts`` workers of ``invocations`` calls at each memory size.
+
+    Memory sizes are measured concurrently, one thread per size driving its
+    workers in turn. Returns a ``Tuning`` per memory size.
+    """
+    workers = workers or min(len(memory_sizes), os.cpu_count() or 1)
+    with _tuning_lock, ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(
+            lambda memory_mb: _tune_one(code, event, memory_mb, cold_starts, invocations, timeout_s),
+            memory_sizes,
+        ))
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def best(results, strategy="cost"):
+    """Pick a memory size: cheapest, fastest (warm p50), or "balanced" (cost x p50)."""
+    usable = [result for result in results if result.warm_ms and not result.errors]
+    if not usable:
+        return None
+    keys = {
+        "cost": lambda result: result.cost,
+        "speed": lambda result: percentile(result.warm_ms, 0.5),
+        "balanced": lambda result: result.cost * percentile(result.warm_ms, 0.5),
+    }
+    return min(usable, key=keys[strategy])
+
+
+# Guards every pool's worker lists and the shared budget below.
+_pool_lock = threading.Condition()
+_pools = OrderedDict()
+_budget = {"workers": 0, "memory_mb": 0}
+
+
+class Pool:
+    """Warm workers for one handler at one memory size.
+
+    A call takes an idle worker if there is one, otherwise starts a new one
+    (a cold start) while the pool is under ``POOL_CONCURRENCY`` and the
+    shared memory budget allows, evicting other pools' idle workers to make
+    room. Otherwise the call queues; after ``QUEUE_TIMEOUT_S`` it is
+    throttled, as Lambda throttles calls over a function's concurrency.
+    """
+
+    def __init__(self, code, memory_mb=128, timeout_s=3, concurrency=POOL_CONCURRENCY):
+        self.code = code
+        self.memory_mb = memory_mb
+        self.timeout_s = timeout_s
+        self.concurrency = concurrency
+        self.closed = False
+        self.started = self.recycled = self.calls = 0
+        self._idle = []  # (worker, idle since), most recently used last
+        self._busy = 0
+
+    def _checkout(self, deadline):
+        """An idle worker, or None once a slot for a new one is reserved."""
+        with _pool_lock:
+            while True:
+                if self.closed:
+                    raise WorkerError("Pool has been closed")
+                _reap()
+                if self._idle:
+                    self._busy += 1
+                    return self._idle.pop()[0]
+                if self._busy < self.concurrency and (_reserve(self.memory_mb) or _evict(self.memory_mb)):
+                    self._busy += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise WorkerError("TooManyRequestsException: Rate Exceeded.")
+                _pool_lock.wait(remaining)
+
+    def _checkin(self, worker, started):
+        with _pool_lock:
+            self._busy -= 1
+            if started:
+                self.started += 1
+            if worker is None:
+                _budget["workers"] -= 1
+                _budget["memory_mb"] -= self.memory_mb
+            elif worker.alive and worker.calls < MAX_CALLS_PER_WORKER and not self.closed:
+                self._idle.append((worker, time.monotonic()))
+            else:
+                if worker.alive and not self.closed:
+                    self.recycled += 1
+                self._discard(worker)
+            _pool_lock.notify_all()
+
+    def _discard(self, worker):
+        worker.close()
+        _budget["workers"] -= 1
+        _budget["memory_mb"] -= self.memory_mb
+
+    def invoke(self, event):
+        """Call the handler on a warm worker if one is free; returns a ``PoolCall``."""
+        queued = time.perf_counter()
+        try:
+            worker = self._checkout(time.monotonic() + QUEUE_TIMEOUT_S)
+        except WorkerError as exc:
+            now = time.perf_counter()
+            return PoolCall(Invocation(None, str(exc), "", 0.0, 0.0, 0.0, 0, False), None, queued, now, now, now)
+        started = time.perf_counter()
+        cold = worker is None
+        try:
+            if cold:
+                worker = Worker(self.code, self.memory_mb, self.timeout_s)
+            ready = time.perf_counter()
+            call = worker.invoke(event)
+        except WorkerError as exc:
+            ready = time.perf_counter()
+            call = Invocation(None, str(exc), "", 0.0, 0.0, 0.0, 0, cold)
+        finally:
+            self._checkin(worker, cold and worker is not None)
+        with _pool_lock:
+            self.calls += 1
+        return PoolCall(call, worker.id if worker else None, queued, started, ready, time.perf_counter())
+
+    def invoke_many(self, event, count):
+        """Fire ``count`` calls at once, as concurrent requests would."""
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            return list(pool.map(lambda _: self.invoke(event), range(count)))
+
+    def status(self):
+        with _pool_lock:
+            return PoolStatus(len(self._idle), self._busy, self.started, self.recycled, self.calls, _budget["memory_mb"])
+
+    def close(self):
+        """Stop idle workers now and busy ones when their call returns."""
+        with _pool_lock:
+            self.closed = True
+            for worker, _ in self._idle:
+                self._discard(worker)
+            self._idle = []
+            _pool_lock.notify_all()
+
+
+def _reserve(memory_mb):
+    if _budget["memory_mb"] + memory_mb > POOL_MEMORY_MB:
+        return False
+    _budget["workers"] += 1
+    _budget["memory_mb"] += memory_mb
+    return True
+
+
+def _evict(memory_mb):
+    """Stop other pools' least recently used idle workers until ``memory_mb`` fits."""
+    while _budget["memory_mb"] + memory_mb > POOL_MEMORY_MB:
+        candidates = [(idle[0][1], pool) for pool in _pools.values() if (idle := pool._idle)]
+        if not candidates:
+            return False
+        pool = min(candidates, key=lambda candidate: candidate[0])[1]
+        pool._discard(pool._idle.pop(0)[0])
+    return _reserve(memory_mb)
+
+
+def _reap():
+    cutoff = time.monotonic() - IDLE_TIMEOUT_S
+    for pool in _pools.values():
+        while pool._idle and pool._idle[0][1] < cutoff:
+            pool._discard(pool._idle.pop(0)[0])
+
+
+def pool(code, memory_mb=128, timeout_s=3):
+    """The shared pool for this handler source and configuration."""
+    key = (hashlib.sha256(code.encode()).hexdigest(), memory_mb, timeout_s)
+    with _pool_lock:
+        found = _pools.pop(key, None) or Pool(code, memory_mb, timeout_s)
+        _pools[key] = found
+        while len(_pools) > MAX_POOLS:
+            _pools.popitem(last=False)[1].close()
+    return found
+
+
+@atexit.register
+def close_pools():
+    with _pool_lock:
+        while _pools:
+            _pools.popitem()[1].close()
@@ -0,0 +1,119 @@
+"""Worker process for ``guides.lambda_local``; not meant to be imported.
+
+    python -I lambda_worker.py CODE_DIR MODULE.HANDLER MEMORY_MB TIMEOUT_S
+
+Caps its address space at MEMORY_MB, imports the handler module from
+CODE_DIR (Lambda's init phase) and reports how long that took, then reads
+one JSON event per line from stdin and writes one JSON result per line to
+the original stdout; the handler's own fd 1 is /dev/null. Only the standard library is used, so the worker starts as fast as
+a bare interpreter.
+"""
+import contextlib
+import importlib
+import io
+import json
+import os
+import resource
+import sys
+import time
+import traceback
+import uuid
+
+LOG_TAIL = 4096  # bytes of output returned per call, like Lambda's LogResult
+
+
+class Context:
+    """The subset of the Lambda context object handlers commonly use."""
+
+    def __init__(self, function_name, memory_mb, timeout_s):
+        self.function_name = function_name
+        self.function_version = "$LATEST"
+        self.memory_limit_in_mb = memory_mb
+        self.invoked_function_arn = f"arn:aws:lambda:local:000000000000:function:{function_name}"
+        self.log_group_name = f"/aws/lambda/{function_name}"
+        self.log_stream_name = "local"
+        self.aws_request_id = ""
+        self._deadline = 0.0
+        self._timeout_s = timeout_s
+
+    def _start(self):
+        self.aws_request_id = str(uuid.uuid4())
+        self._deadline = time.monotonic() + self._timeout_s
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def _error(exc):
+    return {
+        "errorType": type(exc).__name__,
+        "errorMessage": str(exc),
+        "stackTrace": traceback.format_exception(type(exc), exc, exc.__traceback__)[1:],
+    }
+
+
+def _emit(out, message):
+    out.write(json.dumps(message, default=repr) + "\n")
+    out.flush()
+
+
+@contextlib.contextmanager
+def _captured(message):
+    """Collect what the handler prints into ``message["logs"]``."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        try:
+            yield
+        finally:
+            message["logs"] = buffer.getvalue()[-LOG_TAIL:]
+
+
+def main(argv):
+    code_dir, handler_name, memory_mb, timeout_s = argv[1], argv[2], int(argv[3]), float(argv[4])
+    module_name, _, function_name = handler_name.rpartition(".")
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    # The protocol keeps its own copy of stdout and fd 1 goes to /dev/null, so
+    # a handler writing to fd 1 directly (os.write, a subprocess, C code)
+    # cannot corrupt the result stream.
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
+    sys.path.insert(0, code_dir)
+
+    message = {"error": None}
+    started, cpu = time.perf_counter(), time.process_time()
+    try:
+        with _captured(message):
+            handler = getattr(importlib.import_module(module_name), function_name)
+    except BaseException as exc:  # the init phase reports anything, SystemExit included
+        message["error"] = _error(exc)
+    message["init_ms"] = (time.perf_counter() - started) * 1000
+    message["init_cpu_ms"] = (time.process_time() - cpu) * 1000
+    _emit(out, message)
+    if message["error"]:
+        return 1
+
+    context = Context(os.environ.get("AWS_LAMBDA_FUNCTION_NAME", "local"), memory_mb, timeout_s)
+    for line in sys.stdin:
+        event = json.loads(line)
+        context._start()
+        message = {"result": None, "error": None}
+        started, cpu = time.perf_counter(), time.process_time()
+        try:
+            with _captured(message):
+                message["result"] = handler(event, context)
+        except Exception as exc:
+            message["error"] = _error(exc)
+        message["duration_ms"] = (time.perf_counter() - started) * 1000
+        message["cpu_ms"] = (time.process_time() - cpu) * 1000
+        message["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        _emit(out, message)
+        if message["error"] and message["error"]["errorType"] == "MemoryError":
+            return 1  # Lambda stops the sandbox; so does the worker.
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
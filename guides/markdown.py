@@ -0,0 +1,176 @@
+"""Compile guide markdown into sanitized HTML, heading anchors and a page TOC.
+
+The app sends markdown blocks to the browser as source, which Streamlit
+renders client-side; the compiled HTML is only used by the static export
+(``guides.export``), and the headings feed the TOC and search. Markdown
+headings get the anchor Streamlit's frontend derives from their text, so
+TOC links land in both.
+
+Markdown blocks are compiled once and cached by the sha256 of their text, so
+an edit to one block of a content file leaves every other block untouched.
+``python -m guides.markdown`` runs the compile step for every page ahead of
+time and writes the block cache to disk, where new worker processes pick it
+up instead of re-parsing.
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+
+from guides import content
+
+BUILD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".compiled")
+BLOCK_CACHE_PATH = os.path.join(BUILD_DIR, "blocks.json")
+
+_md = None
+_blocks = {}
+_pages = {}
+_lock = threading.Lock()
+_disk_loaded = False
+
+
+def slugify(text):
+    text = re.sub(r"^(\d+\.\s*)", "", text.strip().lower())
+    text = re.sub(r"[^\w\s-]", "", text)
+    return re.sub(r"[\s_-]+", "-", text).strip("-")
+
+
+def heading_anchor(text):
+    """The id Streamlit's frontend gives a markdown heading."""
+    return "-".join(part for part in re.split(r"[^A-Za-z0-9]", text.lower()) if part)
+
+
+def _unique(slug, used):
+    anchor = slug
+    n = 2
+    while anchor in used:
+        anchor = f"{slug}-{n}"
+        n += 1
+    used.add(anchor)
+    return anchor
+
+
+def _load_disk_cache():
+    global _disk_loaded
+    if _disk_loaded:
+        return
+    _disk_loaded = True
+    try:
+        with open(BLOCK_CACHE_PATH, encoding="utf-8") as fh:
+            _blocks.update(json.load(fh))
+    except (OSError, ValueError):
+        pass
+
+
+def _parser():
+    # Built on first use: with a warm block cache (see ``build``) a worker
+    # never needs markdown-it at all.
+    global _md
+    if _md is None:
+        from markdown_it import MarkdownIt
+
+        # Raw HTML in content is escaped rather than passed through, and
+        # markdown-it refuses javascript:/vbscript:/data: links on its own.
+        _md = MarkdownIt("commonmark", {"html": False})
+    return _md
+
+
+# Part of every block key, so changing what compile_block produces
+# invalidates block caches written by older code.
+_FORMAT = "2"
+
+
+def block_key(text):
+    return hashlib.sha256(f"{_FORMAT}\n{text}".encode("utf-8")).hexdigest()
+
+
+def compile_block(text):
+    """Return ``{"html": ..., "headings": [[level, text, slug], ...]}`` for a markdown block."""
+    key = block_key(text)
+    compiled = _blocks.get(key)
+    if compiled is not None:
+        return compiled
+
+    md = _parser()
+    tokens = md.parse(text)
+    headings = []
+    for i, token in enumerate(tokens):
+        if token.type == "heading_open":
+            title = tokens[i + 1].content
+            slug = heading_anchor(title)
+            token.attrSet("id", slug)
+            headings.append([int(token.tag[1]), title, slug])
+    compiled = {"html": md.renderer.render(tokens, md.options, {}).strip(), "headings": headings}
+    _blocks[key] = compiled
+    return compiled
+
+
+def _compile_blocks(blocks, toc, used):
+    out = []
+    for block in blocks:
+        kind = block["type"]
+        block = dict(block)
+        if kind in ("header", "subheader"):
+            block["anchor"] = _unique(slugify(block["text"]), used)
+            toc.append((2 if kind == "header" else 3, block["text"], block["anchor"]))
+        elif kind == "markdown":
+            compiled = compile_block(block["text"])
+            html = compiled["html"]
+            for level, title, slug in compiled["headings"]:
+                anchor = _unique(slug, used)
+                if anchor != slug:
+                    html = html.replace(f'id="{slug}"', f'id="{anchor}"', 1)
+                toc.append((level, title, anchor))
+            block["html"] = html
+        elif kind == "expander":
+            block["blocks"] = _compile_blocks(block["blocks"], toc, used)
+        out.append(block)
+    return out
+
+
+def compile_page(name):
+    """Return ``{"blocks": [...], "toc": [...]}`` for a content page, cached by content digest."""
+    page = content.load(name)
+    digest = content.digest(name)
+    cached = _pages.get(name)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+
+    with _lock:
+        _load_disk_cache()
+        toc = []
+        compiled = {"blocks": _compile_blocks(page["blocks"], toc, set()), "toc": toc}
+        _pages[name] = (digest, compiled)
+    return compiled
+
+
+def toc_markdown(name):
+    lines = []
+    for level, title, anchor in compile_page(name)["toc"]:
+        indent = "  " * (level - 2)
+        lines.append(f"{indent}- [{title}](#{anchor})")
+    return "\n".join(lines)
+
+
+def build():
+    """Compile every content page and persist the block cache."""
+    live = {}
+    for name in content.names():
+        compile_page(name)
+        for block in content.iter_blocks(content.load(name)["blocks"]):
+            if block["type"] == "markdown":
+                key = block_key(block["text"])
+                live[key] = _blocks[key]
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    tmp_path = BLOCK_CACHE_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(live, fh, ensure_ascii=False)
+    os.replace(tmp_path, BLOCK_CACHE_PATH)
+    return len(live)
+
+
+if __name__ == "__main__":
+    count = build()
+    print(f"Compiled {count} markdown blocks into {BLOCK_CACHE_PATH}", file=sys.stderr)
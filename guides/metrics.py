@@ -0,0 +1,221 @@
+"""Page views, rerun latency, errors and live sessions in Prometheus text format.
+
+Recording is lock-free: each script thread writes to its own shard, and the
+shards are only summed when the endpoint is scraped. Set
+``GUIDES_METRICS_PORT`` to serve ``/metrics`` on ``127.0.0.1`` from a side
+thread; without it metrics are still recorded but not exposed.
+"""
+import bisect
+import contextlib
+import os
+import threading
+import time
+from collections import defaultdict
+
+from streamlit.runtime.scriptrunner import RerunException, StopException
+
+PORT = os.environ.get("GUIDES_METRICS_PORT", "")
+HOST = os.environ.get("GUIDES_METRICS_HOST", "127.0.0.1")
+
+# Upper bounds, in seconds, of the rerun latency histogram buckets.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shard:
+    def __init__(self, thread=None):
+        self.thread = thread
+        self.views = defaultdict(int)
+        self.errors = defaultdict(int)
+        # page -> [count per bucket (+Inf last), sum of seconds]
+        self.latency = {}
+
+
+_local = threading.local()
+_shards = []
+_shards_lock = threading.Lock()
+# Totals folded in from shards whose threads have exited. Streamlit starts a
+# script thread per run, so shards would otherwise pile up.
+_retired = _Shard()
+MAX_SHARDS = 256
+
+
+def _shard():
+    shard = getattr(_local, "shard", None)
+    if shard is None:
+        shard = _local.shard = _Shard(threading.current_thread())
+        # Only taken once per thread; recording itself never locks.
+        with _shards_lock:
+            if len(_shards) >= MAX_SHARDS:
+                _retire_dead()
+            _shards.append(shard)
+    return shard
+
+
+def record_view(page):
+    _shard().views[page] += 1
+
+
+def record_error(page, exc):
+    _shard().errors[(page, type(exc).__name__)] += 1
+
+
+def record_rerun(page, seconds):
+    latency = _shard().latency
+    entry = latency.get(page)
+    if entry is None:
+        entry = latency[page] = [[0] * (len(BUCKETS) + 1), 0.0]
+    entry[0][bisect.bisect_left(BUCKETS, seconds)] += 1
+    entry[1] += seconds
+
+
+class Rerun:
+    """Set ``page`` once the page is known so the rerun is attributed to it."""
+
+    page = "-"
+
+
+@contextlib.contextmanager
+def track_rerun():
+    """Time one script run and count an exception escaping it."""
+    rerun = Rerun()
+    started = time.perf_counter()
+    try:
+        yield rerun
+    except (RerunException, StopException):
+        # Streamlit control flow, not an error.
+        raise
+    except Exception as exc:
+        record_error(rerun.page, exc)
+        raise
+    finally:
+        record_rerun(rerun.page, time.perf_counter() - started)
+
+
+def _active_sessions():
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():
+        return 0
+    return Runtime.instance()._session_mgr.num_active_sessions()
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _merge(into, shard):
+    # Copy before iterating; the owning thread may add keys meanwhile.
+    for page, count in list(shard.views.items()):
+        into.views[page] += count
+    for key, count in list(shard.errors.items()):
+        into.errors[key] += count
+    for page, (counts, total) in list(shard.latency.items()):
+        merged = into.latency.setdefault(page, [[0] * (len(BUCKETS) + 1), 0.0])
+        merged[0] = [a + b for a, b in zip(merged[0], list(counts))]
+        merged[1] += total
+
+
+def _retire_dead():
+    # Called with _shards_lock held.
+    live = []
+    for shard in _shards:
+        if shard.thread.is_alive():
+            live.append(shard)
+        else:
+            _merge(_retired, shard)
+    _shards[:] = live
+
+
+def _collect():
+    total = _Shard()
+    with _shards_lock:
+        _retire_dead()
+        live = list(_shards)
+        _merge(total, _retired)
+    for shard in live:
+        _merge(total, shard)
+    return total
+
+
+def render():
+    """Sum every shard and return the Prometheus text exposition."""
+    total = _collect()
+    views, errors, latency = total.views, total.errors, total.latency
+
+    lines = [
+        "# HELP guides_page_views_total Times a session opened a guide page.",
+        "# TYPE guides_page_views_total counter",
+    ]
+    lines += [f'guides_page_views_total{{page="{_label(p)}"}} {n}' for p, n in sorted(views.items())]
+    lines += [
+        "# HELP guides_rerun_seconds Script run latency by page.",
+        "# TYPE guides_rerun_seconds histogram",
+    ]
+    for page, (counts, total) in sorted(latency.items()):
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ("+Inf",), counts):
+            cumulative += count
+            lines.append(f'guides_rerun_seconds_bucket{{page="{_label(page)}",le="{bound}"}} {cumulative}')
+        lines.append(f'guides_rerun_seconds_sum{{page="{_label(page)}"}} {total:.6f}')
+        lines.append(f'guides_rerun_seconds_count{{page="{_label(page)}"}} {cumulative}')
+    lines += [
+        "# HELP guides_errors_total Exceptions raised while rendering a page.",
+        "# TYPE guides_errors_total counter",
+    ]
+    lines += [
+        f'guides_errors_total{{page="{_label(p)}",exception="{_label(e)}"}} {n}'
+        for (p, e), n in sorted(errors.items())
+    ]
+    lines += [
+        "# HELP guides_active_sessions Browser sessions currently connected.",
+        "# TYPE guides_active_sessions gauge",
+        f"guides_active_sessions {_active_sessions()}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _handler():
+    # http.server is only imported when the endpoint is enabled.
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_server(port=PORT, host=HOST):
+    """Serve ``/metrics`` from a daemon thread; a no-op without a port or if already running."""
+    global _server
+    if _server is not None or not port:
+        return _server
+    with _server_lock:
+        if _server is None:
+            from http.server import ThreadingHTTPServer
+
+            try:
+                server = ThreadingHTTPServer((host, int(port)), _handler())
+            except OSError:
+                # Another process on this host already serves the endpoint.
+                _server = False
+                return _server
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+            _server = server
+    return _server
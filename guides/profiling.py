@@ -0,0 +1,176 @@
+"""On-demand profiling of page render functions.
+
+Profiling is on for every session when ``GUIDES_PROFILE=1``, or for one
+admin session with ``?profile=1`` (see ``guides.admin``). Each profiled
+render runs under cProfile; a background thread then writes two files to
+``GUIDES_PROFILE_DIR`` (default ``profiles/``): a ``.prof`` for snakeviz or
+pstats, and a ``.folded`` file of collapsed stacks in microseconds, which
+flamegraph.pl and speedscope read. Only the newest ``GUIDES_PROFILE_KEEP``
+profiles are kept. When profiling is off, pages render exactly as before.
+"""
+import cProfile
+import heapq
+import os
+import pstats
+import sys
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+import guides
+
+ENABLED = os.environ.get("GUIDES_PROFILE", "") not in ("", "0")
+QUERY_PARAM = "profile"
+PROFILE_DIR = os.environ.get("GUIDES_PROFILE_DIR", "profiles")
+KEEP = int(os.environ.get("GUIDES_PROFILE_KEEP", "20"))
+MAX_DEPTH = 64
+
+Profile = namedtuple("Profile", ["page_key", "path", "folded_path"])
+
+# Folding and writing happen here, off the learner's script thread; one
+# worker keeps writes and rotation in order.
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="profile-writer")
+
+
+def requested():
+    """True when this run should be profiled."""
+    if ENABLED:
+        return True
+    params = st.experimental_get_query_params()
+    if params.get(QUERY_PARAM, ["0"])[0] in ("", "0"):
+        return False
+    from guides import admin
+
+    return admin.is_admin()
+
+
+def _label(func):
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{os.path.basename(filename)}:{name}:{line}"
+
+
+def folded_stacks(stats, root):
+    """Collapse a cProfile call graph into ``{"a;b;c": microseconds}`` below ``root``.
+
+    cProfile records caller/callee edges rather than whole stacks, so each
+    function appears once, with its own time, under the caller that spent
+    the most time in it. That is linear in the size of the call graph, where
+    expanding every caller path is exponential in its fan-out.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge
+    # Heaviest edges first, so each function hangs off its costliest caller.
+    parents = {root: None}
+    heap = [(-edge[3], _label(callee), callee, root) for callee, edge in callees.get(root, {}).items()]
+    heapq.heapify(heap)
+    while heap:
+        _, _, func, parent = heapq.heappop(heap)
+        if func in parents:
+            continue
+        parents[func] = parent
+        for callee, edge in callees.get(func, {}).items():
+            if callee not in parents:
+                heapq.heappush(heap, (-edge[3], _label(callee), callee, func))
+
+    stacks = {}
+
+    def stack(func):
+        if func not in stacks:
+            parent = parents[func]
+            path = stack(parent) if parent is not None else []
+            stacks[func] = path + [_label(func)] if len(path) < MAX_DEPTH else path
+        return stacks[func]
+
+    folded = Counter()
+    for func in parents:
+        folded[";".join(stack(func))] += stats.stats[func][2] * 1e6
+    return {path: round(us) for path, us in folded.items() if round(us) > 0}
+
+
+def _root(stats, page):
+    module_name, func_name = page.entry.split(":")
+    suffix = module_name.replace(".", os.sep) + ".py"
+    for func in stats.stats:
+        if func[2] == func_name and func[0].endswith(suffix):
+            return func
+    return max(stats.stats, key=lambda func: stats.stats[func][3])
+
+
+def _rotate():
+    profiles = sorted(
+        (entry for entry in os.scandir(PROFILE_DIR) if entry.name.endswith(".prof")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in profiles[:-KEEP] if KEEP > 0 else profiles:
+        for path in (entry.path, entry.path[:-len(".prof")] + ".folded"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _save(stats, root, stem):
+    folded = folded_stacks(stats, root)
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stats.dump_stats(stem + ".prof")
+    # Written under a temporary name so the panel never reads half a file.
+    with open(stem + ".folded.tmp", "w", encoding="utf-8") as fh:
+        for stack, us in sorted(folded.items()):
+            fh.write(f"{stack} {us}\n")
+    os.replace(stem + ".folded.tmp", stem + ".folded")
+    _rotate()
+
+
+def _saved(future):
+    if future.exception() is not None:
+        print(f"Saving profile failed: {future.exception()!r}", file=sys.stderr)
+
+
+def render(page):
+    """Render ``page`` under cProfile and save the profile in the background."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        guides.render(page)
+    finally:
+        profiler.disable()
+        stats = pstats.Stats(profiler)
+        stem = os.path.join(PROFILE_DIR, f"{time.time_ns()}-{page.key}")
+        _writer.submit(_save, stats, _root(stats, page), stem).add_done_callback(_saved)
+        st.session_state["last_profile"] = Profile(page.key, stem + ".prof", stem + ".folded")
+
+
+def _read_folded(path):
+    folded = {}
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            stack, _, us = line.rstrip("\n").rpartition(" ")
+            folded[stack] = int(us)
+    return folded
+
+
+def render_panel():
+    """Summary of this session's latest profile, for the admin sidebar."""
+    profile = st.session_state.get("last_profile")
+    if profile is None:
+        st.caption("Add ?profile=1 to the URL to profile the next page render.")
+        return
+    try:
+        folded = _read_folded(profile.folded_path)
+    except FileNotFoundError:
+        st.caption(f"{profile.page_key}: the profile is still being saved (or was rotated away).")
+        return
+    total_us = sum(folded.values())
+    st.caption(f"{profile.page_key}: {total_us / 1000:.1f} ms in {os.path.basename(profile.path)}")
+    top = sorted(folded.items(), key=lambda item: item[1], reverse=True)[:15]
+    # The heaviest stacks in folded format, trimmed to their innermost frames.
+    lines = [f"{';'.join(stack.split(';')[-3:])} {us}" for stack, us in top]
+    st.code("\n".join(lines), language="text")
+    with open(profile.folded_path, "rb") as fh:
+        st.download_button("Download folded stacks", fh.read(), file_name=os.path.basename(profile.folded_path))
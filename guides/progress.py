@@ -0,0 +1,135 @@
+"""SQLite-backed store for learners' progress checkpoints.
+
+Toggles are queued in memory and written in batches by a background thread,
+so recording a checkbox never waits on the database. Each process keeps one
+store with one connection (see ``get_store``). The database path defaults to
+``progress.sqlite3`` and can be set with ``GUIDES_PROGRESS_DB``.
+"""
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.environ.get("GUIDES_PROGRESS_DB", "progress.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    learner_id TEXT NOT NULL,
+    checkpoint TEXT NOT NULL,
+    done INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (learner_id, checkpoint)
+)
+"""
+
+_UPSERT = """
+INSERT INTO progress (learner_id, checkpoint, done, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (learner_id, checkpoint) DO UPDATE SET
+    done = excluded.done,
+    updated_at = excluded.updated_at
+WHERE excluded.updated_at >= progress.updated_at
+"""
+
+
+class ProgressStore:
+    def __init__(self, path=DEFAULT_PATH, flush_interval=2.0, batch_size=200):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        # _db_lock is held across "swap the queue out and write it" so a
+        # concurrent load() never sees a toggle that is in neither place.
+        self._db_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending = {}
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="progress-flush", daemon=True)
+        self._thread.start()
+
+    def load(self, learner_id):
+        """Return ``{checkpoint: done}`` for a learner, including unflushed toggles."""
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT checkpoint, done FROM progress WHERE learner_id = ?", (learner_id,)
+            ).fetchall()
+            progress = {checkpoint: bool(done) for checkpoint, done in rows}
+            with self._pending_lock:
+                for (pending_learner, checkpoint), (done, _) in self._pending.items():
+                    if pending_learner == learner_id:
+                        progress[checkpoint] = done
+        return progress
+
+    def record(self, learner_id, checkpoint, done):
+        with self._pending_lock:
+            self._pending[(learner_id, checkpoint)] = (bool(done), time.time())
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def record_many(self, learner_id, progress):
+        for checkpoint, done in progress.items():
+            self.record(learner_id, checkpoint, done)
+
+    def pending_count(self):
+        return len(self._pending)
+
+    def flush(self):
+        """Write all queued toggles in one transaction; return how many were written."""
+        with self._db_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            rows = [
+                (learner_id, checkpoint, int(done), updated_at)
+                for (learner_id, checkpoint), (done, updated_at) in batch.items()
+            ]
+            try:
+                with self._conn:
+                    self._conn.executemany(_UPSERT, rows)
+            except sqlite3.Error:
+                with self._pending_lock:
+                    for key, value in batch.items():
+                        self._pending.setdefault(key, value)
+                raise
+        return len(rows)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        self._conn.close()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # The batch was re-queued; try again on the next tick.
+                pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return this process's store, creating it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ProgressStore()
+                atexit.register(_store.close)
+    return _store
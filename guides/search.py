@@ -0,0 +1,226 @@
+"""In-memory full-text search over every registered guide page.
+
+The index is built once per process from the compiled content (page titles,
+headers, expander labels and bodies, tips and code samples) and shared by all
+sessions. Each section of a page is one document; per-term BM25 scores are
+computed at build time, so a query is a handful of dictionary lookups.
+"""
+import bisect
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict, namedtuple
+
+import guides
+from guides import content, markdown
+
+Hit = namedtuple("Hit", ["page_key", "page_title", "anchor", "section", "score"])
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or the this to with your you".split()
+)
+_LINK_TARGET_RE = re.compile(r"\]\([^)]*\)")
+
+# Field weights: a match in a page title or heading counts for more than one
+# in body text or code.
+TITLE_WEIGHT = 3.0
+HEADING_WEIGHT = 2.0
+BODY_WEIGHT = 1.0
+
+K1 = 1.2
+B = 0.75
+MAX_PREFIX_EXPANSIONS = 20
+PREFIX_CACHE_SIZE = 4096
+
+
+def tokenize(text):
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def _sections(page):
+    """Yield ``(anchor, heading, [(weight, text), ...])`` for each section of a page."""
+    anchor, heading = None, page.title
+    fields = [(TITLE_WEIGHT, page.title)]
+
+    def walk(blocks):
+        nonlocal anchor, heading, fields
+        for block in blocks:
+            kind = block["type"]
+            if kind in ("header", "subheader"):
+                yield anchor, heading, fields
+                anchor, heading = block["anchor"], block["text"]
+                fields = [(TITLE_WEIGHT, page.title), (HEADING_WEIGHT, heading)]
+            elif kind == "title":
+                fields.append((TITLE_WEIGHT, block["text"]))
+            elif kind == "markdown":
+                fields.append((BODY_WEIGHT, _LINK_TARGET_RE.sub("]", block["text"])))
+                for _, title, _ in markdown.compile_block(block["text"])["headings"]:
+                    fields.append((HEADING_WEIGHT, title))
+            elif kind in ("tip", "interactive"):
+                fields.append((BODY_WEIGHT, block["text"]))
+            elif kind == "code":
+                fields.append((BODY_WEIGHT, block["name"].replace("_", " ")))
+                fields.append((BODY_WEIGHT, block["source"]))
+            elif kind == "expander":
+                fields.append((HEADING_WEIGHT, block["label"]))
+                yield from walk(block["blocks"])
+
+    yield from walk(markdown.compile_page(page.content)["blocks"])
+    yield anchor, heading, fields
+
+
+class SearchIndex:
+    def __init__(self, pages):
+        self.docs = []
+        self.page_docs = defaultdict(list)
+        term_freqs = []
+        for page in pages:
+            for anchor, heading, fields in _sections(page):
+                freqs = Counter()
+                for weight, text in fields:
+                    for token in tokenize(text):
+                        freqs[token] += weight
+                if freqs:
+                    self.page_docs[page.key].append(len(self.docs))
+                    self.docs.append((page.key, page.title, anchor, heading))
+                    term_freqs.append(freqs)
+        self._allowed_cache = {}
+        self._prefix_cache = {}
+
+        n_docs = len(self.docs)
+        lengths = [sum(freqs.values()) for freqs in term_freqs]
+        avg_length = sum(lengths) / n_docs if n_docs else 1.0
+        doc_freq = Counter(token for freqs in term_freqs for token in freqs)
+
+        self.postings = defaultdict(dict)
+        for doc_id, freqs in enumerate(term_freqs):
+            norm = K1 * (1 - B + B * lengths[doc_id] / avg_length)
+            for token, tf in freqs.items():
+                idf = math.log(1 + (n_docs - doc_freq[token] + 0.5) / (doc_freq[token] + 0.5))
+                self.postings[token][doc_id] = idf * tf * (K1 + 1) / (tf + norm)
+        self.postings = dict(self.postings)
+        self.vocabulary = sorted(self.postings)
+        # Postings ordered by score, so single-term queries stop after `limit` hits.
+        self.ranked_postings = {
+            token: sorted(((score, doc_id) for doc_id, score in docs.items()), reverse=True)
+            for token, docs in self.postings.items()
+        }
+
+    def _expand(self, token):
+        """Exact match, or the vocabulary terms it prefixes (for search-as-you-type)."""
+        if token in self.postings:
+            return [token]
+        start = bisect.bisect_left(self.vocabulary, token)
+        terms = []
+        for term in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        return terms
+
+    def search(self, query, page_keys=None, limit=10):
+        """Return ranked hits for ``query``, optionally restricted to ``page_keys``.
+
+        Every query term must match; if that finds nothing, any term may.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        per_token = [self._scores(token) for token in tokens]
+
+        if len(per_token) == 1:
+            ranked = self._top(self._ranked(tokens[0], per_token[0]), page_keys, limit)
+            return [Hit(*self.docs[doc_id], score) for score, doc_id in ranked]
+
+        # Intersect starting from the smallest set: a posting list, or the
+        # documents of the pages the caller is allowed to see.
+        filters = list(per_token)
+        if page_keys is not None:
+            filters.append(self._allowed(page_keys))
+        filters.sort(key=len)
+        matched = [doc_id for doc_id in filters[0] if all(doc_id in other for other in filters[1:])]
+        if not matched:
+            matched = set().union(*per_token)
+            if page_keys is not None:
+                matched &= self._allowed(page_keys)
+        ranked = heapq.nlargest(
+            limit, ((sum(scores.get(doc_id, 0.0) for scores in per_token), doc_id) for doc_id in matched)
+        )
+        return [Hit(*self.docs[doc_id], score) for score, doc_id in ranked]
+
+    def _allowed(self, page_keys):
+        key = frozenset(page_keys)
+        allowed = self._allowed_cache.get(key)
+        if allowed is None:
+            allowed = frozenset(doc_id for page_key in key for doc_id in self.page_docs.get(page_key, ()))
+            self._allowed_cache[key] = allowed
+        return allowed
+
+    def _ranked(self, token, scores):
+        ranked = self.ranked_postings.get(token)
+        if ranked is None:
+            ranked = self._prefix_cache.get(("ranked", token))
+            if ranked is None:
+                ranked = sorted(((score, doc_id) for doc_id, score in scores.items()), reverse=True)
+                self._prefix_cache[("ranked", token)] = ranked
+        return ranked
+
+    def _scores(self, token):
+        terms = self._expand(token)
+        if len(terms) == 1:
+            return self.postings[terms[0]]
+        scores = self._prefix_cache.get(token)
+        if scores is not None:
+            return scores
+        scores = {}
+        for term in terms:
+            for doc_id, score in self.postings[term].items():
+                if score > scores.get(doc_id, 0.0):
+                    scores[doc_id] = score
+        if len(self._prefix_cache) >= PREFIX_CACHE_SIZE:
+            self._prefix_cache.clear()
+        self._prefix_cache[token] = scores
+        return scores
+
+    def _top(self, ranked_postings, page_keys, limit):
+        if page_keys is None:
+            return ranked_postings[:limit]
+        top = []
+        for score, doc_id in ranked_postings:
+            if self.docs[doc_id][0] in page_keys:
+                top.append((score, doc_id))
+                if len(top) == limit:
+                    break
+        return top
+
+
+_index = None
+_index_key = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+# How often to check whether content files changed since the index was built.
+RECHECK_SECONDS = 5.0
+
+
+def _content_key(pages):
+    return tuple(content.digest(name) for name in sorted({page.content for page in pages}))
+
+
+def get_index():
+    """Return the shared index, building it on first use or after content edits."""
+    global _index, _index_key, _checked_at
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < RECHECK_SECONDS:
+        return _index
+    with _lock:
+        pages = guides.PAGES + guides.LEGACY_PAGES
+        key = _content_key(pages)
+        if _index is None or key != _index_key:
+            _index = SearchIndex(pages)
+            _index_key = key
+        _checked_at = now
+    return _index
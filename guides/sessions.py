@@ -0,0 +1,180 @@
+"""Per-session memory accounting and eviction of idle sessions.
+
+Streamlit keeps every session's state in memory until the browser tab goes
+away, so tabs left open through a workshop pile up. ``touch`` records when
+each session last ran. A background reaper closes sessions that have been
+idle longer than ``GUIDES_SESSION_TTL`` seconds (default 1800). When more
+than ``GUIDES_MAX_SESSIONS`` sessions are open (default 500), it also closes
+the least recently used ones, but only those idle for at least
+``GUIDES_SESSION_MIN_IDLE`` seconds (default 300) and at most
+``GUIDES_EVICTIONS_PER_PASS`` (default 20) per pass: a closed tab that is
+still open reconnects as a new session, so evicting active learners would
+only churn. Checkpoints are recorded when their form is
+submitted, so handing a session off is just flushing the progress store
+before it is closed.
+
+``report`` measures each live session (session state, widget state and
+the cached messages it references) for the admin panel.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from guides import progress
+
+IDLE_TTL = float(os.environ.get("GUIDES_SESSION_TTL", "1800"))
+MAX_SESSIONS = int(os.environ.get("GUIDES_MAX_SESSIONS", "500"))
+MIN_IDLE = float(os.environ.get("GUIDES_SESSION_MIN_IDLE", "300"))
+EVICTIONS_PER_PASS = int(os.environ.get("GUIDES_EVICTIONS_PER_PASS", "20"))
+REAP_INTERVAL = min(60.0, max(1.0, IDLE_TTL / 4))
+
+SessionStats = namedtuple(
+    "SessionStats", ["session_id", "learner_id", "idle_s", "state_bytes", "widget_bytes", "cached_bytes"]
+)
+
+# session_id -> last time the script ran for it, least recently used first.
+_last_seen = OrderedDict()
+_lock = threading.Lock()
+_reaper = None
+
+
+def touch():
+    """Record that the current session just ran; call once per rerun."""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    with _lock:
+        _last_seen[ctx.session_id] = time.monotonic()
+        _last_seen.move_to_end(ctx.session_id)
+    start_reaper()
+
+
+def _runtime():
+    return Runtime.instance() if Runtime.exists() else None
+
+
+def _sessions(runtime):
+    return {info.session.id: info for info in runtime._session_mgr.list_sessions()}
+
+
+def _close(runtime, session_id, client):
+    runtime.close_session(session_id)
+    # Drop the socket too: the browser reconnects with a fresh session, which
+    # reloads the learner's progress from the store.
+    if client is not None and hasattr(client, "close"):
+        client.close()
+
+
+def _state_value(state, key, default=None):
+    try:
+        return state[key]
+    except KeyError:
+        return default
+
+
+def _sizes(session, message_cache):
+    from pympler import asizeof
+
+    state = session._session_state
+    # The state dicts are mutated by the session's own script thread; retry
+    # the odd measurement that races with a rerun.
+    for _ in range(3):
+        try:
+            state_bytes = asizeof.asizeof(state._old_state, state._new_session_state)
+            widget_bytes = asizeof.asizeof(state._new_widget_state)
+            break
+        except RuntimeError:
+            continue
+    else:
+        state_bytes = widget_bytes = 0
+    cached_bytes = sum(
+        entry.msg.ByteSize()
+        for entry in list(message_cache._entries.values())
+        if entry.has_session_ref(session)
+    )
+    return state_bytes, widget_bytes, cached_bytes
+
+
+def report():
+    """Return ``SessionStats`` for every open session, largest first."""
+    runtime = _runtime()
+    if runtime is None:
+        return []
+    now = time.monotonic()
+    with _lock:
+        last_seen = dict(_last_seen)
+    stats = []
+    for session_id, info in _sessions(runtime).items():
+        session = info.session
+        learner = _state_value(session._session_state, "learner_id")
+        idle = now - last_seen[session_id] if session_id in last_seen else None
+        stats.append(SessionStats(session_id, learner, idle, *_sizes(session, runtime._message_cache)))
+    return sorted(stats, key=lambda s: s.state_bytes + s.widget_bytes + s.cached_bytes, reverse=True)
+
+
+def select_victims(
+    last_seen, live_ids, now, ttl=IDLE_TTL, max_sessions=MAX_SESSIONS,
+    min_idle=MIN_IDLE, per_pass=EVICTIONS_PER_PASS,
+):
+    """Session IDs to close: idle past ``ttl``, then the oldest beyond ``max_sessions``.
+
+    Sessions beyond the cap are only closed once idle for ``min_idle``
+    seconds, and at most ``per_pass`` of them; the next pass takes the rest.
+    """
+    ordered = [session_id for session_id in last_seen if session_id in live_ids]
+    victims = [session_id for session_id in ordered if now - last_seen[session_id] > ttl]
+    remaining = [
+        session_id for session_id in ordered
+        if session_id not in victims and now - last_seen[session_id] >= min_idle
+    ]
+    excess = min(len(live_ids) - len(victims) - max_sessions, per_pass)
+    if excess > 0:
+        victims += remaining[:excess]
+    return victims
+
+
+def reap(now=None):
+    """Close idle and excess sessions; return the IDs that were closed."""
+    runtime = _runtime()
+    if runtime is None:
+        return []
+    now = time.monotonic() if now is None else now
+    live = _sessions(runtime)
+    with _lock:
+        for session_id in list(_last_seen):
+            if session_id not in live:
+                del _last_seen[session_id]
+        victims = select_victims(_last_seen, live.keys(), now)
+        for session_id in victims:
+            del _last_seen[session_id]
+
+    if victims:
+        progress.get_store().flush()
+        # Runtime.close_session must run on the server's event loop.
+        loop = runtime._get_async_objs().eventloop
+        for session_id in victims:
+            loop.call_soon_threadsafe(_close, runtime, session_id, live[session_id].client)
+    return victims
+
+
+def _run():
+    while True:
+        time.sleep(REAP_INTERVAL)
+        try:
+            reap()
+        except Exception:
+            # Keep reaping on the next pass rather than letting the thread die.
+            pass
+
+
+def start_reaper():
+    global _reaper
+    if _reaper is None:
+        with _lock:
+            if _reaper is None:
+                _reaper = threading.Thread(target=_run, name="session-reaper", daemon=True)
+                _reaper.start()
@@ -0,0 +1,88 @@
+"""Collect every code sample shown by the guides.
+
+Samples come from two places: the ``code`` blocks of the content files, and
+the ``st.code`` calls of the standalone ``dev-ops-setup-v*.py`` scripts, which
+still embed their samples inline. Identical samples are collapsed by digest, so
+a sample shared by several pages or versions is only checked once.
+"""
+import ast
+import glob
+import hashlib
+import os
+from collections import namedtuple
+
+from guides import content
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS = os.path.join(REPO_ROOT, "dev-ops-setup-v*.py")
+
+Snippet = namedtuple("Snippet", ["location", "name", "language", "source"])
+
+
+def digest(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _content_snippets():
+    for name in content.names():
+        data = content._load_file(name).data
+        # A variant's inherited blocks are yielded with the page they come from.
+        blocks = data.get("append", []) if "extends" in data else data["blocks"]
+        for block in content.iter_blocks(blocks):
+            if block["type"] == "code":
+                yield Snippet(f"guides/content/{name}.json", block["name"], block["language"], block["source"])
+
+
+def _string_constant(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _script_snippets(path):
+    with open(path, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), filename=path)
+    constants = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            value = _string_constant(node.value)
+            if value is not None:
+                constants[node.targets[0].id] = value
+
+    filename = os.path.relpath(path, REPO_ROOT)
+    calls = [
+        node for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+        and node.func.attr == "code" and node.args
+    ]
+    for node in sorted(calls, key=lambda node: node.lineno):
+        arg = node.args[0]
+        name = arg.id if isinstance(arg, ast.Name) else None
+        source = constants.get(name) if name else _string_constant(arg)
+        if source is None:
+            continue
+        language = "python"  # st.code's default
+        for keyword in node.keywords:
+            if keyword.arg == "language" and _string_constant(keyword.value) is not None:
+                language = keyword.value.value
+        if len(node.args) > 1 and _string_constant(node.args[1]) is not None:
+            language = node.args[1].value
+        yield Snippet(f"{filename}:{node.lineno}", name or "inline", language, source)
+
+
+def iter_snippets(languages=None):
+    """Yield every code sample, optionally only those in ``languages``."""
+    sources = [_content_snippets()]
+    sources += [_script_snippets(path) for path in sorted(glob.glob(SCRIPTS))]
+    for snippets in sources:
+        for snippet in snippets:
+            if languages is None or snippet.language in languages:
+                yield snippet
+
+
+def unique(snippets):
+    """Group snippets by digest: ``{digest: [snippet, ...]}`` in first-seen order."""
+    groups = {}
+    for snippet in snippets:
+        groups.setdefault(digest(snippet.source), []).append(snippet)
+    return groups
@@ -0,0 +1,67 @@
+import streamlit as st
+
+from guides import hcl_graph, terraform_gen
+from guides.blocks import render_code, render_page
+
+_DEFAULTS = {
+    "tfgen:region": terraform_gen.DEFAULTS.region,
+    "tfgen:bucket_prefix": terraform_gen.DEFAULTS.bucket_prefix,
+    "tfgen:tags": terraform_gen.format_tags(terraform_gen.DEFAULTS.tags),
+    "tfgen:acl": terraform_gen.DEFAULTS.acl,
+    "tfgen:versioning": terraform_gen.DEFAULTS.versioning,
+    "tfgen:encryption": terraform_gen.DEFAULTS.encryption,
+}
+
+
+def _generator(block):
+    """Render the S3 sample from the learner's parameters instead of the fixed block."""
+    # Streamlit drops a widget's state when a run doesn't render it, so the
+    # values are also kept under a plain key to survive visits to other pages.
+    saved = st.session_state.get("tfgen:saved", _DEFAULTS)
+    for key, value in saved.items():
+        st.session_state.setdefault(key, value)
+
+    # A form, so typing into the fields doesn't rerun the page; only
+    # "Generate" does.
+    with st.form("tfgen"):
+        left, right = st.columns(2)
+        left.selectbox("Region", terraform_gen.REGIONS, key="tfgen:region")
+        right.text_input("Bucket name prefix", key="tfgen:bucket_prefix", max_chars=terraform_gen.MAX_PREFIX)
+        left.selectbox("ACL", terraform_gen.ACLS, key="tfgen:acl")
+        right.selectbox("Encryption", terraform_gen.ENCRYPTION, key="tfgen:encryption")
+        st.text_area("Tags (one Key=Value per line)", key="tfgen:tags", height=90)
+        st.checkbox("Enable versioning", key="tfgen:versioning")
+        st.form_submit_button("Generate")
+
+    state = st.session_state
+    state["tfgen:saved"] = {key: state[key] for key in _DEFAULTS}
+    try:
+        params = terraform_gen.Params(
+            region=state["tfgen:region"],
+            bucket_prefix=state["tfgen:bucket_prefix"].strip(),
+            tags=terraform_gen.parse_tags(state["tfgen:tags"]),
+            acl=state["tfgen:acl"],
+            versioning=state["tfgen:versioning"],
+            encryption=state["tfgen:encryption"],
+        )
+        source = terraform_gen.generate(params)
+    except ValueError as exc:
+        st.error(str(exc))
+        return
+    render_code(source, block["language"])
+    _dependency_graph(source)
+
+
+def _dependency_graph(source):
+    nodes, deps, plan = hcl_graph.analyze(source)
+    waves = "; ".join(f"wave {number}: {', '.join(wave)}" for number, wave in enumerate(plan.waves, 1))
+    st.markdown("#### Apply Order")
+    st.caption(
+        f"Terraform applies independent resources in parallel. These {sum(map(len, plan.waves))} resources "
+        f"need {len(plan.waves)} waves ({waves}); the critical path is in red."
+    )
+    st.graphviz_chart(hcl_graph.dot(nodes, deps, plan))
+
+
+def main_page():
+    render_page("terraform", overrides={"terraform_code": _generator})
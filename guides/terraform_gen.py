@@ -0,0 +1,159 @@
+"""Generate the Terraform S3 sample from a learner's parameters.
+
+The sample is assembled from ``string.Template`` sections compiled once at
+import. Output is memoized process-wide by the ``Params`` tuple, so every
+session asking for the same bucket gets the same string without re-assembling
+it. ``DEFAULTS`` reproduces the ``terraform_code`` sample in
+``content/terraform.json`` byte for byte.
+"""
+import functools
+import re
+from collections import namedtuple
+from string import Template
+
+Params = namedtuple("Params", ["region", "bucket_prefix", "tags", "acl", "versioning", "encryption"])
+
+REGIONS = (
+    "us-east-1", "us-east-2", "us-west-1", "us-west-2",
+    "ca-central-1", "sa-east-1",
+    "eu-west-1", "eu-west-2", "eu-west-3", "eu-central-1", "eu-north-1",
+    "ap-south-1", "ap-northeast-1", "ap-northeast-2", "ap-southeast-1", "ap-southeast-2",
+)
+ACLS = (
+    "private", "public-read", "public-read-write", "authenticated-read",
+    "aws-exec-read", "bucket-owner-read", "bucket-owner-full-control", "log-delivery-write",
+)
+ENCRYPTION = ("none", "AES256", "aws:kms")
+
+DEFAULTS = Params(
+    region="us-west-2",
+    bucket_prefix="my-unique-bucket-name",
+    tags=(("Name", "My bucket"), ("Environment", "Dev")),
+    acl="private",
+    versioning=False,
+    encryption="none",
+)
+
+# random_id's 8 bytes come out as 16 hex characters, joined with a hyphen;
+# bucket names are capped at 63 characters.
+MAX_PREFIX = 63 - 17
+
+_REGION_RE = re.compile(r"^[a-z]{2}(-[a-z]+)+-\d$")
+_PREFIX_RE = re.compile(r"^[a-z0-9]([a-z0-9.-]*[a-z0-9])?$")
+_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_-]*$")
+
+_PROVIDER = Template("""\
+provider "aws" {
+  region = "$region"  # Replace with your desired region
+}
+
+resource "random_id" "bucket_suffix" {
+  byte_length = 8
+}
+""")
+_BUCKET = Template("""
+resource "aws_s3_bucket" "my_bucket" {
+  bucket = "$bucket_prefix-$${random_id.bucket_suffix.hex}"
+$tags}
+""")
+_TAGS = Template("""
+  tags = {
+$pairs
+  }
+""")
+_ACL = Template("""
+resource "aws_s3_bucket_acl" "my_bucket_acl" {
+  bucket = aws_s3_bucket.my_bucket.id
+  acl    = "$acl"
+}""")
+_VERSIONING = Template("""
+
+resource "aws_s3_bucket_versioning" "my_bucket_versioning" {
+  bucket = aws_s3_bucket.my_bucket.id
+
+  versioning_configuration {
+    status = "Enabled"
+  }
+}""")
+_ENCRYPTION = Template("""
+
+resource "aws_s3_bucket_server_side_encryption_configuration" "my_bucket_encryption" {
+  bucket = aws_s3_bucket.my_bucket.id
+
+  rule {
+    apply_server_side_encryption_by_default {
+      sse_algorithm = "$algorithm"
+    }$bucket_key
+  }
+}""")
+
+
+def _string(value):
+    """Escape ``value`` for a quoted HCL string, template sequences included."""
+    value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return value.replace("${", "$${").replace("%{", "%%{")
+
+
+def parse_tags(text):
+    """Parse ``Key=Value`` lines into a tuple of pairs; raise ``ValueError`` on bad input."""
+    tags = []
+    seen = set()
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        key, sep, value = line.partition("=")
+        key, value = key.strip(), value.strip()
+        if not sep or not key:
+            raise ValueError(f"Tag line {number} should look like Key=Value")
+        if key in seen:
+            raise ValueError(f"Duplicate tag {key!r}")
+        seen.add(key)
+        tags.append((key, value))
+    return tuple(tags)
+
+
+def format_tags(tags):
+    return "\n".join(f"{key}={value}" for key, value in tags)
+
+
+def check(params):
+    """Raise ``ValueError`` describing the first invalid parameter."""
+    if not _REGION_RE.match(params.region):
+        raise ValueError(f"{params.region!r} is not an AWS region name")
+    prefix = params.bucket_prefix
+    if not _PREFIX_RE.match(prefix) or ".." in prefix or len(prefix) > MAX_PREFIX:
+        raise ValueError(
+            f"Bucket prefix must be lowercase letters, digits, dots and hyphens, "
+            f"start and end with a letter or digit and be at most {MAX_PREFIX} characters"
+        )
+    if prefix.startswith(("xn--", "sthree-")):
+        raise ValueError("Bucket names may not start with 'xn--' or 'sthree-'")
+    if params.acl not in ACLS:
+        raise ValueError(f"Unknown canned ACL {params.acl!r}")
+    if params.encryption not in ENCRYPTION:
+        raise ValueError(f"Unknown encryption {params.encryption!r}")
+
+
+@functools.lru_cache(maxsize=512)
+def generate(params):
+    """Return the HCL for ``params``; raise ``ValueError`` if they are invalid."""
+    check(params)
+    tags = ""
+    if params.tags:
+        keys = [key if _IDENT_RE.match(key) else f'"{_string(key)}"' for key, _ in params.tags]
+        width = max(map(len, keys))
+        pairs = "\n".join(
+            f'    {key.ljust(width)} = "{_string(value)}"' for key, (_, value) in zip(keys, params.tags)
+        )
+        tags = _TAGS.substitute(pairs=pairs)
+    parts = [
+        _PROVIDER.substitute(region=params.region),
+        _BUCKET.substitute(bucket_prefix=params.bucket_prefix, tags=tags),
+        _ACL.substitute(acl=params.acl),
+    ]
+    if params.versioning:
+        parts.append(_VERSIONING.substitute())
+    if params.encryption != "none":
+        bucket_key = "\n    bucket_key_enabled = true" if params.encryption == "aws:kms" else ""
+        parts.append(_ENCRYPTION.substitute(algorithm=params.encryption, bucket_key=bucket_key))
+    return "".join(parts)
@@ -0,0 +1,187 @@
+"""Check every code sample in the guides with a checker for its language.
+
+    python -m guides.verify                  # all samples, all versions
+    python -m guides.verify --no-cache       # ignore and don't update the cache
+
+Python samples are compiled, shell samples go through ``bash -n``, HCL samples
+through ``guides.hcl_validate``, and the BigQuery schema listing is checked
+for known column types. Checks run in a process pool. Results are memoized on
+disk (``.sample_cache.json`` by default) keyed by the sample's digest and a
+fingerprint of the checkers, so a run only re-checks samples that changed.
+Exits non-zero if any sample has an error.
+"""
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from guides import hcl_validate, snippets
+from guides.hcl_validate import Diagnostic
+
+DEFAULT_CACHE = hcl_validate.DEFAULT_CACHE
+
+BIGQUERY_TYPES = {
+    "STRING", "BYTES", "INTEGER", "INT64", "FLOAT", "FLOAT64", "NUMERIC", "BIGNUMERIC",
+    "BOOLEAN", "BOOL", "TIMESTAMP", "DATE", "TIME", "DATETIME", "GEOGRAPHY", "JSON",
+    "RECORD", "STRUCT", "INTERVAL",
+}
+_SCHEMA_LINE_RE = re.compile(r"^- ([A-Za-z_][A-Za-z0-9_]*): ([A-Z0-9]+)$")
+
+
+def check_python(source):
+    try:
+        tree = ast.parse(source)
+        compile(tree, "<sample>", "exec")
+    except SyntaxError as exc:
+        return [Diagnostic("error", exc.lineno or 1, exc.msg)]
+    return []
+
+
+def check_bash(source):
+    proc = subprocess.run(
+        ["bash", "-n"], input=source, capture_output=True, text=True, timeout=10
+    )
+    diagnostics = []
+    for line in proc.stderr.splitlines():
+        # "bash: line 3: syntax error near unexpected token `fi'"
+        match = re.match(r"bash: line (\d+): (.*)", line)
+        if match:
+            diagnostics.append(Diagnostic("error", int(match.group(1)), match.group(2)))
+    if proc.returncode and not diagnostics:
+        diagnostics.append(Diagnostic("error", 1, proc.stderr.strip() or "bash -n failed"))
+    return diagnostics
+
+
+def check_bigquery_schema(source):
+    diagnostics = []
+    seen = set()
+    for number, line in enumerate(source.splitlines(), 1):
+        match = _SCHEMA_LINE_RE.match(line.strip())
+        if not match:
+            diagnostics.append(Diagnostic("error", number, f"Expected '- name: TYPE', found {line!r}"))
+            continue
+        name, kind = match.groups()
+        if kind not in BIGQUERY_TYPES:
+            diagnostics.append(Diagnostic("error", number, f"Unknown BigQuery type {kind!r}"))
+        if name in seen:
+            diagnostics.append(Diagnostic("error", number, f"Duplicate column {name!r}"))
+        seen.add(name)
+    return diagnostics
+
+
+CHECKERS = {
+    "python": check_python,
+    "bash": check_bash,
+    "sh": check_bash,
+    "shell": check_bash,
+    "hcl": hcl_validate.validate,
+    "terraform": hcl_validate.validate,
+}
+
+# Samples whose language tag doesn't say what they are.
+NAMED_CHECKERS = {
+    "schema_code": check_bigquery_schema,
+}
+
+
+def checker_for(snippet):
+    return NAMED_CHECKERS.get(snippet.name) or CHECKERS.get(snippet.language)
+
+
+def _fingerprint():
+    """Digest of the checker sources, so editing a checker invalidates the cache."""
+    digest = hashlib.sha256()
+    for module in (sys.modules[__name__], hcl_validate, hcl_validate.hcl):
+        with open(module.__file__, "rb") as fh:
+            digest.update(fh.read())
+    return digest.hexdigest()[:16]
+
+
+def _run_check(job):
+    kind, source = job
+    checker = NAMED_CHECKERS.get(kind) or CHECKERS[kind]
+    return [tuple(diagnostic) for diagnostic in checker(source)]
+
+
+def _load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path, cache):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(cache, fh, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def verify(found, workers=None, cache_path=DEFAULT_CACHE):
+    """Check ``found`` snippets; return ``({cache_key: [Diagnostic, ...]}, keys, stats)``.
+
+    ``keys`` maps each checkable snippet to its cache key. ``cache_path=None``
+    disables the on-disk memo.
+    """
+    fingerprint = _fingerprint()
+    cache = _load_cache(cache_path) if cache_path else {}
+    cache = {key: value for key, value in cache.items() if key.startswith(fingerprint + ":")}
+
+    keys, jobs = {}, {}
+    for snippet in found:
+        if checker_for(snippet) is None:
+            continue
+        kind = snippet.name if snippet.name in NAMED_CHECKERS else snippet.language
+        key = f"{fingerprint}:{kind}:{snippets.digest(snippet.source)}"
+        keys[snippet] = key
+        if key not in cache:
+            jobs[key] = (kind, snippet.source)
+
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            cache.update(zip(jobs, pool.map(_run_check, jobs.values())))
+    else:
+        cache.update((key, _run_check(job)) for key, job in jobs.items())
+
+    if cache_path and jobs:
+        _save_cache(cache_path, cache)
+    results = {key: [Diagnostic(*item) for item in cache[key]] for key in set(keys.values())}
+    stats = {"checked": len(jobs), "cached": len(results) - len(jobs), "skipped": len(found) - len(keys)}
+    return results, keys, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="result cache path")
+    parser.add_argument("--no-cache", action="store_true", help="check everything and don't write the cache")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    found = list(snippets.iter_snippets())
+    results, keys, stats = verify(found, args.workers, None if args.no_cache else args.cache)
+
+    errors = 0
+    for snippet, key in keys.items():
+        for diagnostic in results[key]:
+            errors += diagnostic.severity == "error"
+            print(f"{snippet.location} ({snippet.name}, {snippet.language}) line {diagnostic.line}: "
+                  f"{diagnostic.severity}: {diagnostic.message}")
+    elapsed = time.perf_counter() - started
+    print(
+        f"{len(found)} samples: {stats['checked']} checked, {stats['cached']} cached, "
+        f"{stats['skipped']} without a checker, in {elapsed:.2f}s: {errors} error(s)",
+        file=sys.stderr,
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""The generations of the guide app (dev-ops-setup-v1.py .. v5.py) as data.
+
+Each version is a page config plus a list of registry pages. Pages shared by
+several versions are the same registry entry, page module and content, so a
+single process can serve every version without holding duplicate copies.
+"""
+from collections import namedtuple
+
+import guides
+
+Version = namedtuple("Version", ["key", "page_title", "page_icon", "pages", "sidebar_progress"])
+
+_CURRENT = ["terraform", "aws-docker", "github-codepipeline", "lambda", "bigquery"]
+
+VERSIONS = [
+    Version("v1", "Claude Terraform Guide", "🤖", ["day-one"], False),
+    Version("v2", "Cloud Development Guide", "🚀", ["terraform", "aws-docker-v2"], False),
+    Version("v3", "Cloud Development Guide", "🚀", _CURRENT[:3], True),
+    Version("v4", "Cloud Development Guide", "🚀", _CURRENT[:4], True),
+    Version("v5", "Cloud Development Guide", "🚀", _CURRENT, True),
+]
+
+LATEST = VERSIONS[-1]
+
+_BY_KEY = {version.key: version for version in VERSIONS}
+
+
+def get_version(key):
+    """Look up a version by key; ``"3"`` and ``"v3"`` are equivalent."""
+    key = str(key).strip().lower()
+    if not key.startswith("v"):
+        key = f"v{key}"
+    return _BY_KEY[key]
+
+
+def pages(version):
+    return [guides.get_page_by_key(key) for key in version.pages]
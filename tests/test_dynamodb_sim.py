@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from guides import dynamodb_sim
+
+
+def test_flat_traffic_costs():
+    minutes = dynamodb_sim.MINUTES_PER_DAY
+    reads = np.full(minutes, 100.0)
+    writes = np.full(minutes, 10.0)
+    items = dynamodb_sim.Items(read_kb=1, write_kb=1, read_mode="eventual", write_mode="standard")
+    scaling = dynamodb_sim.Scaling(min_rcu=1, max_rcu=1000, min_wcu=1, max_wcu=1000, target=0.7, lag=2)
+
+    result = dynamodb_sim.simulate(reads, writes, items, scaling)
+
+    # 50 RCU and 10 WCU of demand, provisioned at 70% utilization.
+    assert np.all(result.rcu_capacity == 72)
+    assert np.all(result.wcu_capacity == 15)
+    assert result.read_throttled.sum() == result.write_throttled.sum() == 0
+    assert result.on_demand_read_throttled.sum() == result.on_demand_write_throttled.sum() == 0
+    prices = dynamodb_sim.PRICES
+    assert result.provisioned_cost == pytest.approx((72 * prices.rcu_hour + 15 * prices.wcu_hour) * 24)
+    # 4.32M read units and 0.864M write units over the day.
+    assert result.on_demand_cost == pytest.approx(4.32 * prices.read_million + 0.864 * prices.write_million)
+    assert result.provisioned_cost < result.on_demand_cost
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from guides import dynamodb_table
+
+
+def test_single_hot_key_lands_in_one_partition():
+    table = dynamodb_table.Table(partitions=8)
+    table.batch_write(np.full(2000, "hot"), sizes=1024)
+
+    rows = np.arange(len(table))
+    heat = table.replay(rows, np.zeros(len(rows), dtype=np.int64), np.ones(len(rows), dtype=bool))
+
+    per_partition = heat.write_units.sum(axis=1)
+    assert np.count_nonzero(per_partition) == 1
+    assert per_partition.max() == 2000
+    # One partition takes 1,000 WCU a second; the rest of the second is throttled.
+    assert heat.writes_throttled == pytest.approx(1000)
+    assert heat.hot_keys == [("hot", 2000)]
+
+
+def test_header_only_csv_is_rejected():
+    workload = dynamodb_table.Workload(
+        sample=None, items=0, item_kb=1.0, writes_per_second=100, reads_per_write=1.0,
+        rcu=0, wcu=0, partitions=0, csv=b"pk,size\n", seed=0,
+    )
+    with pytest.raises(ValueError, match="The CSV has no rows"):
+        dynamodb_table.analyze(workload)
@@ -0,0 +1,19 @@
+import pytest
+
+from guides import hcl
+
+
+@pytest.mark.parametrize("source", ["x = [for", "x = [for a in", "x = {for k, v in y : k =>", "x = f(", "x = {a"])
+def test_truncated_input_is_a_syntax_error(source):
+    with pytest.raises(hcl.HCLSyntaxError):
+        hcl.parse(source)
+
+
+@pytest.mark.parametrize("source", [
+    "x = (\n  var.a\n  ? 1\n  : 2\n)\n",
+    "y = [\n  var.a ? 1\n  : 2,\n]\n",
+    "z = max(\n  var.a +\n  var.b,\n)\n",
+])
+def test_newlines_inside_brackets_are_ignored(source):
+    body = hcl.parse(source)
+    assert len(body.attributes) == 1
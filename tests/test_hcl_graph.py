@@ -0,0 +1,67 @@
+import pytest
+
+from guides import hcl, hcl_graph
+
+SOURCE = """
+variable "name" {}
+
+locals {
+  bucket = "${var.name}-logs"
+}
+
+resource "aws_s3_bucket" "logs" {
+  bucket = local.bucket
+}
+
+resource "aws_iam_role" "app" {
+  name = var.name
+}
+
+resource "aws_s3_bucket_policy" "logs" {
+  bucket = aws_s3_bucket.logs.id
+  policy = aws_iam_role.app.arn
+}
+
+resource "aws_instance" "app" {
+  depends_on = [aws_s3_bucket_policy.logs]
+}
+"""
+
+
+def test_waves_follow_dependencies():
+    nodes, deps, plan = hcl_graph.analyze(SOURCE)
+
+    assert deps["aws_s3_bucket.logs"] == ["local.bucket"]
+    assert plan.waves == [
+        ["aws_s3_bucket.logs", "aws_iam_role.app"],
+        ["aws_s3_bucket_policy.logs"],
+        ["aws_instance.app"],
+    ]
+    assert plan.duration == 3
+    assert hcl_graph.plan(nodes, deps, {"aws_s3_bucket.logs": 5}) == hcl_graph.Plan(
+        plan.waves, ["aws_s3_bucket.logs", "aws_s3_bucket_policy.logs", "aws_instance.app"], 7,
+    )
+    assert hcl_graph.schedule(nodes, deps, 1) == 4
+    assert hcl_graph.schedule(nodes, deps, 10) == 3
+
+
+def test_cycle_is_reported():
+    source = """
+resource "aws_security_group" "a" {
+  description = aws_security_group.b.id
+}
+
+resource "aws_security_group" "b" {
+  description = aws_security_group.a.id
+}
+"""
+    nodes, deps = hcl_graph.build(hcl.parse(source))
+    with pytest.raises(hcl_graph.CycleError) as excinfo:
+        hcl_graph.plan(nodes, deps)
+    assert sorted(excinfo.value.addresses) == ["aws_security_group.a", "aws_security_group.b"]
+
+
+def test_parallelism_below_one_is_rejected():
+    nodes, deps, _ = hcl_graph.analyze(SOURCE)
+    with pytest.raises(ValueError):
+        hcl_graph.schedule(nodes, deps, 0)
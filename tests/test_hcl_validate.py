@@ -0,0 +1,113 @@
+from guides import hcl_validate
+
+
+def errors(source):
+    return [d for d in hcl_validate.validate(source) if d.severity == "error"]
+
+
+def test_variable_type_constraints_are_not_references():
+    source = """
+variable "name" {
+  type = string
+}
+
+variable "tags" {
+  type    = map(string)
+  default = {}
+}
+
+variable "buckets" {
+  type = list(object({ name = string, versioned = bool, size = number }))
+}
+
+variable "anything" {
+  type = set(any)
+}
+
+variable "pair" {
+  type = tuple([string, number])
+}
+"""
+    assert errors(source) == []
+
+
+def test_type_keywords_are_only_known_in_variable_type():
+    source = """
+resource "aws_s3_bucket" "b" {
+  bucket = string
+}
+"""
+    assert [d.message for d in errors(source)] == ["Unknown name 'string'"]
+
+
+def test_lifecycle_attribute_lists_are_not_references():
+    source = """
+resource "aws_s3_bucket" "b" {
+  bucket = "example"
+
+  lifecycle {
+    ignore_changes       = [tags, bucket]
+    replace_triggered_by = [random_id.suffix]
+  }
+}
+"""
+    assert errors(source) == []
+
+
+def test_undeclared_reference_is_still_an_error():
+    source = """
+resource "aws_s3_bucket" "b" {
+  bucket = var.missing
+}
+"""
+    assert [d.message for d in errors(source)] == ["Reference to undeclared input variable var.missing"]
+
+
+def test_provider_meta_argument_is_not_a_reference():
+    source = """
+provider "aws" {
+  alias  = "west"
+  region = "us-west-2"
+}
+
+resource "aws_s3_bucket" "b" {
+  provider = aws.west
+  bucket   = "example"
+}
+"""
+    assert errors(source) == []
+
+
+def test_dynamic_block_iterator_is_in_scope():
+    source = """
+variable "volumes" {
+  type = list(object({ size = number }))
+}
+
+resource "aws_instance" "web" {
+  dynamic "ebs_block_device" {
+    for_each = var.volumes
+    content {
+      volume_size = ebs_block_device.value.size
+    }
+  }
+
+  dynamic "ephemeral_block_device" {
+    for_each = var.volumes
+    iterator = volume
+    content {
+      volume_size = volume.value.size
+    }
+  }
+}
+"""
+    assert errors(source) == []
+
+
+def test_dynamic_iterator_is_only_in_scope_inside_its_block():
+    source = """
+resource "aws_instance" "web" {
+  tags = ebs_block_device.value
+}
+"""
+    assert [d.message for d in errors(source)] == ["Reference to undeclared resource ebs_block_device.value"]
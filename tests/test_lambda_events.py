@@ -0,0 +1,22 @@
+from guides import lambda_events
+
+STEADY = lambda_events.DEFAULTS._replace(rates=(200, 50, 0, 0), duration_s=10, spike_factor=1, error_rate=0)
+
+
+def test_reserved_concurrency_throttles_api_gateway_and_queues_async_events():
+    result = lambda_events.simulate(STEADY._replace(reserved=20))
+
+    # 200 requests/s of 200 ms calls need about 40 concurrent environments.
+    assert result.peak_concurrency == 20
+    assert result.throttled > 0
+    # Only API Gateway is throttled: every S3 event waits in the queue and is delivered.
+    assert result.throttled + result.invocations == result.events
+    assert result.timeline["backlog"].max() > 0
+    assert result.dead_letters == result.unfinished == 0
+
+
+def test_account_concurrency_serves_everything():
+    result = lambda_events.simulate(STEADY)
+
+    assert result.throttled == 0
+    assert result.invocations == result.events